@@ -0,0 +1,132 @@
+# Générateur de charge pour le démon RNG (socket Unix)
+#
+# Démarre un démon dans un processus séparé, lance N clients (threads) qui
+# enchaînent des requêtes pendant une durée fixe, puis affiche requêtes/s,
+# débit et percentiles de latence.
+#
+# Usage :
+#   python -m benchmarks.daemon_load --clients 8 --size 32 --duration 5
+#   python -m benchmarks.daemon_load --pipeline 16 --shards 2 --engine ntt
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from typing import Dict, List
+
+from src_python.api.client import RNGClient
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def start_daemon(socket_path: str, state_file: str, shards: int, engine: str,
+                 timeout: float = 60.0) -> subprocess.Popen:
+    """Lance python -m src_python.api.daemon et attend que la socket réponde."""
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src_python.api.daemon", "--socket", socket_path,
+         "--shards", str(shards), "--engine", engine, "--state-file", state_file],
+        env=env, stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    probe = RNGClient(socket_path, pool_size=1)
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Le démon s'est arrêté (code {proc.returncode}).")
+        if os.path.exists(socket_path):
+            try:
+                if probe.initialize():
+                    probe.close()
+                    return proc
+            except Exception:
+                pass
+        time.sleep(0.05)
+    proc.terminate()
+    raise TimeoutError("Démon non prêt dans le délai imparti.")
+
+def run_load(socket_path: str, clients: int, size: int, duration: float, pipeline: int) -> Dict:
+    """Charge fermée : chaque client renvoie une requête (ou un lot pipeliné) dès la réponse reçue."""
+    client = RNGClient(socket_path, pool_size=clients)
+    client.initialize()
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop_at = time.monotonic() + duration
+
+    def worker(i: int):
+        lat = latencies[i]
+        sizes = [size] * pipeline
+        while time.monotonic() < stop_at:
+            t0 = time.perf_counter()
+            if pipeline == 1:
+                results = [client.generate(size)]
+            else:
+                results = client.generate_many(sizes)
+            elapsed = time.perf_counter() - t0
+            for data, status in results:
+                if status != 0 or len(data) != size:
+                    errors[i] += 1
+                # Latence d'une requête pipelinée = temps du lot entier
+                lat.append(elapsed)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    client.close()
+
+    all_lat = sorted(v for lat in latencies for v in lat)
+    requests = len(all_lat)
+    return {
+        "requests": requests,
+        "errors": sum(errors),
+        "wall_s": wall,
+        "req_s": requests / wall,
+        "mb_s": requests * size / wall / (1024 * 1024),
+        "p50_ms": _percentile(all_lat, 50) * 1e3,
+        "p99_ms": _percentile(all_lat, 99) * 1e3,
+        "max_ms": (all_lat[-1] if all_lat else 0.0) * 1e3,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Charge sur le démon RNG post-quantique.")
+    parser.add_argument("--clients", type=int, default=8, help="Clients concurrents (threads)")
+    parser.add_argument("--size", type=int, default=32, help="Octets par requête")
+    parser.add_argument("--duration", type=float, default=5.0, help="Durée de la charge (s)")
+    parser.add_argument("--pipeline", type=int, default=1, help="Requêtes envoyées avant lecture")
+    parser.add_argument("--shards", type=int, default=1, help="DRBG du démon")
+    parser.add_argument("--engine", default="dense", help="Moteur Lattice du démon")
+    parser.add_argument("--socket", default=None, help="Démon existant (sinon démarré ici)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = None
+        socket_path = args.socket
+        if socket_path is None:
+            socket_path = os.path.join(tmp, "rng.sock")
+            proc = start_daemon(socket_path, os.path.join(tmp, "secure_state.bin"), args.shards, args.engine)
+        try:
+            r = run_load(socket_path, args.clients, args.size, args.duration, args.pipeline)
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(timeout=10)
+
+    print(f"clients={args.clients} size={args.size} o pipeline={args.pipeline} "
+          f"shards={args.shards} engine={args.engine}")
+    print(f"requêtes      {r['requests']} ({r['errors']} erreurs) en {r['wall_s']:.2f} s")
+    print(f"débit         {r['req_s']:.0f} req/s  {r['mb_s']:.2f} MiB/s")
+    print(f"latence       p50 {r['p50_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms  max {r['max_ms']:.2f} ms")
+    return 1 if r["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# Coût par flux : M LwrDrbgCore indépendants contre une banque MultiStreamDrbg
+#
+# Pour chaque M, mesure la génération de --size octets sur les M flux :
+# - "séparés" : M appels LwrDrbgCore.generate (M produits matrice-vecteur) ;
+# - "groupés" : un appel MultiStreamDrbg.generate (un GEMM pour les M flux).
+#
+# Usage :
+#   python -m benchmarks.multi_stream
+#   python -m benchmarks.multi_stream --streams 1 16 256 --size 64 --engine exact
+import sys
+import argparse
+from typing import Dict, Sequence
+
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.core.multi_stream import MultiStreamDrbg, derive_stream_seed
+from benchmarks.pipeline import measure
+
+DEFAULT_STREAMS = (1, 4, 16, 64, 256)
+
+def run_multi_stream(streams: Sequence[int] = DEFAULT_STREAMS, size: int = 32,
+                     engine: str = "dense", min_time: float = 0.2) -> Dict[int, Dict]:
+    """Retourne {M: {"separate_s", "batched_s", "speedup"}} (temps médian par flux)."""
+    results: Dict[int, Dict] = {}
+    # Un seul cœur suffit pour la référence : le coût d'un appel ne dépend pas du flux
+    core = LwrDrbgCore(engine=engine)
+    core.instantiate(derive_stream_seed(b"bench", 0))
+    for m in streams:
+        bank = MultiStreamDrbg(m, engine=engine)
+        bank.instantiate_all(b"bench")
+
+        def separate():
+            for _ in range(m):
+                core.generate(size)
+
+        # Les compteurs de reseed avancent à chaque mesure : on les remet à 1
+        separate_s = measure(separate, min_time, setup=lambda: core.update(b"bench"))["median_s"] / m
+        batched_s = measure(lambda: bank.generate(size), min_time,
+                            setup=lambda: bank.update(b"bench"))["median_s"] / m
+        results[m] = {"separate_s": separate_s, "batched_s": batched_s, "speedup": separate_s / batched_s}
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Évaluation Lattice groupée : coût par flux.")
+    parser.add_argument("--streams", type=int, nargs="+", default=list(DEFAULT_STREAMS), help="Valeurs de M")
+    parser.add_argument("--size", type=int, default=32, help="Octets par flux et par appel")
+    parser.add_argument("--engine", default="dense", help="Moteur Lattice (dense, exact)")
+    parser.add_argument("--quick", action="store_true", help="Mesures courtes")
+    args = parser.parse_args(argv)
+
+    results = run_multi_stream(args.streams, args.size, args.engine, 0.05 if args.quick else 0.2)
+    print(f"{'M':>5} {'séparés':>12} {'groupés':>12} {'gain':>8}")
+    for m, r in results.items():
+        print(f"{m:>5} {r['separate_s'] * 1e3:>9.3f} ms {r['batched_s'] * 1e3:>9.3f} ms {r['speedup']:>7.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# Benchmarks de chaque étape du pipeline RNG (avec seuils de régression)
+#
+# Usage :
+#   python -m benchmarks.pipeline                        # mesure et affiche
+#   python -m benchmarks.pipeline --save base.json       # enregistre une référence
+#   python -m benchmarks.pipeline --compare base.json    # échoue (code 1) si régression
+#   python -m benchmarks.pipeline --compare base.json --threshold 0.25 --quick
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+from typing import Callable, Dict, Optional
+
+from src_python.api.mobile_rng import MobileRNG
+from src_python.core.conditioner import Conditioner, DOMAIN_ENTROPY
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.core import public_matrix
+from src_python.modules.entropy_src import JitterCollector, RepetitionCountTest, AdaptiveProportionTest
+
+KIB = 1024
+MIB = 1024 * 1024
+
+# Tailles de sortie mesurées pour LwrDrbgCore.generate (16 o -> 16 Mio)
+GENERATE_SIZES = (16, 256, 4 * KIB, 64 * KIB, 1 * MIB, 16 * MIB)
+
+def measure(func: Callable[[], None], min_time: float = 0.2, max_reps: int = 1000,
+            setup: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Chronomètre func() (médiane de plusieurs répétitions).
+    setup() est exécuté avant chaque répétition, hors chronométrage.
+    """
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_reps and (len(timings) < 3 or time.perf_counter() - started < min_time):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "reps": len(timings)}
+
+def _with_throughput(result: Dict, num_bytes: int) -> Dict:
+    result["bytes"] = num_bytes
+    result["mb_s"] = num_bytes / result["median_s"] / MIB
+    return result
+
+def run_benchmarks(engine: str = "dense", quick: bool = False) -> Dict[str, Dict]:
+    """Exécute toutes les étapes et retourne {étape: mesures}."""
+    min_time = 0.05 if quick else 0.2
+    results: Dict[str, Dict] = {}
+
+    # 1. Construction du cœur (cache de matrice froid puis chaud)
+    results["core.construct_cold"] = measure(lambda: LwrDrbgCore(engine=engine), min_time, max_reps=5,
+                                             setup=public_matrix.clear_cache)
+    results["core.construct_warm"] = measure(lambda: LwrDrbgCore(engine=engine), min_time)
+
+    core = LwrDrbgCore(engine=engine)
+    core.update(b"\x42" * 48)
+
+    # 2. Update (reseed DRBG)
+    results["core.update"] = measure(lambda: core.update(b"\x42" * 48), min_time)
+
+    # 3. Generate, par taille de sortie
+    sizes = GENERATE_SIZES[:-1] if quick else GENERATE_SIZES
+    for size in sizes:
+        def gen(size=size):
+            core.reseed_counter = 1
+            core.generate(size)
+        reps = 3 if size >= MIB else 1000
+        results[f"core.generate_{size}"] = _with_throughput(measure(gen, min_time, max_reps=reps), size)
+
+    # 4. MobileRNG : démarrage à froid, à chaud, reseed (I/O StateManager incluses)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        state_file = os.path.join(tmp, "secure_state.bin")
+
+        def remove_state():
+            if os.path.exists(state_file):
+                os.remove(state_file)
+
+        def initialize():
+            # Chaque instance est fermée : ni planificateur ni écrivain d'état
+            # ne s'accumulent d'une répétition à l'autre
+            instance = MobileRNG(engine=engine, state_file=state_file)
+            try:
+                instance.initialize()
+            finally:
+                instance.close()
+
+        results["mobile.initialize_cold"] = measure(initialize, min_time, setup=remove_state)
+
+        rng = MobileRNG(engine=engine, state_file=state_file)
+        try:
+            rng.initialize()
+            rng.reseed()  # écrit un état : les démarrages suivants sont "à chaud"
+            results["mobile.initialize_warm"] = measure(initialize, min_time)
+            results["mobile.reseed"] = measure(rng.reseed, min_time)
+            results["mobile.generate_32"] = measure(lambda: rng.generate(32), min_time)
+        finally:
+            rng.close()
+
+    # 5. Collecte de jitter (64 échantillons = tests de démarrage)
+    collector = JitterCollector()
+    results["entropy.jitter_batch_64"] = measure(lambda: collector.sample_batch(64), min_time)
+
+    # 6. Tests de santé (débit en échantillons)
+    samples = collector.sample_batch(4096)
+    def health():
+        RepetitionCountTest().update_batch(samples)
+        AdaptiveProportionTest().update_batch(samples)
+    results["entropy.health_4096"] = _with_throughput(measure(health, min_time), samples.nbytes)
+
+    # 7. Conditionneur (petites sorties et gros volumes)
+    cond = Conditioner()
+    blob = samples.tobytes()[:64 * KIB]
+    results["conditioner.small"] = measure(lambda: cond.condition_parts((blob[:768],), DOMAIN_ENTROPY, 48), min_time)
+    results["conditioner.bulk_64k"] = _with_throughput(
+        measure(lambda: cond.condition_parts((blob,), DOMAIN_ENTROPY, 64 * KIB), min_time), 64 * KIB)
+
+    return results
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> list:
+    """Liste des régressions : étapes dont la médiane dépasse baseline * (1 + threshold)."""
+    regressions = []
+    for stage, ref in baseline.items():
+        if stage not in current:
+            continue
+        ratio = current[stage]["median_s"] / ref["median_s"]
+        if ratio > 1.0 + threshold:
+            regressions.append((stage, ratio))
+    return regressions
+
+def _print_table(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None):
+    for stage, r in results.items():
+        line = f"{stage:<28} {r['median_s'] * 1e6:>12.1f} us"
+        if "mb_s" in r:
+            line += f"  {r['mb_s']:>9.1f} MiB/s"
+        if baseline and stage in baseline:
+            line += f"  x{r['median_s'] / baseline[stage]['median_s']:.2f} vs ref"
+        print(line)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline RNG post-quantique.")
+    parser.add_argument("--engine", default="dense", help="Moteur Lattice (dense, ntt...)")
+    parser.add_argument("--save", metavar="FICHIER", help="Enregistre les résultats (référence JSON)")
+    parser.add_argument("--compare", metavar="FICHIER", help="Compare à une référence JSON")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Régression tolérée (0.20 = +20%% de temps médian)")
+    parser.add_argument("--quick", action="store_true", help="Mesures courtes (sans 16 Mio)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(engine=args.engine, quick=args.quick)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    _print_table(results, baseline)
+
+    if args.save:
+        report = {
+            "meta": {
+                "engine": args.engine,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "timestamp": time.time(),
+            },
+            "results": results,
+        }
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"[INFO] Référence enregistrée : {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for stage, ratio in regressions:
+            print(f"[RÉGRESSION] {stage} : x{ratio:.2f} (seuil x{1 + args.threshold:.2f})")
+        if regressions:
+            return 1
+        print("[OK] Aucune régression.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
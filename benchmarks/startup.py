@@ -0,0 +1,121 @@
+# Benchmark de démarrage : temps d'import et temps jusqu'au premier octet
+#
+# Chaque mesure est faite dans un processus Python neuf (caches d'import et de
+# matrice froids, comme une invocation CLI de courte durée).
+#
+# Usage :
+#   python -m benchmarks.startup              # mesure et affiche
+#   python -m benchmarks.startup --check      # échoue (code 1) si un objectif est dépassé
+#   python -m benchmarks.startup --runs 10 --engine ntt
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Objectifs (secondes, médiane, hors démarrage de l'interpréteur).
+# first_byte = import + construction + initialize() + generate(32), état absent.
+TARGETS = {
+    "import.mobile_rng": 0.050,
+    "construct.mobile_rng": 0.010,
+    "first_byte": 0.500,
+    "main.demo": 1.000,
+}
+
+# Scripts exécutés dans le processus fils ; ils impriment un JSON {mesure: secondes}
+_IMPORT_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+import src_python.api.mobile_rng
+t1 = time.perf_counter()
+print(json.dumps({"import.mobile_rng": t1 - t0}))
+"""
+
+_FIRST_BYTE_SCRIPT = """
+import io, json, time, contextlib
+t0 = time.perf_counter()
+from src_python.api.mobile_rng import MobileRNG
+ta = time.perf_counter()
+rng = MobileRNG(engine={engine!r}, state_file={state_file!r})
+t1 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    rng.initialize()
+data, status = rng.generate(32)
+t2 = time.perf_counter()
+assert status == 0 and len(data) == 32
+print(json.dumps({{"construct.mobile_rng": t1 - ta, "first_byte": t2 - t0}}))
+"""
+
+def _python(args: List[str], cwd: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT, PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run([sys.executable] + args, cwd=cwd, env=env, check=True,
+                          capture_output=True, text=True)
+
+def _interpreter_overhead(cwd: str) -> float:
+    """Démarrage d'un interpréteur vide (soustrait des mesures de processus entier)."""
+    t0 = time.perf_counter()
+    _python(["-c", "pass"], cwd)
+    return time.perf_counter() - t0
+
+def run_startup(engine: str = "dense", runs: int = 5) -> Dict[str, Dict]:
+    """Retourne {mesure: {"median_s", "min_s", "runs"}} sur `runs` processus neufs."""
+    samples: Dict[str, List[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "secure_state.bin")
+        for _ in range(runs):
+            # 1. Import nu
+            out = _python(["-c", _IMPORT_SCRIPT], tmp)
+            for k, v in json.loads(out.stdout).items():
+                samples.setdefault(k, []).append(v)
+
+            # 2. Construction + initialisation + premier octet (démarrage à froid)
+            if os.path.exists(state_file):
+                os.remove(state_file)
+            out = _python(["-c", _FIRST_BYTE_SCRIPT.format(engine=engine, state_file=state_file)], tmp)
+            for k, v in json.loads(out.stdout).items():
+                samples.setdefault(k, []).append(v)
+
+            # 3. python -m src_python.main --demo (processus entier, interpréteur déduit).
+            # Sans --demo, la CLI diffuse sans limite vers une sortie non-TTY.
+            overhead = _interpreter_overhead(tmp)
+            t0 = time.perf_counter()
+            _python(["-m", "src_python.main", "--demo"], tmp)
+            samples.setdefault("main.demo", []).append(max(0.0, time.perf_counter() - t0 - overhead))
+
+    return {
+        name: {"median_s": statistics.median(values), "min_s": min(values), "runs": len(values)}
+        for name, values in samples.items()
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de démarrage du RNG post-quantique.")
+    parser.add_argument("--engine", default="dense", help="Moteur Lattice (dense, ntt...)")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de processus par mesure")
+    parser.add_argument("--check", action="store_true", help="Code 1 si un objectif est dépassé")
+    args = parser.parse_args(argv)
+
+    results = run_startup(engine=args.engine, runs=args.runs)
+    failed = []
+    for name, r in results.items():
+        target = TARGETS.get(name)
+        line = f"{name:<24} {r['median_s'] * 1e3:>9.1f} ms"
+        if target is not None:
+            ok = r["median_s"] <= target
+            line += f"  (objectif {target * 1e3:.0f} ms : {'OK' if ok else 'DÉPASSÉ'})"
+            if not ok:
+                failed.append(name)
+        print(line)
+
+    if args.check and failed:
+        print(f"[RÉGRESSION] Objectifs dépassés : {', '.join(failed)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# API asyncio native du RNG Mobile
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Executor
+from typing import Tuple, Optional, Dict, List, Deque
+
+from src_python.api.rng_interface import AsyncQuantumSafeRNG
+from src_python.api.mobile_rng import MobileRNG
+from src_python.utils.constants import MAX_BYTES_PER_REQUEST
+
+class AsyncMobileRNG(AsyncQuantumSafeRNG):
+    """
+    MobileRNG pour services asyncio.
+
+    - Tout le travail lourd (produit Lattice, SHAKE, collecte de jitter,
+      écriture du checkpoint d'état) tourne dans un exécuteur : la boucle
+      d'événements n'est jamais bloquée.
+    - Coalescence : les petites requêtes arrivées pendant le même tour de
+      boucle (ou pendant qu'un lot est en cours) sont servies par UN SEUL
+      appel DRBG, puis la sortie est découpée entre les appelants.
+    """
+
+    def __init__(self, rng: Optional[MobileRNG] = None, executor: Optional[Executor] = None,
+                 max_batch_bytes: int = MAX_BYTES_PER_REQUEST, **rng_kwargs):
+        """
+        Args:
+            rng: MobileRNG existant (sinon créé avec rng_kwargs).
+            executor: Exécuteur pour le travail bloquant (défaut : 1 thread dédié).
+            max_batch_bytes: Taille max d'un lot coalescé ; au-delà, requête directe.
+        """
+        self.rng = rng or MobileRNG(**rng_kwargs)
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncMobileRNG")
+        self.max_batch_bytes = max_batch_bytes
+
+        self._pending: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._batch_running = False
+        self.batches = 0
+        self.coalesced_requests = 0
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    # --- Contrat asynchrone ---
+
+    async def initialize(self, security_param: int = 256) -> bool:
+        return await self._run(self.rng.initialize, security_param)
+
+    async def reseed(self, external_entropy: Optional[bytes] = None) -> bool:
+        # Le checkpoint (StateManager) est écrit dans l'exécuteur, hors boucle
+        return await self._run(self.rng.reseed, external_entropy)
+
+    async def generate(self, num_bytes: int) -> Tuple[bytes, int]:
+        if not self.rng.is_initialized:
+            return b"", -1
+        if num_bytes > self.max_batch_bytes:
+            return await self._run(self.rng.generate, num_bytes)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((num_bytes, future))
+        if not self._batch_running:
+            self._batch_running = True
+            asyncio.get_running_loop().call_soon(self._start_batch)
+        return await future
+
+    async def health_check(self) -> Dict:
+        report = self.rng.health_check()
+        report["async"] = {
+            "batches": self.batches,
+            "coalesced_requests": self.coalesced_requests,
+            "pending": len(self._pending),
+        }
+        return report
+
+    # --- Coalescence ---
+
+    def _take_batch(self) -> List[Tuple[int, asyncio.Future]]:
+        batch, total = [], 0
+        while self._pending and total + self._pending[0][0] <= self.max_batch_bytes:
+            num_bytes, future = self._pending.popleft()
+            if future.cancelled():
+                continue
+            batch.append((num_bytes, future))
+            total += num_bytes
+        return batch
+
+    def _start_batch(self):
+        batch = self._take_batch()
+        if not batch:
+            self._batch_running = False
+            return
+        total = sum(n for n, _ in batch)
+        job = asyncio.ensure_future(self._run(self.rng.generate, total))
+        job.add_done_callback(lambda done: self._finish_batch(batch, done))
+
+    def _finish_batch(self, batch, done: "asyncio.Future"):
+        self.batches += 1
+        self.coalesced_requests += len(batch)
+        try:
+            data, status = done.result()
+        except Exception as e:
+            print(f"[ERREUR ASYNC] {e}")
+            data, status = b"", -2
+
+        offset = 0
+        for num_bytes, future in batch:
+            if future.done():
+                continue
+            if status == 0:
+                future.set_result((data[offset:offset + num_bytes], 0))
+            else:
+                future.set_result((b"", status))
+            offset += num_bytes
+
+        # Requêtes arrivées pendant le lot : nouveau lot immédiatement
+        self._start_batch()
+
+    async def close(self):
+        await self._run(self.rng.close)
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,142 @@
+# Génération massive parallèle (multi-processus) pour les gros volumes
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, BinaryIO
+
+from src_python.api.mobile_rng import MobileRNG
+from src_python.core.conditioner import Conditioner, DOMAIN_BULK_WORKER
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.core.engines import resolve_engine_name, create_engine
+from src_python.utils.constants import RESEED_INTERVAL, MAX_BYTES_PER_REQUEST
+
+# Taille de seed des workers (384 bits, comme l'entropie d'initialisation)
+WORKER_SEED_BYTES = 48
+
+# Un bloc doit tenir dans une seule instanciation du DRBG worker
+MAX_CHUNK_SIZE = RESEED_INTERVAL * MAX_BYTES_PER_REQUEST
+
+# --- Côté worker (fonctions de module : picklables) ---
+
+_WORKER_CORE: Optional[LwrDrbgCore] = None
+
+def _init_worker(engine: str):
+    """Un seul cœur DRBG par processus (la matrice publique n'est construite qu'une fois)."""
+    global _WORKER_CORE
+    _WORKER_CORE = create_engine(engine)
+
+def _generate_chunk(parent_seed: bytes, index: int, length: int, core: Optional[LwrDrbgCore] = None) -> bytes:
+    core = core or _WORKER_CORE
+    core.instantiate(derive_chunk_seed(parent_seed, index))
+    return bytes(core.generate_bulk(length))
+
+def derive_chunk_seed(parent_seed: bytes, index: int) -> bytes:
+    """
+    Seed du bloc 'index' : SHAKE-256(parent || index) sous le domaine DOMAIN_BULK_WORKER.
+    Chaque bloc a son propre DRBG, indépendant des autres.
+    """
+    return Conditioner().condition_parts(
+        (parent_seed, index.to_bytes(8, "little")), DOMAIN_BULK_WORKER, WORKER_SEED_BYTES
+    )
+
+class BulkGenerator:
+    """
+    Génération de gros volumes (Go) répartie sur un ProcessPoolExecutor.
+
+    - La requête est découpée en blocs de 'chunk_size' octets.
+    - Le bloc i est produit par un DRBG worker instancié avec
+      derive_chunk_seed(seed_parent, i) : séparation de domaine par bloc.
+    - Les blocs sont écrits DANS L'ORDRE dans le tampon ou fichier de
+      l'appelant, avec un nombre borné de blocs en vol (mémoire constante).
+    - Sortie déterministe pour (seed, chunk_size) fixés, quel que soit le
+      nombre de workers : les tests sont reproductibles.
+    """
+
+    def __init__(self, rng: Optional[MobileRNG] = None, workers: Optional[int] = None,
+                 chunk_size: int = 4 * 1024 * 1024, engine: Optional[str] = None):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size doit être > 0.")
+        if chunk_size > MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size trop grand ({chunk_size} > {MAX_CHUNK_SIZE} octets par DRBG worker).")
+        self.rng = rng
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Résolu dans le parent : tous les workers utilisent le même moteur
+        self.engine = resolve_engine_name(engine)
+
+    def _parent_seed(self, seed: Optional[bytes]) -> bytes:
+        if seed is not None:
+            return seed
+        if self.rng is None:
+            raise ValueError("Il faut une seed explicite ou un MobileRNG initialisé.")
+        parent, status = self.rng.generate(WORKER_SEED_BYTES)
+        if status != 0:
+            raise RuntimeError(f"MobileRNG indisponible (statut {status}).")
+        return parent
+
+    def _bounds(self, num_bytes: Optional[int]):
+        """(index, offset, longueur) de chaque bloc ; sans fin si num_bytes est None."""
+        index, offset = 0, 0
+        while num_bytes is None or offset < num_bytes:
+            length = self.chunk_size if num_bytes is None else min(self.chunk_size, num_bytes - offset)
+            yield index, offset, length
+            index += 1
+            offset += length
+
+    def _chunks(self, parent_seed: bytes, num_bytes: Optional[int]):
+        """Itère (offset, données) dans l'ordre, en gardant au plus 2*workers blocs en vol."""
+        bounds = self._bounds(num_bytes)
+        max_in_flight = 2 * self.workers
+
+        if self.workers == 1:
+            # Un seul worker : même flux, sans processus ni copie inter-processus.
+            # Cœur local effacé à la fin : aucun état secret laissé dans le module
+            core = create_engine(self.engine)
+            try:
+                for index, offset, length in bounds:
+                    yield offset, _generate_chunk(parent_seed, index, length, core)
+            finally:
+                core.wipe()
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.engine,)) as pool:
+            in_flight = deque()
+            for index, offset, length in bounds:
+                in_flight.append((offset, pool.submit(_generate_chunk, parent_seed, index, length)))
+                if len(in_flight) >= max_in_flight:
+                    offset, future = in_flight.popleft()
+                    yield offset, future.result()
+            while in_flight:
+                offset, future = in_flight.popleft()
+                yield offset, future.result()
+
+    def generate_into(self, out, num_bytes: Optional[int] = None, seed: Optional[bytes] = None) -> int:
+        """
+        Remplit un tampon inscriptible (bytearray, mmap, tableau NumPy...).
+
+        Returns:
+            Nombre d'octets écrits.
+        """
+        view = memoryview(out).cast("B")
+        if num_bytes is None:
+            num_bytes = view.nbytes
+        if num_bytes > view.nbytes:
+            raise ValueError("Le tampon de sortie est trop petit.")
+
+        for offset, data in self._chunks(self._parent_seed(seed), num_bytes):
+            view[offset:offset + len(data)] = data
+        return num_bytes
+
+    def iter_chunks(self, num_bytes: Optional[int] = None, seed: Optional[bytes] = None):
+        """Blocs de sortie dans l'ordre (flux sans fin si num_bytes est None)."""
+        for _, data in self._chunks(self._parent_seed(seed), num_bytes):
+            yield data
+
+    def generate_to_file(self, fileobj: BinaryIO, num_bytes: int, seed: Optional[bytes] = None) -> int:
+        """Écrit num_bytes dans un fichier binaire ouvert, dans l'ordre."""
+        written = 0
+        for _, data in self._chunks(self._parent_seed(seed), num_bytes):
+            fileobj.write(data)
+            written += len(data)
+        return written
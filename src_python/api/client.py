@@ -0,0 +1,187 @@
+# Client du démon RNG : pool de connexions + pipelining
+import json
+import queue
+import socket
+import itertools
+import threading
+from typing import Optional, Tuple, Dict, List, Sequence
+
+from src_python.api.rng_interface import QuantumSafeRNG
+from src_python.api.protocol import (
+    HEADER, RESPONSE, OP_GENERATE, OP_RESEED, OP_HEALTH,
+    STATUS_OK, STATUS_NOT_INITIALIZED, STATUS_GENERATION_ERROR, MAX_IN_FLIGHT, DEFAULT_SOCKET_PATH
+)
+
+class DaemonConnectionError(Exception): pass
+
+# Requêtes sans effet de bord côté démon : rejouables après une coupure
+_IDEMPOTENT = frozenset((OP_GENERATE, OP_HEALTH))
+
+class _Connection:
+    """Une connexion Unix bloquante vers le démon."""
+
+    def __init__(self, path: str, timeout: Optional[float]):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self._ids = itertools.count(1)
+
+    def send(self, opcode: int, length: int, payload: bytes = b"") -> int:
+        request_id = next(self._ids) & 0xFFFFFFFF
+        self.sock.sendall(HEADER.pack(request_id, opcode, length) + payload)
+        return request_id
+
+    def _recv_exact(self, n: int) -> bytearray:
+        buf = bytearray(n)
+        view = memoryview(buf)
+        got = 0
+        while got < n:
+            r = self.sock.recv_into(view[got:])
+            if r == 0:
+                raise DaemonConnectionError("Connexion fermée par le démon.")
+            got += r
+        return buf
+
+    def recv(self) -> Tuple[int, int, bytes]:
+        request_id, status, length = RESPONSE.unpack(self._recv_exact(RESPONSE.size))
+        data = bytes(self._recv_exact(length)) if length else b""
+        return request_id, status, data
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class RNGClient(QuantumSafeRNG):
+    """
+    Client du démon RNG local (même contrat que MobileRNG).
+
+    - Pool de connexions : chaque appel emprunte une connexion libre
+      (créée à la demande, au plus pool_size), utilisable depuis plusieurs
+      threads sans verrou global.
+    - Pipelining : generate_many() envoie les requêtes sur une même connexion
+      par fenêtres de max_in_flight (limite du démon), en lisant les
+      réponses d'une fenêtre avant d'envoyer la suivante : au-delà, le démon
+      cesse de lire et les deux côtés se bloqueraient en écriture.
+    - Une connexion en erreur est jetée ; un appel idempotent (GENERATE,
+      HEALTH) est retenté une fois sur une connexion neuve. Un RESEED ne
+      l'est jamais : le démon a pu l'appliquer avant la coupure.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, pool_size: int = 4,
+                 timeout: Optional[float] = 10.0, max_in_flight: int = MAX_IN_FLIGHT):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight doit être >= 1.")
+        self.socket_path = socket_path
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self.is_initialized = False
+
+    # --- Pool ---
+
+    def _acquire(self) -> _Connection:
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                return _Connection(self.socket_path, self.timeout)
+            except OSError as e:
+                self._slots.release()
+                raise DaemonConnectionError(f"Démon injoignable ({self.socket_path}) : {e}")
+
+    def _release(self, conn: _Connection, broken: bool = False):
+        if broken:
+            conn.close()
+        else:
+            self._idle.put(conn)
+        self._slots.release()
+
+    def _call(self, requests: Sequence[Tuple[int, int, bytes]]) -> List[Tuple[int, bytes]]:
+        """Envoie les requêtes par fenêtres de max_in_flight (pipelining), réponses remises dans l'ordre."""
+        attempts = 2 if all(op in _IDEMPOTENT for op, _, _ in requests) else 1
+        for attempt in range(attempts):
+            conn = self._acquire()
+            try:
+                results = []
+                for start in range(0, len(requests), self.max_in_flight):
+                    window = requests[start:start + self.max_in_flight]
+                    ids = [conn.send(op, length, payload) for op, length, payload in window]
+                    expected = set(ids)
+                    responses = {}
+                    while len(responses) < len(ids):
+                        request_id, status, data = conn.recv()
+                        if request_id not in expected or request_id in responses:
+                            raise DaemonConnectionError(f"Réponse inattendue (id {request_id}).")
+                        responses[request_id] = (status, data)
+                    results.extend(responses[i] for i in ids)
+                self._release(conn)
+                return results
+            except (OSError, DaemonConnectionError):
+                self._release(conn, broken=True)
+                if attempt == attempts - 1:
+                    raise
+            except BaseException:
+                # Toute autre erreur : la connexion est dans un état inconnu, le slot est rendu
+                self._release(conn, broken=True)
+                raise
+        return []
+
+    # --- Contrat QuantumSafeRNG ---
+
+    def initialize(self, security_param: int = 256) -> bool:
+        """Vérifie que le démon répond (le démon gère lui-même entropie et état)."""
+        self.is_initialized = bool(self.health_check().get("initialized"))
+        return self.is_initialized
+
+    def reseed(self, external_entropy: Optional[bytes] = None) -> bool:
+        payload = external_entropy or b""
+        try:
+            [(status, _)] = self._call([(OP_RESEED, len(payload), payload)])
+        except (OSError, DaemonConnectionError) as e:
+            print(f"[ERREUR CLIENT] {e}")
+            return False
+        return status == STATUS_OK
+
+    def generate(self, num_bytes: int) -> Tuple[bytes, int]:
+        if not self.is_initialized:
+            return b"", STATUS_NOT_INITIALIZED
+        try:
+            [(status, data)] = self._call([(OP_GENERATE, num_bytes, b"")])
+        except (OSError, DaemonConnectionError) as e:
+            print(f"[ERREUR CLIENT] {e}")
+            return b"", STATUS_GENERATION_ERROR
+        return data, status
+
+    def generate_many(self, sizes: Sequence[int]) -> List[Tuple[bytes, int]]:
+        """N requêtes pipelinées sur une connexion (un aller-retour par fenêtre de max_in_flight)."""
+        if not self.is_initialized:
+            return [(b"", STATUS_NOT_INITIALIZED)] * len(sizes)
+        try:
+            responses = self._call([(OP_GENERATE, n, b"") for n in sizes])
+        except (OSError, DaemonConnectionError) as e:
+            print(f"[ERREUR CLIENT] {e}")
+            return [(b"", STATUS_GENERATION_ERROR)] * len(sizes)
+        return [(data, status) for status, data in responses]
+
+    def health_check(self) -> Dict:
+        try:
+            [(status, data)] = self._call([(OP_HEALTH, 0, b"")])
+        except (OSError, DaemonConnectionError) as e:
+            print(f"[ERREUR CLIENT] {e}")
+            return {"module": "RNGClient", "initialized": False, "error": str(e)}
+        if status != STATUS_OK:
+            return {"module": "RNGClient", "initialized": False, "status": status}
+        return json.loads(data)
+
+    def close(self):
+        """Ferme les connexions inactives du pool."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
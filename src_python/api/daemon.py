@@ -0,0 +1,236 @@
+# Démon RNG local : un pool de DRBG partagé, servi sur une socket Unix
+#
+# Usage :
+#   python -m src_python.api.daemon --socket /tmp/pq_rng.sock --shards 2
+import os
+import sys
+import json
+import stat
+import signal
+import socket
+import asyncio
+import argparse
+import itertools
+from typing import Optional, List
+
+from src_python.api.rng_pool import RNGPool
+from src_python.api.async_rng import AsyncMobileRNG
+from src_python.api.protocol import (
+    HEADER, RESPONSE, OP_GENERATE, OP_RESEED, OP_HEALTH,
+    STATUS_OK, STATUS_GENERATION_ERROR, STATUS_BAD_REQUEST,
+    MAX_REQUEST_BYTES, MAX_RESEED_PAYLOAD, MAX_IN_FLIGHT, DEFAULT_SOCKET_PATH
+)
+
+class RNGDaemon:
+    """
+    Serveur local du RNG post-quantique.
+
+    - UN pool de DRBG (RNGPool) par machine au lieu d'un MobileRNG par
+      processus : matrice publique, tests de démarrage et fichiers d'état
+      ne sont payés qu'une fois.
+    - Chaque connexion est rattachée à un shard (round-robin). Les requêtes
+      concurrentes d'un même shard (toutes connexions confondues) sont
+      coalescées en une génération DRBG par AsyncMobileRNG.
+    - Pipelining : chaque requête d'une connexion est traitée dans sa propre
+      tâche ; au plus max_in_flight requêtes en cours par connexion.
+    - La socket est créée en mode 0600 (utilisateur courant uniquement) ;
+      start() refuse de remplacer la socket d'un démon encore actif.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, num_shards: Optional[int] = None,
+                 engine: Optional[str] = None, state_file: str = "secure_state.bin",
+                 max_in_flight: int = MAX_IN_FLIGHT, **pool_kwargs):
+        self.socket_path = socket_path
+        self.max_in_flight = max_in_flight
+        self.pool = RNGPool(num_shards=num_shards, engine=engine, state_file=state_file, **pool_kwargs)
+        # Un exécuteur (thread) par shard : les shards génèrent en parallèle
+        self.shards: List[AsyncMobileRNG] = [AsyncMobileRNG(rng=shard.rng) for shard in self.pool.shards]
+        self._next_shard = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._owns_socket = False
+        self.connections = 0
+        self.requests = 0
+
+    # --- Cycle de vie ---
+
+    def _claim_socket_path(self) -> bool:
+        """
+        Libère socket_path s'il contient une socket orpheline d'une exécution
+        précédente. Refuse (False) si un démon y répond encore, ou si le chemin
+        n'est pas une socket appartenant à l'utilisateur courant.
+        """
+        try:
+            st = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return True
+        if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.geteuid():
+            print(f"[ERREUR DÉMON] {self.socket_path} existe et n'est pas une socket de l'utilisateur courant.")
+            return False
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        probe.settimeout(1.0)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass  # personne n'écoute : socket orpheline
+        except OSError as e:
+            print(f"[ERREUR DÉMON] Impossible de sonder {self.socket_path} : {e}")
+            return False
+        else:
+            print(f"[ERREUR DÉMON] Un démon écoute déjà sur {self.socket_path}.")
+            return False
+        finally:
+            probe.close()
+        os.unlink(self.socket_path)
+        return True
+
+    async def start(self) -> bool:
+        if not self._claim_socket_path():
+            return False
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, self.pool.initialize):
+            print("[ERREUR DÉMON] Initialisation du pool impossible.")
+            return False
+        # bind, chmod 0600, PUIS listen : aucune connexion possible avant la
+        # restriction des droits, sans toucher à l'umask du processus
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.socket_path)
+            self._owns_socket = True
+            os.chmod(self.socket_path, 0o600)
+            sock.listen(socket.SOMAXCONN)
+            self._server = await asyncio.start_unix_server(self._handle, sock=sock)
+        except BaseException:
+            sock.close()
+            raise
+        return True
+
+    async def serve_forever(self):
+        if self._server is None and not await self.start():
+            return
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for shard in self.shards:
+            await shard.close()
+        if self._owns_socket:
+            self._owns_socket = False
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    # --- Connexions ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        shard = self.shards[next(self._next_shard) % len(self.shards)]
+        write_lock = asyncio.Lock()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    request_id, opcode, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+                    payload = b""
+                    if opcode == OP_RESEED:
+                        if length > MAX_RESEED_PAYLOAD:
+                            break  # flux désynchronisé : on coupe la connexion
+                        payload = await reader.readexactly(length)
+                    elif opcode != OP_GENERATE and not (opcode == OP_HEALTH and length == 0):
+                        # Opcode inconnu ou charge utile inattendue : la trame
+                        # suivante ne peut plus être délimitée, on coupe
+                        break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                await slots.acquire()
+                task = asyncio.ensure_future(
+                    self._process(shard, writer, write_lock, slots, request_id, opcode, length, payload)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _process(self, shard: AsyncMobileRNG, writer: asyncio.StreamWriter, write_lock: asyncio.Lock,
+                       slots: asyncio.Semaphore, request_id: int, opcode: int, length: int, payload: bytes):
+        try:
+            status, data = await self._serve(shard, opcode, length, payload)
+            await self._reply(writer, write_lock, request_id, status, data)
+        finally:
+            slots.release()
+
+    async def _serve(self, shard: AsyncMobileRNG, opcode: int, length: int, payload: bytes):
+        """Retourne (statut, données) pour une requête."""
+        self.requests += 1
+        try:
+            if opcode == OP_GENERATE:
+                if length > MAX_REQUEST_BYTES:
+                    return STATUS_BAD_REQUEST, b""
+                if length == 0:
+                    return STATUS_OK, b""
+                data, status = await shard.generate(length)
+                return status, data
+            if opcode == OP_RESEED:
+                ok = await shard.reseed(payload or None)
+                return STATUS_OK if ok else STATUS_GENERATION_ERROR, b""
+            if opcode == OP_HEALTH:
+                report = await shard.health_check()
+                report["daemon"] = {"connections": self.connections, "requests": self.requests,
+                                    "shards": len(self.shards)}
+                return STATUS_OK, json.dumps(report, default=str).encode()
+            return STATUS_BAD_REQUEST, b""
+        except Exception as e:
+            print(f"[ERREUR DÉMON] {e}")
+            return STATUS_GENERATION_ERROR, b""
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, write_lock: asyncio.Lock,
+                     request_id: int, status: int, data: bytes):
+        async with write_lock:
+            if writer.is_closing():
+                return
+            writer.write(RESPONSE.pack(request_id, status, len(data)))
+            if data:
+                writer.write(data)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Démon RNG post-quantique (socket Unix).")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Chemin de la socket Unix")
+    parser.add_argument("--shards", type=int, default=None, help="Nombre de DRBG (défaut : nb de CPU)")
+    parser.add_argument("--engine", default=None, help="Moteur DRBG (défaut : RNG_ENGINE ou dense)")
+    parser.add_argument("--state-file", default="secure_state.bin", help="Fichier d'état (un par shard)")
+    args = parser.parse_args(argv)
+
+    async def run():
+        daemon = RNGDaemon(args.socket, num_shards=args.shards, engine=args.engine, state_file=args.state_file)
+        if not await daemon.start():
+            return 1
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        print(f"[INFO] Démon RNG prêt sur {args.socket} ({len(daemon.shards)} shard(s)).")
+        await stop.wait()
+        await daemon.close()
+        return 0
+
+    return asyncio.run(run())
+
+if __name__ == "__main__":
+    sys.exit(main())
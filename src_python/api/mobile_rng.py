@@ -1,33 +1,154 @@
 from typing import Tuple, Optional, Dict
+import os
 import time
+import threading
 
 # Imports des composants internes
+# Les briques lourdes (NumPy, pycryptodome, matrice publique) sont importées
+# et construites au premier usage : voir _ensure_components().
 from src_python.api.rng_interface import QuantumSafeRNG
-from src_python.core.lwr_drbg import LwrDrbgCore
-from src_python.core.conditioner import Conditioner
-from src_python.modules.entropy_src import EntropySourceManager, JitterCollector
 from src_python.modules.state_mgr import StateManager
+from src_python.modules.output_buffer import PrefetchBuffer
+from src_python.modules.reseed_scheduler import ReseedScheduler, ReseedPolicy
+from src_python.core.engines import resolve_engine_name, create_engine
+from src_python.utils.metrics import METRICS
+from src_python.utils import forksafe
 
 class MobileRNG(QuantumSafeRNG):
     """
     Implémentation finale du RNG Mobile.
     Orchestre : Jitter -> SHAKE -> LWR-DRBG -> TEE.
+
+    Mode "buffered" (optionnel) : un worker de fond maintient une réserve
+    d'octets pré-générés ; les petites requêtes sont servies depuis cette
+    réserve et les remplissages/reseeds ne se font jamais sur le chemin
+    de la requête.
+
+    Reseed planifié : une politique (requêtes, octets, âge, événement
+    externe) déclenche la préparation du prochain état DRBG en arrière-plan ;
+    il est basculé d'un coup. Seule la limite dure SP 800-90A provoque
+    encore un reseed bloquant, en secours.
+
+    Construction paresseuse : le cœur DRBG (matrice publique) et le
+    gestionnaire d'entropie ne sont créés qu'au premier initialize() /
+    generate(). Un processus qui ne fait que health_check() ne paie ni
+    l'import de NumPy ni la génération de la matrice.
+
+    Fork-safe (serveurs pre-fork) : dans un processus enfant, la première
+    sortie est précédée d'un reseed séparé par domaine (PID, horloge,
+    entropie fraîche) ; la réserve d'octets copiée du parent est effacée et
+    les threads de fond relancés. Détection par os.register_at_fork, avec
+    repli sur un changement de PID.
+
+    Moteur DRBG : choisi par nom dans le registre src_python.core.engines
+    (paramètre 'engine' ou variable d'environnement RNG_ENGINE).
     """
 
-    def __init__(self):
-        # 1. Briques de base
-        self.conditioner = Conditioner()
-        self.collector = JitterCollector()
+    # Politique de sécurité : reseed automatique après N requêtes DRBG
+    AUTO_RESEED_INTERVAL = 1000
+
+    def __init__(self, engine: Optional[str] = None, buffered: bool = False,
+                 buffer_size: int = 64 * 1024, low_watermark: Optional[int] = None,
+                 state_file: str = "secure_state.bin", personalization: bytes = b"",
+                 entropy_pool: bool = False, state_manager: Optional[StateManager] = None,
+                 reseed_policy: Optional[ReseedPolicy] = None, background_reseed: bool = True):
+        # 1. Configuration (les briques lourdes sont construites à la demande)
+        # Moteur DRBG : nom explicite, sinon RNG_ENGINE, sinon "dense" (validé ici)
+        self.engine_name = resolve_engine_name(engine)
+        self._use_entropy_pool = entropy_pool
+        self._conditioner = None
+        self._collector = None
+        self._entropy_pool = None
+        self._entropy_mgr = None
+        self._drbg = None
+        
+        # 2. Gestionnaire d'état (léger : aucun accès disque avant load_state)
+        self.state_mgr = state_manager or StateManager(state_file) # Simule le TEE
         
-        # 2. Gestionnaires
-        self.entropy_mgr = EntropySourceManager(self.collector, self.conditioner)
-        self.state_mgr = StateManager() # Simule le TEE
+        # Chaîne de personnalisation (séparation de domaine, SP 800-90A)
+        self.personalization = personalization
         
-        # 3. Le Cœur Post-Quantique
-        self.drbg = LwrDrbgCore()
+        # 3. Verrou de l'état DRBG (partagé avec le worker de prefetch)
+        self._lock = threading.RLock()
+        # Sérialise la collecte d'entropie (tests de santé à état) entre reseeds
+        self._entropy_lock = threading.Lock()
+        # Incrémenté à chaque reseed : invalide un état préparé devenu obsolète
+        self._reseed_generation = 0
+        
+        # 4. Planificateur de reseed (hors chemin de requête)
+        self.scheduler = ReseedScheduler(
+            prepare_fn=self._prepare_reseed,
+            commit_fn=self._commit_reseed,
+            policy=reseed_policy or ReseedPolicy(max_requests=self.AUTO_RESEED_INTERVAL),
+            background=background_reseed
+        )
+        
+        # 5. Réserve de sortie (mode buffered)
+        self._buffer = None
+        if buffered:
+            self._buffer = PrefetchBuffer(
+                refill_fn=self._refill,
+                capacity=buffer_size,
+                low_watermark=low_watermark
+            )
         
         self.is_initialized = False
 
+        # 6. Détection de fork (hook + repli PID)
+        self._fork_guard = forksafe.ForkGuard()
+        forksafe.register(self)
+
+    # --- Construction paresseuse ---
+
+    def _ensure_components(self):
+        """Importe et construit conditionneur, entropie et cœur LWR (une seule fois)."""
+        if self._drbg is not None:
+            return
+        with self._lock:
+            if self._drbg is not None:
+                return
+            from src_python.core.conditioner import Conditioner
+            from src_python.modules.entropy_src import EntropySourceManager, JitterCollector
+
+            with METRICS.timer("mobile.construct"):
+                # 1. Briques de base
+                self._conditioner = Conditioner()
+                self._collector = JitterCollector()
+                
+                # 2. Pool d'entropie optionnel : collecte + tests de santé en arrière-plan
+                if self._use_entropy_pool:
+                    from src_python.modules.entropy_pool import EntropyPool
+                    self._entropy_pool = EntropyPool.default(self._conditioner, self._collector)
+                self._entropy_mgr = EntropySourceManager(self._collector, self._conditioner, pool=self._entropy_pool)
+                
+                # 3. Le Cœur Post-Quantique (assigné en dernier : sert de drapeau)
+                self._drbg = create_engine(self.engine_name)
+
+    @property
+    def conditioner(self):
+        self._ensure_components()
+        return self._conditioner
+
+    @property
+    def collector(self):
+        self._ensure_components()
+        return self._collector
+
+    @property
+    def entropy_pool(self):
+        self._ensure_components()
+        return self._entropy_pool
+
+    @property
+    def entropy_mgr(self):
+        self._ensure_components()
+        return self._entropy_mgr
+
+    @property
+    def drbg(self):
+        self._ensure_components()
+        return self._drbg
+
     def initialize(self, security_param: int = 256) -> bool:
         """Boot sequence."""
         try:
@@ -42,14 +163,20 @@ class MobileRNG(QuantumSafeRNG):
                 # Cold Start vs Warm Start
                 # On mélange l'ancien état avec le nouveau pour une sécurité maximale
                 print("[INFO] Restauration état TEE détectée.")
-                initial_seed = self.conditioner.condition(seed + fresh_entropy, b"INIT")
+                initial_seed = self.conditioner.condition_parts((seed, fresh_entropy), b"INIT", 32)
             else:
                 print("[INFO] Premier démarrage (Factory Reset).")
                 initial_seed = fresh_entropy
 
             # D. Initialisation du DRBG
-            self.drbg.update(initial_seed)
+            with self._lock:
+                self.drbg.update(initial_seed + self.personalization)
             self.is_initialized = True
+            
+            # E. Démarrage du planificateur de reseed et du prefetch (mode buffered)
+            self.scheduler.start()
+            if self._buffer is not None:
+                self._buffer.start()
             return True
             
         except Exception as e:
@@ -57,60 +184,242 @@ class MobileRNG(QuantumSafeRNG):
             return False
 
     def reseed(self, external_entropy: Optional[bytes] = None) -> bool:
-        """Reseed manuel ou forcé."""
+        """Reseed manuel ou forcé (bloquant)."""
         if not self.is_initialized: return False
-        
+        if not self._check_fork():
+            return False
+
         try:
-            # 1. Entropie interne (Jitter)
-            internal = self.entropy_mgr.get_entropy(48)
-            
-            # 2. Entropie externe (OS, Touch events...)
-            combined = internal
-            if external_entropy:
-                combined += external_entropy
+            # 1-2. Entropie interne (Jitter) + externe (OS, Touch events...)
+            combined = self._collect_entropy(external_entropy)
             
-            # 3. Update DRBG
-            self.drbg.update(combined)
-            
-            # 4. Sauvegarde État (Checkpoint)
-            # On génère un 'token' pour le futur, on ne sauvegarde jamais la clé active
-            next_seed_token = self.drbg.generate(32)
-            self.state_mgr.save_state(next_seed_token, self.drbg.reseed_counter)
+            with self._lock, METRICS.timer("mobile.reseed"):
+                # 3. Update DRBG
+                self.drbg.update(combined)
+                self._reseed_generation += 1
+                
+                # 4. Sauvegarde État (Checkpoint)
+                # On génère un 'token' pour le futur, on ne sauvegarde jamais la clé active
+                next_seed_token = self.drbg.generate(32)
+                self.state_mgr.save_state(next_seed_token, self.drbg.reseed_counter)
             
+            self.scheduler.reset()
+            if METRICS.enabled:
+                METRICS.inc("reseeds")
             return True
         except Exception as e:
             print(f"[ERREUR RESEED] {e}")
             return False
 
+    # --- Fork ---
+
+    def _after_fork_in_child(self):
+        """
+        Hook os.register_at_fork, dans l'enfant : verrous neufs, threads de
+        fond et réserve réinitialisés. Le reseed est différé à la prochaine
+        sortie (_reseed_after_fork) : rien de coûteux pendant le fork.
+        """
+        self._lock = threading.RLock()
+        self._entropy_lock = threading.Lock()
+        self.scheduler.reset_after_fork()
+        if self._buffer is not None:
+            self._buffer.reset_after_fork()
+        if self._entropy_pool is not None:
+            self._entropy_pool.reset_after_fork()
+        self.state_mgr.reset_after_fork()
+        self._fork_guard.mark()
+
+    def _check_fork(self) -> bool:
+        """Chemin de la requête : Vrai si la sortie peut continuer."""
+        if not self._fork_guard.forked():
+            return True
+        return self._reseed_after_fork()
+
+    def _reseed_after_fork(self) -> bool:
+        """
+        Premier appel de sortie dans un enfant : update DRBG sous le domaine
+        DOMAIN_FORK (PID, PID parent, horloge, entropie fraîche), avant tout
+        octet produit. L'état hérité ne sert plus jamais tel quel.
+        """
+        if not self._fork_guard.pending:
+            # Repli PID : fork sans hook Python, rien n'a encore été réinitialisé
+            self._after_fork_in_child()
+        try:
+            from src_python.core.conditioner import DOMAIN_FORK
+            fork_tag = b"".join(v.to_bytes(8, "little") for v in (os.getpid(), os.getppid(), time.time_ns()))
+            fresh = self._collect_entropy(os.urandom(32))
+            with self._lock:
+                if not self._fork_guard.forked():
+                    return True  # Déjà fait par un autre thread de l'enfant
+                material = self.conditioner.condition_parts((fork_tag, fresh), DOMAIN_FORK, 48)
+                self.drbg.update(material)
+                self._reseed_generation += 1
+                self._fork_guard.clear()
+        except Exception as e:
+            print(f"[ERREUR FORK] Reseed de l'enfant impossible : {e}")
+            return False
+
+        self.scheduler.reset()
+        if self.is_initialized:
+            self.scheduler.start()
+            if self._buffer is not None:
+                self._buffer.start()
+        if METRICS.enabled:
+            METRICS.inc("fork_reseeds")
+        return True
+
+    def add_external_entropy(self, entropy: bytes):
+        """
+        Événement d'entropie externe (touch, capteurs...) : déclenche un
+        reseed planifié qui l'intègre, sans bloquer l'appelant.
+        Avec pool d'entropie, l'événement y est aussi mélangé (sans crédit).
+        """
+        if self._entropy_pool is not None:
+            self._entropy_pool.add_event(entropy)
+        self.scheduler.external_event(entropy)
+
+    def _collect_entropy(self, external_entropy: Optional[bytes] = None) -> bytes:
+        with self._entropy_lock:
+            combined = self.entropy_mgr.get_entropy(48)
+        if external_entropy:
+            combined += external_entropy
+        return combined
+
+    def _prepare_reseed(self, external_entropy: Optional[bytes]):
+        """
+        Worker du planificateur, HORS verrou DRBG : collecte d'entropie,
+        état reseedé construit à côté de l'état actif, jeton de checkpoint.
+        Seul l'instantané (état + compteur, un update SHAKE) prend brièvement
+        le verrou : _commit_reseed y rejoue les rotations faites depuis.
+        """
+        with METRICS.timer("reseed.prepare"):
+            combined = self._collect_entropy(external_entropy)
+            with self._lock:
+                generation = self._reseed_generation
+                drbg = self.drbg
+                counter = drbg.reseed_counter
+                next_drbg = drbg.reseeded_copy(combined)
+            token = next_drbg.generate(32)
+        return generation, drbg, counter, combined, next_drbg, token
+
+    def _commit_reseed(self, prepared):
+        """
+        Bascule atomique vers l'état préparé, puis checkpoint hors verrou.
+        Les requêtes servies pendant la préparation ont fait tourner l'état
+        actif : ces rotations Forward Secrecy sont rejouées sur l'état préparé
+        (une rotation SHAKE chacune, sans évaluation Lattice) avant la bascule.
+        """
+        generation, drbg, counter, combined, next_drbg, token = prepared
+        with self._lock:
+            if generation == self._reseed_generation and self._drbg is drbg:
+                # Sans reseed intermédiaire, le compteur ne fait qu'avancer
+                # d'une unité par rotation
+                next_drbg.replay_rotations(drbg.reseed_counter - counter)
+                self._drbg = next_drbg
+            else:
+                # Reseed bloquant (ou fork) entre-temps : on garde son état
+                # et on y ajoute l'entropie préparée (jamais perdue).
+                self._drbg.update(combined)
+                token = self._drbg.generate(32)
+            self._reseed_generation += 1
+            counter = self._drbg.reseed_counter
+        self.scheduler.reset()
+        self.state_mgr.save_state(token, counter)
+        if METRICS.enabled:
+            METRICS.inc("reseeds")
+            METRICS.inc("background_reseeds")
+
     def generate(self, num_bytes: int) -> Tuple[bytes, int]:
         """Génération sécurisée."""
         if not self.is_initialized:
             return b"", -1 # Erreur Non-Init
+        if not self._check_fork():
+            return b"", -2
+
+        # Mode buffered : service depuis la réserve pré-générée
+        if self._buffer is not None:
+            data = self._buffer.take(num_bytes)
+            if data is not None:
+                return data, 0
             
+        with self._lock:
+            return self._generate_direct(num_bytes)
+
+    def _generate_direct(self, num_bytes: int) -> Tuple[bytes, int]:
+        """Chemin synchrone : appel direct au cœur LWR (sous verrou)."""
         try:
             # Appel au cœur LWR
-            data = self.drbg.generate(num_bytes)
-            
-            # Auto-reseed périodique (Politique de sécurité)
-            if self.drbg.reseed_counter > 1000:
-                self.reseed()
-                
+            data = self._call_drbg(lambda drbg: drbg.generate(num_bytes), num_bytes)
             return data, 0 # Succès
-            
-        except RuntimeError:
-            # Si le DRBG force un reseed (compteur dépassé)
-            self.reseed()
-            return self.drbg.generate(num_bytes), 0
         except Exception as e:
             print(f"[ERREUR GEN] {e}")
             return b"", -2
 
+    def _call_drbg(self, op, num_bytes: int):
+        """
+        Exécute op(drbg) (sous verrou) et signale la requête au planificateur.
+        Limite dure SP 800-90A atteinte (RuntimeError) : reseed bloquant
+        de secours, puis nouvel essai.
+        """
+        drbg = self.drbg
+        before = drbg.reseed_counter
+        try:
+            result = op(drbg)
+        except RuntimeError:
+            METRICS.inc("forced_reseeds")
+            if not self.reseed():
+                raise
+            drbg = self.drbg
+            before = drbg.reseed_counter
+            result = op(drbg)
+        self.scheduler.record(num_bytes, requests=drbg.reseed_counter - before)
+        return result
+
+    def readinto(self, buffer) -> int:
+        """
+        Zéro-copie : écrit la sortie DRBG directement dans un tampon de
+        l'appelant (bytearray, tableau NumPy, tranche de mmap...).
+
+        Returns:
+            Nombre d'octets écrits (toute la taille du tampon).
+        Raises:
+            RuntimeError: si le RNG n'est pas initialisé.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("MobileRNG non initialisé.")
+        if not self._check_fork():
+            raise RuntimeError("MobileRNG : reseed après fork impossible.")
+        with self._lock:
+            return self._call_drbg(lambda drbg: drbg.readinto(buffer), memoryview(buffer).nbytes)
+
+    def _refill(self, num_bytes: int) -> bytearray:
+        """Remplissage de la réserve (thread de fond uniquement)."""
+        with self._lock:
+            return self._call_drbg(lambda drbg: drbg.generate_bulk(num_bytes), num_bytes)
+
+    def close(self):
+        """Arrête les threads de fond (reseed, prefetch, pool d'entropie, écritures d'état) et efface la réserve."""
+        self.scheduler.stop()
+        if self._buffer is not None:
+            self._buffer.stop()
+        if self._entropy_pool is not None:
+            self._entropy_pool.stop()
+        self.state_mgr.close()
+
     def health_check(self) -> Dict:
         """Diagnostic."""
         status = {
             "module": "MobileRNG-LWR",
             "initialized": self.is_initialized,
-            "reseed_count": self.drbg.reseed_counter,
-            "entropy_source": "OK" if self.entropy_mgr.startup_done else "UNKNOWN"
+            # Diagnostic sans effet de bord : ne construit pas le cœur s'il n'existe pas encore
+            "reseed_count": self._drbg.reseed_counter if self._drbg is not None else 0,
+            "entropy_source": "OK" if self._entropy_mgr is not None and self._entropy_mgr.startup_done else "UNKNOWN"
         }
+        status["reseed_scheduler"] = self.scheduler.metrics()
+        if self._buffer is not None:
+            status["buffer"] = self._buffer.metrics()
+        if self._entropy_pool is not None:
+            status["entropy_pool"] = self._entropy_pool.metrics()
+        if METRICS.enabled:
+            status["metrics"] = METRICS.snapshot()
         return status
\ No newline at end of file
@@ -0,0 +1,41 @@
+# Protocole binaire du démon RNG (socket Unix locale)
+#
+# Requête  : id u32 | opcode u8 | longueur u32 | charge utile (longueur octets)
+# Réponse  : id u32 | statut i8 | longueur u32 | charge utile (longueur octets)
+#
+# Little-endian, 9 octets d'en-tête. L'id est choisi par le client et
+# renvoyé tel quel : plusieurs requêtes peuvent être envoyées sur la même
+# connexion sans attendre les réponses (pipelining), qui peuvent revenir
+# dans un ordre différent.
+#
+#   OP_GENERATE : longueur = nombre d'octets demandés, pas de charge utile
+#   OP_RESEED   : charge utile = entropie externe (éventuellement vide)
+#   OP_HEALTH   : longueur = 0 ; réponse = rapport JSON (UTF-8)
+#
+# Une trame invalide (opcode inconnu, OP_HEALTH avec longueur non nulle)
+# ferme la connexion : le flux ne peut plus être resynchronisé.
+import struct
+
+HEADER = struct.Struct("<IBI")
+RESPONSE = struct.Struct("<IbI")
+
+OP_GENERATE = 1
+OP_RESEED = 2
+OP_HEALTH = 3
+
+# Statuts (mêmes conventions que QuantumSafeRNG.generate)
+STATUS_OK = 0
+STATUS_NOT_INITIALIZED = -1
+STATUS_GENERATION_ERROR = -2
+STATUS_BAD_REQUEST = -3
+
+# Taille maximale d'une requête GENERATE / d'une charge utile RESEED
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+MAX_RESEED_PAYLOAD = 4096
+
+# Requêtes en cours par connexion : au-delà, le démon cesse de lire la
+# socket ; un client qui pipeline n'envoie donc pas plus de MAX_IN_FLIGHT
+# requêtes avant d'en lire les réponses.
+MAX_IN_FLIGHT = 64
+
+DEFAULT_SOCKET_PATH = "/tmp/pq_rng.sock"
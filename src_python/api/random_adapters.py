@@ -0,0 +1,388 @@
+# Adaptateurs random.Random / NumPy au-dessus du DRBG post-quantique
+import random
+import ctypes
+import threading
+from typing import Optional, Union
+
+import numpy as np
+
+# Taille des blocs pressés dans le DRBG (une requête DRBG par bloc, pas par valeur)
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+_WORD_BYTES = 8
+_DOUBLE_SCALE = 1.0 / (1 << 53)
+
+class BlockSource:
+    """
+    Réserve de mots de 64 bits pressés par gros blocs dans le DRBG.
+
+    Accepte toute source exposant readinto(tampon) : MobileRNG, LwrDrbgCore,
+    RNGStream... Les consommateurs piochent des mots (vectorisé) ou un mot
+    à la fois (chemin Python) ; le DRBG n'est appelé qu'une fois par bloc.
+    """
+
+    def __init__(self, rng, block_size: int = DEFAULT_BLOCK_SIZE):
+        if block_size < _WORD_BYTES:
+            raise ValueError(f"block_size doit être >= {_WORD_BYTES}.")
+        if not callable(getattr(rng, "readinto", None)):
+            raise TypeError(f"{type(rng).__name__} n'expose pas readinto(tampon).")
+        self.rng = rng
+        self.block_words = block_size // _WORD_BYTES
+        self.lock = threading.Lock()
+        self._block = np.empty(self.block_words, dtype="<u8")
+        self._pos = self.block_words   # réserve vide
+        self._scalars: list = []       # copie Python (chemin un-mot-à-la-fois)
+        self.blocks = 0
+
+    def _refill(self):
+        """(sous self.lock)"""
+        self.rng.readinto(self._block)
+        self._pos = 0
+        self._scalars = []
+        self.blocks += 1
+
+    def words(self, count: int) -> np.ndarray:
+        """Retourne `count` mots uint64 (copie)."""
+        out = np.empty(count, dtype="<u8")
+        filled = 0
+        with self.lock:
+            while filled < count:
+                if self._pos == self.block_words:
+                    # Grosse demande : on presse directement dans la sortie
+                    if count - filled >= self.block_words:
+                        self.rng.readinto(out[filled:])
+                        self.blocks += 1
+                        return out
+                    self._refill()
+                n = min(count - filled, self.block_words - self._pos)
+                out[filled:filled + n] = self._block[self._pos:self._pos + n]
+                self._pos += n
+                filled += n
+        return out
+
+    def word(self) -> int:
+        """Un mot de 64 bits (entier Python) : chemin des appels unitaires."""
+        with self.lock:
+            if self._pos == self.block_words:
+                self._refill()
+            if not self._scalars:
+                # Conversion en entiers Python une fois par bloc (pas par valeur)
+                self._scalars = self._block.tolist()
+            value = self._scalars[self._pos]
+            self._pos += 1
+            return value
+
+    def bytes(self, num_bytes: int) -> bytes:
+        return self.words(-(-num_bytes // _WORD_BYTES)).tobytes()[:num_bytes]
+
+# --- random.Random ---
+
+class PQRandom(random.Random):
+    """
+    random.Random alimenté par le DRBG (même contrat que random.SystemRandom) :
+    randrange, randint, choice, shuffle, sample, uniform, gauss... utilisent
+    getrandbits() (rejet non biaisé de la bibliothèque standard) et random().
+
+    seed(a) injecte `a` comme entropie externe (reseed) si la source le
+    permet ; l'état n'est ni lisible ni restaurable (getstate/setstate).
+    """
+
+    def __init__(self, rng, block_size: int = DEFAULT_BLOCK_SIZE):
+        self._source = BlockSource(rng, block_size)
+        super().__init__()
+
+    def seed(self, a=None, version: int = 2):
+        if a is None or not hasattr(self._source.rng, "reseed"):
+            return
+        if isinstance(a, int):
+            a = a.to_bytes((a.bit_length() + 8) // 8, "little", signed=True)
+        elif isinstance(a, str):
+            a = a.encode()
+        self._source.rng.reseed(bytes(a))
+
+    def random(self) -> float:
+        """Flottant uniforme dans [0, 1) sur 53 bits."""
+        return (self._source.word() >> 11) * _DOUBLE_SCALE
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k <= 64:
+            return self._source.word() >> (64 - k) if k else 0
+        num_bytes = (k + 7) // 8
+        return int.from_bytes(self._source.bytes(num_bytes), "little") >> (num_bytes * 8 - k)
+
+    def randbytes(self, n: int) -> bytes:
+        return self._source.bytes(n)
+
+    def getstate(self):
+        raise NotImplementedError("État DRBG non exportable.")
+
+    def setstate(self, state):
+        raise NotImplementedError("État DRBG non restaurable.")
+
+# --- Tirage vectorisé (NumPy) ---
+
+def _bounded_words(source: BlockSource, ranges: np.ndarray) -> np.ndarray:
+    """
+    Entiers uniformes dans [0, ranges[i]) pour chaque i (1 <= ranges[i] <= 2^32),
+    méthode de Lemire sans division dans le cas courant :
+        m = x * r (x sur 32 bits), accepté si (m mod 2^32) >= (2^32 - r) mod r,
+        résultat = m >> 32.
+    Les éléments rejetés (probabilité < r / 2^32) sont retirés au tour suivant.
+    """
+    ranges = ranges.astype(np.uint64)
+    thresholds = (np.uint64(1 << 32) - ranges) % ranges
+    out = np.empty(ranges.size, dtype=np.uint64)
+    todo = np.arange(ranges.size)
+    while todo.size:
+        # Deux candidats de 32 bits par mot de 64 bits
+        words = source.words((todo.size + 1) // 2)
+        x = np.concatenate((words & np.uint64(0xFFFFFFFF), words >> np.uint64(32)))[:todo.size]
+        m = x * ranges[todo]
+        ok = (m & np.uint64(0xFFFFFFFF)) >= thresholds[todo]
+        out[todo[ok]] = m[ok] >> np.uint64(32)
+        todo = todo[~ok]
+    return out
+
+def _masked_words(source: BlockSource, span: int, count: int) -> np.ndarray:
+    """Entiers uniformes dans [0, span) pour span > 2^32 : masque + rejet (acceptation >= 50%)."""
+    mask = np.uint64((1 << (span - 1).bit_length()) - 1)
+    out = np.empty(count, dtype=np.uint64)
+    filled = 0
+    while filled < count:
+        candidates = source.words(count - filled) & mask
+        accepted = candidates[candidates < np.uint64(span)] if span < (1 << 64) else candidates
+        out[filled:filled + accepted.size] = accepted
+        filled += accepted.size
+    return out
+
+class PQGenerator:
+    """
+    Sous-ensemble vectorisé de numpy.random.Generator alimenté par le DRBG :
+    integers, random, bytes, permutation, shuffle, choice.
+    Des millions de valeurs coûtent quelques requêtes DRBG de block_size octets.
+    Pour les autres lois (normal, poisson...) : numpy_generator().
+    """
+
+    def __init__(self, rng, block_size: int = DEFAULT_BLOCK_SIZE):
+        self._source = BlockSource(rng, block_size)
+        self._bit_generator: Optional["PQBitGenerator"] = None
+
+    @property
+    def bit_generator(self) -> "PQBitGenerator":
+        if self._bit_generator is None:
+            self._bit_generator = PQBitGenerator(source=self._source)
+        return self._bit_generator
+
+    def numpy_generator(self) -> np.random.Generator:
+        """Vrai numpy.random.Generator sur le même flux (toutes les lois, plus lent, erreurs vérifiées)."""
+        return self.bit_generator.generator()
+
+    def random_raw(self, size=None):
+        if size is None:
+            return self._source.word()
+        return self._source.words(int(np.prod(size))).reshape(size)
+
+    def bytes(self, length: int) -> bytes:
+        return self._source.bytes(length)
+
+    def random(self, size=None, dtype=np.float64):
+        """Flottants uniformes dans [0, 1) (53 bits en float64, 24 bits en float32)."""
+        dtype = np.dtype(dtype)
+        count = 1 if size is None else int(np.prod(size))
+        words = self._source.words(count)
+        if dtype == np.float64:
+            values = (words >> np.uint64(11)).astype(np.float64) * _DOUBLE_SCALE
+        elif dtype == np.float32:
+            values = (words >> np.uint64(40)).astype(np.float32) * np.float32(1.0 / (1 << 24))
+        else:
+            raise TypeError(f"Type flottant non supporté : {dtype}")
+        return values[0] if size is None else values.reshape(size)
+
+    def integers(self, low, high=None, size=None, dtype=np.int64, endpoint: bool = False):
+        """Entiers uniformes dans [low, high) (ou [low, high] si endpoint), sans biais."""
+        if high is None:
+            low, high = 0, low
+        low, high = int(low), int(high) + (1 if endpoint else 0)
+        span = high - low
+        if span <= 0:
+            raise ValueError("low >= high")
+        if span > 1 << 64:
+            raise ValueError("Intervalle supérieur à 2^64 non supporté.")
+        count = 1 if size is None else int(np.prod(size))
+
+        if span <= 1 << 32:
+            offsets = _bounded_words(self._source, np.full(count, span, dtype=np.uint64))
+        else:
+            offsets = _masked_words(self._source, span, count)
+
+        info = np.iinfo(dtype)
+        if low < info.min or high - 1 > info.max:
+            raise ValueError(f"Intervalle hors du type {np.dtype(dtype).name}.")
+        if low >= 0:
+            values = (offsets + np.uint64(low)).astype(dtype)
+        else:
+            # Décalage signé : arithmétique modulo 2^64 puis réinterprétation
+            values = (offsets + np.uint64(low % (1 << 64))).view(np.int64).astype(dtype)
+        return values[0] if size is None else values.reshape(size)
+
+    def permutation(self, x):
+        """Permutation uniforme (Fisher-Yates vectorisé : indices tirés d'un coup)."""
+        if isinstance(x, (int, np.integer)):
+            arr = np.arange(x)
+        else:
+            arr = np.array(x, copy=True)
+        self.shuffle(arr)
+        return arr
+
+    def shuffle(self, x: Union[np.ndarray, list]):
+        """Mélange en place (axe 0), Fisher-Yates avec indices j_i uniformes dans [0, i]."""
+        n = len(x)
+        if n < 2:
+            return
+        if n > 1 << 32:
+            raise ValueError("Séquence trop longue (2^32 éléments max).")
+        bounds = np.arange(n, 1, -1, dtype=np.uint64)          # i + 1 pour i = n-1 .. 1
+        swaps = _bounded_words(self._source, bounds).tolist()  # j_i dans [0, i]
+        if isinstance(x, np.ndarray) and x.ndim == 1:
+            # Échanges sur une liste Python puis recopie : bien plus rapide qu'indexer NumPy
+            items = x.tolist()
+            self._swap_all(items, swaps)
+            x[:] = items
+        elif isinstance(x, np.ndarray):
+            order = list(range(n))
+            self._swap_all(order, swaps)
+            x[:] = x[order]
+        else:
+            self._swap_all(x, swaps)
+
+    @staticmethod
+    def _swap_all(items, swaps):
+        i = len(items) - 1
+        for j in swaps:
+            items[i], items[j] = items[j], items[i]
+            i -= 1
+
+    def choice(self, a, size=None, replace: bool = True):
+        """Tirage uniforme d'éléments de a (entier = np.arange(a)), avec ou sans remise."""
+        pool = np.arange(a) if isinstance(a, (int, np.integer)) else np.asarray(a)
+        count = 1 if size is None else int(np.prod(size))
+        if replace:
+            picks = pool[self.integers(0, len(pool), size=count)]
+        else:
+            if count > len(pool):
+                raise ValueError("Échantillon plus grand que la population (sans remise).")
+            picks = pool[self.permutation(len(pool))[:count]]
+        return picks[0] if size is None else picks.reshape(size)
+
+# --- BitGenerator compatible NumPy ---
+
+class _BitGenT(ctypes.Structure):
+    """Miroir de bitgen_t (numpy/random/bitgen.h)."""
+    _fields_ = [
+        ("state", ctypes.c_void_p),
+        ("next_uint64", ctypes.CFUNCTYPE(ctypes.c_uint64, ctypes.c_void_p)),
+        ("next_uint32", ctypes.CFUNCTYPE(ctypes.c_uint32, ctypes.c_void_p)),
+        ("next_double", ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_void_p)),
+        ("next_raw", ctypes.CFUNCTYPE(ctypes.c_uint64, ctypes.c_void_p)),
+    ]
+
+_PyCapsule_New = ctypes.pythonapi.PyCapsule_New
+_PyCapsule_New.restype = ctypes.py_object
+_PyCapsule_New.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p]
+
+class PQBitGenerator:
+    """
+    Adaptateur BitGenerator (interface NumPy par duck-typing : capsule
+    "BitGenerator" + lock + random_raw) : np.random.Generator(PQBitGenerator(rng))
+    donne accès à toutes les lois NumPy, alimentées par le DRBG.
+
+    NumPy appelle la source une fois par valeur via ctypes (~0.5 us/valeur) :
+    pour les entiers et flottants uniformes en masse, préférer PQGenerator.
+
+    Un callback ctypes ne peut pas lever d'exception (ctypes l'affiche et
+    renvoie 0 à NumPy) : un échec de la source (reseed requis, RNG non
+    initialisé...) est donc mémorisé et les callbacks ne touchent plus la
+    source jusqu'à check(), qui lève l'erreur. En attendant, ils renvoient
+    un bouche-trou NON aléatoire (SplitMix64 d'un compteur) : des zéros
+    constants bloqueraient les boucles de rejet de NumPy (integers...).
+    generator() retourne un Generator qui appelle check() après chaque
+    méthode : l'utiliser plutôt qu'un np.random.Generator nu, dont la
+    sortie ne serait pas vérifiée.
+    """
+
+    def __init__(self, rng=None, block_size: int = DEFAULT_BLOCK_SIZE, source: Optional[BlockSource] = None):
+        if source is None:
+            if rng is None:
+                raise ValueError("rng ou source requis.")
+            source = BlockSource(rng, block_size)
+        self._source = source
+        self.lock = threading.Lock()
+        self._failure: Optional[Exception] = None
+        self._filler = 0
+
+        word = self._word
+        # Les callbacks sont gardés en attributs : ils doivent vivre autant que la capsule
+        self._callbacks = (
+            _BitGenT._fields_[1][1](lambda _: word()),
+            _BitGenT._fields_[2][1](lambda _: word() >> 32),
+            _BitGenT._fields_[3][1](lambda _: (word() >> 11) * _DOUBLE_SCALE),
+            _BitGenT._fields_[4][1](lambda _: word()),
+        )
+        self._bitgen = _BitGenT(None, *self._callbacks)
+        self.capsule = _PyCapsule_New(ctypes.addressof(self._bitgen), b"BitGenerator", None)
+
+    def _word(self) -> int:
+        """Callback : ne lève jamais (l'échec est mémorisé pour check())."""
+        if self._failure is None:
+            try:
+                return self._source.word()
+            except Exception as e:
+                self._failure = e
+                print(f"[ERREUR RNG] Source DRBG en échec, sortie NumPy invalide : {e}")
+        # SplitMix64 : termine les boucles de rejet, jamais servi par generator()
+        self._filler = (self._filler + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        z = self._filler
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        return z ^ (z >> 31)
+
+    def check(self):
+        """
+        Lève (et efface) l'échec mémorisé par les callbacks.
+        Raises:
+            RuntimeError: la source a échoué ; la sortie NumPy depuis le
+                          dernier check() est invalide (bouche-trou).
+        """
+        failure, self._failure = self._failure, None
+        if failure is not None:
+            raise RuntimeError(f"Source DRBG en échec, sortie NumPy invalide : {failure}") from failure
+
+    def generator(self) -> np.random.Generator:
+        """np.random.Generator dont chaque méthode est suivie de check()."""
+        return _CheckedGenerator(self)
+
+    def random_raw(self, size=None, output: bool = True):
+        """Mots bruts de 64 bits (même signature que numpy BitGenerator.random_raw)."""
+        self.check()
+        if size is None:
+            value = self._source.word()
+            return value if output else None
+        words = self._source.words(int(np.prod(size))).reshape(size)
+        return words if output else None
+
+class _CheckedGenerator(np.random.Generator):
+    """np.random.Generator sur un PQBitGenerator : check() après chaque appel de méthode publique."""
+
+    def __getattribute__(self, name):
+        attr = super().__getattribute__(name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        check = super().__getattribute__("bit_generator").check
+
+        def checked(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            check()
+            return result
+        return checked
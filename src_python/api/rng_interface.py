@@ -29,4 +29,33 @@ class QuantumSafeRNG(ABC):
     @abstractmethod
     def health_check(self) -> Dict:
         """Retourne un rapport de diagnostic complet."""
-        pass
\ No newline at end of file
+        pass
+
+class AsyncQuantumSafeRNG(ABC):
+    """
+    Version asyncio du contrat QuantumSafeRNG (services à boucle d'événements).
+    Mêmes sémantiques et codes de statut, méthodes awaitables.
+    """
+
+    @abstractmethod
+    async def initialize(self, security_param: int = 256) -> bool:
+        """Démarre le système sans bloquer la boucle d'événements."""
+        pass
+
+    @abstractmethod
+    async def reseed(self, external_entropy: Optional[bytes] = None) -> bool:
+        """Rafraîchit l'état interne hors de la boucle d'événements."""
+        pass
+
+    @abstractmethod
+    async def generate(self, num_bytes: int) -> Tuple[bytes, int]:
+        """
+        Génère des octets aléatoires.
+        Retourne: (données, code_statut) où 0 = Succès.
+        """
+        pass
+
+    @abstractmethod
+    async def health_check(self) -> Dict:
+        """Retourne un rapport de diagnostic complet."""
+        pass
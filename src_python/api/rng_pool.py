@@ -0,0 +1,151 @@
+# Pool de RNG shardé pour serveurs multi-threads
+import os
+import itertools
+import threading
+from typing import Tuple, Optional, Dict, List
+
+from src_python.api.rng_interface import QuantumSafeRNG
+from src_python.api.mobile_rng import MobileRNG
+from src_python.utils import forksafe
+
+class _Shard:
+    """Une instance MobileRNG indépendante, son verrou et sa file d'attente."""
+
+    def __init__(self, index: int, rng: MobileRNG):
+        self.index = index
+        self.rng = rng
+        self.lock = threading.Lock()
+        # Threads en attente de 'lock' (routage least_contention), sous son propre petit verrou
+        self.pending_lock = threading.Lock()
+        self.pending = 0
+        self.requests = 0
+
+    def wait_for_lock(self):
+        """Acquiert 'lock' en comptant l'attente dans 'pending'."""
+        with self.pending_lock:
+            self.pending += 1
+        try:
+            self.lock.acquire()
+        finally:
+            with self.pending_lock:
+                self.pending -= 1
+
+class RNGPool(QuantumSafeRNG):
+    """
+    Pool de N DRBG indépendants (shards) derrière le contrat QuantumSafeRNG.
+
+    - Chaque shard a son propre état LWR, son propre verrou, son propre
+      fichier d'état et une personnalisation séparée par domaine
+      (b"SHARD" || index) : deux shards ne produisent jamais le même flux.
+    - Routage "affinity" : chaque thread est attaché à un shard (round-robin
+      à la première requête) -> aucune contention entre threads attachés
+      à des shards différents.
+    - Routage "least_contention" : premier shard libre, sinon celui qui a
+      le moins de requêtes en attente.
+    - Reseed et checkpoint se font sous le verrou du seul shard concerné :
+      les autres shards continuent de servir.
+    """
+
+    ROUTINGS = ("affinity", "least_contention")
+
+    def __init__(self, num_shards: Optional[int] = None, engine: Optional[str] = None,
+                 routing: str = "affinity", state_file: str = "secure_state.bin",
+                 personalization: bytes = b""):
+        if routing not in self.ROUTINGS:
+            raise ValueError(f"Routage inconnu : {routing} (disponibles : {self.ROUTINGS})")
+        self.routing = routing
+        self.num_shards = num_shards or os.cpu_count() or 1
+
+        root, ext = os.path.splitext(state_file)
+        self.shards: List[_Shard] = []
+        for i in range(self.num_shards):
+            rng = MobileRNG(
+                engine=engine,
+                state_file=f"{root}.shard{i}{ext}",
+                personalization=personalization + b"SHARD" + i.to_bytes(4, "little")
+            )
+            self.shards.append(_Shard(i, rng))
+
+        self._affinity = threading.local()
+        self._next_shard = itertools.count()
+        self.is_initialized = False
+        forksafe.register(self)
+
+    def _after_fork_in_child(self):
+        """Hook de fork : verrous de shard neufs (chaque MobileRNG gère son propre reseed)."""
+        for shard in self.shards:
+            shard.lock = threading.Lock()
+            shard.pending_lock = threading.Lock()
+            shard.pending = 0
+
+    # --- Routage ---
+
+    def _shard_for_thread(self) -> _Shard:
+        index = getattr(self._affinity, "index", None)
+        if index is None:
+            index = next(self._next_shard) % self.num_shards
+            self._affinity.index = index
+        return self.shards[index]
+
+    def _acquire_shard(self) -> _Shard:
+        """Retourne un shard dont le verrou est DÉJÀ acquis."""
+        if self.routing == "affinity":
+            shard = self._shard_for_thread()
+        else:
+            start = next(self._next_shard) % self.num_shards
+            for i in range(self.num_shards):
+                shard = self.shards[(start + i) % self.num_shards]
+                if shard.lock.acquire(blocking=False):
+                    return shard
+            shard = min(self.shards, key=lambda s: s.pending)
+
+        shard.wait_for_lock()
+        return shard
+
+    # --- Contrat QuantumSafeRNG ---
+
+    def initialize(self, security_param: int = 256) -> bool:
+        """Initialise tous les shards (chacun avec sa propre entropie)."""
+        ok = True
+        for shard in self.shards:
+            with shard.lock:
+                ok = shard.rng.initialize(security_param) and ok
+        self.is_initialized = ok
+        return ok
+
+    def reseed(self, external_entropy: Optional[bytes] = None) -> bool:
+        """Reseed des shards un par un : un seul shard bloqué à la fois."""
+        ok = True
+        for shard in self.shards:
+            with shard.lock:
+                ok = shard.rng.reseed(external_entropy) and ok
+        return ok
+
+    def generate(self, num_bytes: int) -> Tuple[bytes, int]:
+        if not self.is_initialized:
+            return b"", -1
+        shard = self._acquire_shard()
+        try:
+            shard.requests += 1
+            return shard.rng.generate(num_bytes)
+        finally:
+            shard.lock.release()
+
+    def health_check(self) -> Dict:
+        shards = []
+        for shard in self.shards:
+            report = shard.rng.health_check()
+            report["shard"] = shard.index
+            report["requests"] = shard.requests
+            shards.append(report)
+        return {
+            "module": "RNGPool-LWR",
+            "initialized": self.is_initialized,
+            "routing": self.routing,
+            "num_shards": self.num_shards,
+            "shards": shards,
+        }
+
+    def close(self):
+        for shard in self.shards:
+            shard.rng.close()
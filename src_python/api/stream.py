@@ -0,0 +1,63 @@
+# Interface flux (fichier) pour la sortie DRBG
+import io
+from typing import Optional, Iterator, Union
+
+from src_python.api.mobile_rng import MobileRNG
+
+class RNGStream(io.RawIOBase):
+    """
+    Flux binaire en lecture seule sur un MobileRNG (compatible io.RawIOBase).
+
+    readinto() presse le SHAKE directement dans le tampon fourni par
+    l'appelant : shutil.copyfileobj(RNGStream(rng, limit=n), fichier)
+    copie des Go sans objets intermédiaires. Pour des lectures bufferisées,
+    envelopper dans io.BufferedReader.
+    """
+
+    def __init__(self, rng: MobileRNG, limit: Optional[int] = None):
+        """
+        Args:
+            rng: MobileRNG initialisé.
+            limit: Nombre total d'octets à fournir (None = flux infini).
+        """
+        super().__init__()
+        self.rng = rng
+        self.remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        n = view.nbytes
+        if self.remaining is not None:
+            n = min(n, self.remaining)
+            self.remaining -= n
+        if n == 0:
+            return 0
+        return self.rng.readinto(view[:n])
+
+def iter_chunks(rng: MobileRNG, chunk_size: int = 1024 * 1024, total: Optional[int] = None,
+                reuse_buffer: bool = False) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Générateur de blocs de taille fixe (le dernier peut être plus court).
+
+    Args:
+        rng: MobileRNG initialisé.
+        chunk_size: Taille de chaque bloc.
+        total: Nombre total d'octets (None = infini).
+        reuse_buffer: Si True, le MÊME tampon est réutilisé et un memoryview
+                      est produit à chaque tour (zéro allocation) : le
+                      consommateur doit l'utiliser avant le bloc suivant.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size doit être > 0.")
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    remaining = total
+    while remaining is None or remaining > 0:
+        n = chunk_size if remaining is None else min(chunk_size, remaining)
+        rng.readinto(view[:n])
+        if remaining is not None:
+            remaining -= n
+        yield view[:n] if reuse_buffer else bytes(view[:n])
@@ -1,6 +1,22 @@
 # Toeplitz + SHAKE256 Conditioner + LWR
 # Basé sur le standard NIST SP 800-90A
-from Crypto.Hash import SHAKE256
+import hashlib
+from typing import Iterable, Sequence, List, Optional, Union
+
+from src_python.utils.metrics import METRICS
+
+# Domaines de conditionnement du chemin critique
+DOMAIN_DRBG_UPDATE = b"DRBG_UPDATE_LWR"
+DOMAIN_OUTPUT = b"LWR_OUTPUT"
+DOMAIN_ENTROPY = b"ENTROPY"
+# Reseed d'un enfant après fork() (séparé des reseeds ordinaires)
+DOMAIN_FORK = b"DRBG_FORK_CHILD"
+# Seeds des flux d'une banque MultiStreamDrbg (dérivées d'une seed maître)
+DOMAIN_MULTI_STREAM = b"MULTI_STREAM"
+# Seeds des blocs de BulkGenerator (dérivées de la seed parente)
+DOMAIN_BULK_WORKER = b"BULK_WORKER"
+
+Buffer = Union[bytes, bytearray, memoryview]
 
 class Conditioner:
     """
@@ -13,7 +29,8 @@ class Conditioner:
     """
 
     def __init__(self):
-        pass
+        # Contextes SHAKE-256 pré-absorbés, un par domaine (créés une seule fois)
+        self._contexts = {}
 
     def condition(self, raw_entropy: bytes, personalization_string: bytes = b'', output_bits: int = 256) -> bytes:
         """
@@ -24,7 +41,8 @@ class Conditioner:
             personalization_string: Chaîne de contexte (ex: ID unique du tel)
             output_bits: Taille de sortie souhaitée (256 par défaut)
         """
-        # 1. Création de l'instance SHAKE
+        # 1. Création de l'instance SHAKE (pycryptodome importé au premier usage)
+        from Crypto.Hash import SHAKE256
         shake = SHAKE256.new()
         
         # 2. Absorption (On mélange tout)
@@ -35,6 +53,71 @@ class Conditioner:
         output_len_bytes = output_bits // 8
         return shake.read(output_len_bytes)
 
+    # --- API multi-parties à contexte pré-absorbé (chemin critique) ---
+
+    def _context(self, domain: bytes):
+        """
+        Contexte SHAKE-256 ayant déjà absorbé le préfixe de domaine
+        (longueur sur 1 octet || domaine). Construit une fois par domaine,
+        puis simplement copié à chaque appel.
+        """
+        ctx = self._contexts.get(domain)
+        if ctx is None:
+            if len(domain) > 255:
+                raise ValueError("Domaine de conditionnement trop long (255 octets max).")
+            ctx = hashlib.shake_256(bytes([len(domain)]) + domain)
+            self._contexts[domain] = ctx
+        return ctx
+
+    def absorb(self, parts: Iterable[Buffer], domain: bytes):
+        """
+        Absorbe plusieurs morceaux SANS les concaténer (aucune copie).
+        Returns:
+            Instance SHAKE-256 (hashlib) prête pour digest().
+        """
+        shake = self._context(domain).copy()
+        for part in parts:
+            shake.update(part)
+        return shake
+
+    def condition_parts(self, parts: Iterable[Buffer], domain: bytes, output_bytes: int,
+                        out: Optional[Buffer] = None) -> Optional[bytes]:
+        """
+        Conditionnement SHAKE-256(préfixe(domaine) || parts...).
+
+        Args:
+            parts: Morceaux d'entrée (bytes, bytearray, memoryview...).
+            domain: Séparation de domaine (ex: DOMAIN_DRBG_UPDATE).
+            output_bytes: Taille de sortie.
+            out: Tampon de l'appelant ; s'il est fourni, la sortie y est
+                 écrite et la fonction retourne None.
+        """
+        digest = self.absorb(parts, domain).digest(output_bytes)
+        if METRICS.enabled:
+            METRICS.inc("conditioned_bytes", output_bytes)
+        if out is None:
+            return digest
+        memoryview(out).cast("B")[:output_bytes] = digest
+        return None
+
+    def condition_batch(self, inputs: Sequence[Union[Buffer, Sequence[Buffer]]], domain: bytes,
+                        output_bytes: int) -> List[bytes]:
+        """
+        Conditionne plusieurs entrées indépendantes en un appel (même domaine).
+        Chaque entrée est soit un tampon, soit une séquence de morceaux.
+        """
+        base = self._context(domain)
+        outputs = []
+        for item in inputs:
+            shake = base.copy()
+            if isinstance(item, (bytes, bytearray, memoryview)):
+                shake.update(item)
+            else:
+                for part in item:
+                    shake.update(part)
+            outputs.append(shake.digest(output_bytes))
+        return outputs
+
     # Méthodes de compatibilité si ton ancien code appelle extract/expand
     def extract(self, raw: bytes) -> bytes:
         return self.condition(raw, b"EXTRACT", 256)
@@ -0,0 +1,365 @@
+# Harnais de conformité des moteurs DRBG
+#
+# Un moteur optimisé n'est adopté que s'il est prouvé bit-exact :
+# 1. KAT : les vecteurs de réponse connue (tests/kat/vectors_nist.json) sont
+#    rejoués sur chaque moteur enregistré (vecteurs de sa famille).
+# 2. Différentiel : chaque moteur non-référence est comparé à la référence
+#    de sa famille sur des seeds aléatoires (sorties ET état exporté après
+#    chaque opération, import d'état croisé, états extrêmes).
+# 3. Débit : comparaison côte à côte des moteurs, par taille de requête.
+#
+# Les vecteurs KAT sont produits par les moteurs de référence (--write-kat) ;
+# les tailles couvrent generate(), readinto() et le mode bulk (> 64 Kio).
+#
+# Usage :
+#   python -m src_python.core.conformance
+#   python -m src_python.core.conformance --engines exact ntt --seeds 50
+#   python -m src_python.core.conformance --write-kat
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src_python.core.engines import available_engines, create_engine, get_engine_spec, reference_engine
+from src_python.utils.constants import N, K, Q, RESEED_INTERVAL, MAX_BYTES_PER_REQUEST
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_KAT_PATH = os.path.join(PROJECT_ROOT, "tests", "kat", "vectors_nist.json")
+
+KAT_FORMAT_VERSION = 1
+# Sorties au-delà de cette taille : seule leur empreinte SHA3-256 est stockée
+KAT_MAX_HEX_BYTES = 512
+KAT_VECTORS_PER_FAMILY = 3
+KAT_ENTROPY_BYTES = 48
+# Scénario de chaque vecteur (après instantiate) ; "update" prend 32 octets
+KAT_SCRIPT = (
+    ("generate", 32),
+    ("generate", 1),
+    ("update", 32),
+    ("generate", 64),
+    ("readinto", 300),
+    ("generate", 100),
+    ("generate_bulk", MAX_BYTES_PER_REQUEST + 1000),
+    ("generate", 32),
+)
+
+DIFFERENTIAL_OPS = 8
+THROUGHPUT_SIZES = (32, 4096, 1024 * 1024)
+
+@dataclass
+class EngineConformance:
+    engine: str
+    family: str
+    reference: str
+    kat_vectors: int = 0
+    kat_failures: List[str] = field(default_factory=list)
+    differential_cases: int = 0
+    differential_failures: List[str] = field(default_factory=list)
+
+    @property
+    def adopted(self) -> bool:
+        """Bit-exact prouvé : au moins un vecteur KAT, aucun échec."""
+        return self.kat_vectors > 0 and not self.kat_failures and not self.differential_failures
+
+    def as_dict(self) -> Dict:
+        out = asdict(self)
+        out["adopted"] = self.adopted
+        return out
+
+# 1. Opérations communes (KAT et différentiel)
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha3_256(data).hexdigest()
+
+def _apply(engine, op: str, arg) -> bytes:
+    """Applique une opération du protocole ; retourne la sortie (b"" pour update)."""
+    if op == "update":
+        engine.update(arg)
+        return b""
+    if op == "generate":
+        return engine.generate(arg)
+    if op == "generate_bulk":
+        return bytes(engine.generate_bulk(arg))
+    if op == "readinto":
+        buffer = bytearray(arg)
+        engine.readinto(buffer)
+        return bytes(buffer)
+    raise ValueError(f"Opération inconnue : {op}")
+
+# 2. Vecteurs de réponse connue
+
+def _kat_entropy(family: str, count: int) -> bytes:
+    return hashlib.shake_256(f"KAT/{family}/{count}".encode()).digest(KAT_ENTROPY_BYTES)
+
+def build_kat_vectors(family: str, count: int = KAT_VECTORS_PER_FAMILY) -> Dict:
+    """Produit les vecteurs d'une famille avec son moteur de référence."""
+    reference = reference_engine(family)
+    if reference is None:
+        raise ValueError(f"La famille {family} n'a pas de moteur de référence.")
+    engine = create_engine(reference)
+    vectors = []
+    for i in range(count):
+        entropy = _kat_entropy(family, i)
+        engine.instantiate(entropy)
+        steps = []
+        for j, (op, size) in enumerate(KAT_SCRIPT):
+            if op == "update":
+                data = hashlib.shake_256(entropy + bytes([j])).digest(size)
+                engine.update(data)
+                steps.append({"op": op, "data": data.hex()})
+                continue
+            output = _apply(engine, op, size)
+            step = {"op": op, "length": size}
+            if size <= KAT_MAX_HEX_BYTES:
+                step["output"] = output.hex()
+            else:
+                step["output_sha3_256"] = _digest(output)
+            steps.append(step)
+        vectors.append({
+            "count": i,
+            "entropy_input": entropy.hex(),
+            "steps": steps,
+            "final_state_sha3_256": _digest(engine.export_state()),
+        })
+    return {"reference": reference, "vectors": vectors}
+
+def write_kat(path: str = DEFAULT_KAT_PATH) -> Dict:
+    families = sorted({get_engine_spec(name).family for name in available_engines()})
+    kat = {
+        "description": "Vecteurs de réponse connue du LWR-DRBG (format inspiré des fichiers CAVP "
+                       "SP 800-90A), produits par les moteurs de référence de chaque famille.",
+        "version": KAT_FORMAT_VERSION,
+        "parameters": {"N": N, "K": K, "Q": Q, "max_bytes_per_request": MAX_BYTES_PER_REQUEST},
+        "families": {family: build_kat_vectors(family) for family in families if reference_engine(family)},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(kat, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    return kat
+
+def load_kat(path: str = DEFAULT_KAT_PATH) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        kat = json.load(f)
+    if kat.get("version") != KAT_FORMAT_VERSION:
+        raise ValueError(f"Format KAT non supporté : {kat.get('version')}")
+    return kat
+
+def replay_kat(engine_name: str, kat: Dict) -> Tuple[int, List[str]]:
+    """Rejoue les vecteurs de la famille du moteur ; retourne (nombre de vecteurs, échecs)."""
+    family = get_engine_spec(engine_name).family
+    entry = kat["families"].get(family)
+    if not entry or not entry["vectors"]:
+        return 0, [f"aucun vecteur KAT pour la famille {family}"]
+    engine = create_engine(engine_name)
+    failures = []
+    for vector in entry["vectors"]:
+        engine.instantiate(bytes.fromhex(vector["entropy_input"]))
+        for j, step in enumerate(vector["steps"]):
+            where = f"vecteur {vector['count']}, étape {j} ({step['op']})"
+            try:
+                if step["op"] == "update":
+                    engine.update(bytes.fromhex(step["data"]))
+                    continue
+                output = _apply(engine, step["op"], step["length"])
+            except Exception as e:
+                failures.append(f"{where} : {e}")
+                break
+            if "output" in step:
+                ok = output.hex() == step["output"]
+            else:
+                ok = _digest(output) == step["output_sha3_256"]
+            if not ok:
+                failures.append(f"{where} : sortie différente")
+                break
+        else:
+            if _digest(engine.export_state()) != vector["final_state_sha3_256"]:
+                failures.append(f"vecteur {vector['count']} : état final différent")
+    return len(entry["vectors"]), failures
+
+# 3. Tests différentiels
+
+def _edge_states() -> List[bytes]:
+    """États extrêmes (format export_state) : tout à 0, tout à Q-1, alternance."""
+    counter = (1).to_bytes(8, "little")
+    zeros = bytes(K * N * 2)
+    high = (Q - 1).to_bytes(2, "little") * (K * N)
+    alternating = ((Q - 1).to_bytes(2, "little") + bytes(2)) * (K * N // 2)
+    return [zeros + counter, high + counter, alternating + counter]
+
+def _random_op(rnd: random.Random):
+    roll = rnd.random()
+    if roll < 0.2:
+        return "update", rnd.randbytes(rnd.randint(0, 64))
+    if roll < 0.3:
+        return "generate_bulk", rnd.randint(MAX_BYTES_PER_REQUEST + 1, 2 * MAX_BYTES_PER_REQUEST + 7)
+    if roll < 0.4:
+        return "readinto", rnd.randint(1, 4096)
+    return "generate", rnd.randint(1, 4096)
+
+def differential_test(engine_name: str, seeds: int = 20, rng_seed: int = 0,
+                      reference: Optional[str] = None) -> Tuple[int, List[str]]:
+    """
+    Compare 'engine_name' à la référence de sa famille : même seed, même
+    suite d'opérations aléatoires, sorties et états exportés identiques.
+    Chaque cas échange aussi l'état (import croisé) en cours de route.
+    """
+    spec = get_engine_spec(engine_name)
+    reference = reference or reference_engine(spec.family)
+    if reference is None:
+        return 0, [f"pas de référence pour la famille {spec.family}"]
+    candidate, expected = create_engine(engine_name), create_engine(reference)
+    rnd = random.Random(rng_seed)
+    failures = []
+    cases = 0
+
+    starts = [("seed", rnd.randbytes(KAT_ENTROPY_BYTES)) for _ in range(seeds)]
+    starts += [("state", blob) for blob in _edge_states()]
+    for case, (kind, material) in enumerate(starts):
+        cases += 1
+        if kind == "seed":
+            candidate.instantiate(material)
+            expected.instantiate(material)
+        else:
+            candidate.import_state(material)
+            expected.import_state(material)
+        swap_at = rnd.randrange(DIFFERENTIAL_OPS)
+        for j in range(DIFFERENTIAL_OPS):
+            op, arg = _random_op(rnd)
+            where = f"cas {case} ({kind}), op {j} {op}"
+            try:
+                out_c = _apply(candidate, op, arg)
+            except Exception as e:
+                failures.append(f"{where} : {e}")
+                break
+            out_e = _apply(expected, op, arg)
+            if out_c != out_e:
+                failures.append(f"{where} : sortie différente")
+                break
+            state = expected.export_state()
+            if candidate.export_state() != state:
+                failures.append(f"{where} : état différent")
+                break
+            if j == swap_at:
+                # Import croisé : le candidat repart de l'état exporté par la référence
+                candidate = create_engine(engine_name)
+                candidate.import_state(state)
+        if len(failures) >= 5:
+            break
+    return cases, failures
+
+# 4. Débit comparé
+
+def measure_throughput(engine_name: str, sizes: Sequence[int] = THROUGHPUT_SIZES,
+                       min_time: float = 0.2) -> Dict[int, float]:
+    """Mio/s de generate()/generate_bulk() par taille de requête (moteur déjà construit)."""
+    engine = create_engine(engine_name)
+    engine.instantiate(b"THROUGHPUT")
+    out = {}
+    for size in sizes:
+        buffer = bytearray(size)
+        requests = max(1, -(-size // MAX_BYTES_PER_REQUEST))
+        count = 0
+        started = time.perf_counter()
+        while True:
+            if engine.reseed_counter + requests > RESEED_INTERVAL:
+                engine.update(b"THROUGHPUT")
+            if size > MAX_BYTES_PER_REQUEST:
+                engine.readinto(buffer)
+            else:
+                engine.generate(size)
+            count += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        out[size] = count * size / elapsed / (1024 * 1024)
+    return out
+
+# 5. Campagne complète
+
+def run_conformance(engines: Optional[Sequence[str]] = None, kat_path: str = DEFAULT_KAT_PATH,
+                    seeds: int = 20, rng_seed: int = 0) -> Dict[str, EngineConformance]:
+    kat = load_kat(kat_path)
+    results = {}
+    for name in engines or available_engines():
+        spec = get_engine_spec(name)
+        reference = reference_engine(spec.family) or ""
+        result = EngineConformance(engine=name, family=spec.family, reference=reference)
+        result.kat_vectors, result.kat_failures = replay_kat(name, kat)
+        if not spec.reference:
+            result.differential_cases, result.differential_failures = differential_test(
+                name, seeds=seeds, rng_seed=rng_seed)
+        results[name] = result
+    return results
+
+def format_report(results: Dict[str, EngineConformance],
+                  throughput: Optional[Dict[str, Dict[int, float]]] = None) -> str:
+    sizes = sorted({s for t in (throughput or {}).values() for s in t})
+    header = f"{'moteur':<10} {'famille':<16} {'KAT':>7} {'différentiel':>13} {'adopté':>7}"
+    header += "".join(f" {_size_label(s):>11}" for s in sizes)
+    lines = [header, "-" * len(header)]
+    for name, r in results.items():
+        kat = f"{r.kat_vectors - min(len(r.kat_failures), r.kat_vectors)}/{r.kat_vectors}"
+        diff = "référence" if not r.differential_cases and not r.differential_failures \
+            else ("OK" if not r.differential_failures else "ÉCHEC") + f" ({r.differential_cases})"
+        line = f"{name:<10} {r.family:<16} {kat:>7} {diff:>13} {'oui' if r.adopted else 'NON':>7}"
+        speeds = (throughput or {}).get(name, {})
+        ref_speeds = (throughput or {}).get(r.reference, {})
+        for s in sizes:
+            cell = f"{speeds[s]:.2f}" if s in speeds else "-"
+            if s in speeds and s in ref_speeds and name != r.reference and ref_speeds[s] > 0:
+                cell += f" x{speeds[s] / ref_speeds[s]:.1f}"
+            line += f" {cell:>11}"
+        lines.append(line)
+    if sizes:
+        lines.append("Débit en Mio/s (xN : accélération par rapport à la référence de la famille).")
+    for name, r in results.items():
+        for failure in (r.kat_failures + r.differential_failures)[:5]:
+            lines.append(f"[ÉCHEC {name}] {failure}")
+    return "\n".join(lines)
+
+def _size_label(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size // (1024 * 1024)} Mio"
+    if size >= 1024:
+        return f"{size // 1024} Kio"
+    return f"{size} o"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Conformité (KAT + différentiel) et débit des moteurs DRBG.")
+    parser.add_argument("--engines", nargs="+", default=None, help="Moteurs à vérifier (défaut : tous)")
+    parser.add_argument("--kat", default=DEFAULT_KAT_PATH, help="Fichier de vecteurs KAT")
+    parser.add_argument("--seeds", type=int, default=20, help="Seeds aléatoires du test différentiel")
+    parser.add_argument("--rng-seed", type=int, default=0, help="Graine du tirage des seeds et opérations")
+    parser.add_argument("--no-throughput", action="store_true", help="Sans comparaison de débit")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Durée de mesure par taille (s)")
+    parser.add_argument("--write-kat", action="store_true", help="Régénère les vecteurs depuis les références")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    if args.write_kat:
+        kat = write_kat(args.kat)
+        total = sum(len(f["vectors"]) for f in kat["families"].values())
+        print(f"{total} vecteurs écrits dans {args.kat}")
+        return 0
+
+    results = run_conformance(args.engines, kat_path=args.kat, seeds=args.seeds, rng_seed=args.rng_seed)
+    throughput = None
+    if not args.no_throughput:
+        throughput = {name: measure_throughput(name, min_time=args.min_time) for name in results}
+
+    if args.json:
+        print(json.dumps({
+            "engines": {name: r.as_dict() for name, r in results.items()},
+            "throughput_mib_s": throughput,
+        }, indent=2))
+    else:
+        print(format_report(results, throughput))
+    return 0 if all(r.adopted for r in results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
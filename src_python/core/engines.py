@@ -0,0 +1,126 @@
+# Registre des moteurs DRBG sélectionnables par nom
+#
+# MobileRNG, RNGPool, le mode bulk et le démon ne construisent plus le cœur
+# DRBG directement : ils passent un nom (paramètre 'engine' ou variable
+# d'environnement RNG_ENGINE) à create_engine().
+#
+# Chaque moteur appartient à une "famille" : tous les moteurs d'une même
+# famille doivent produire exactement le même flux que sa référence. Un
+# moteur optimisé n'est adopté qu'après le harnais de conformité
+# (src_python.core.conformance) : vecteurs KAT + tests différentiels.
+#
+# Module volontairement léger (ni NumPy ni matrice publique à l'import) :
+# les fabriques importent le cœur au premier appel.
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol
+
+# Variable d'environnement de sélection du moteur (défaut : DEFAULT_ENGINE)
+ENGINE_ENV = "RNG_ENGINE"
+DEFAULT_ENGINE = "dense"
+
+class DrbgEngine(Protocol):
+    """
+    Protocole commun des moteurs DRBG (implémenté par LwrDrbgCore).
+
+    - instantiate(seed) : état initial déterministe (même seed = même flux).
+    - update(data) : reseed (mélange de l'état et de 'data'), compteur à 1.
+    - generate(n) / generate_bulk(n, out) / readinto(buf) : sortie.
+    - export_state() / import_state(blob) : état au format canonique,
+      identique d'un moteur à l'autre au sein d'une famille.
+    - reseeded_copy(seed) : nouvelle instance reseedée, l'originale intacte.
+    - wipe() : efface l'état (fin d'usage), instantiate() requis ensuite.
+    """
+
+    engine_name: str
+    reseed_counter: int
+
+    def instantiate(self, seed_material: bytes): ...
+    def update(self, provided_data: bytes): ...
+    def generate(self, num_bytes: int) -> bytes: ...
+    def generate_bulk(self, num_bytes: int, out=None): ...
+    def readinto(self, buffer) -> int: ...
+    def export_state(self) -> bytes: ...
+    def import_state(self, blob: bytes): ...
+    def reseeded_copy(self, seed_material: bytes) -> "DrbgEngine": ...
+    def wipe(self): ...
+
+@dataclass(frozen=True)
+class EngineSpec:
+    name: str
+    factory: Callable[[], DrbgEngine]
+    family: str
+    reference: bool = False
+    description: str = ""
+
+_ENGINES: Dict[str, EngineSpec] = {}
+
+def register_engine(name: str, factory: Callable[[], DrbgEngine], family: str,
+                    reference: bool = False, description: str = "", replace: bool = False) -> EngineSpec:
+    """
+    Enregistre un moteur.
+
+    Args:
+        name: Nom de sélection (paramètre 'engine', RNG_ENGINE).
+        factory: Fabrique sans argument retournant une instance du moteur.
+        family: Famille de flux ; un moteur non-référence doit être
+                bit-exact avec la référence de sa famille.
+        reference: Vrai pour l'implémentation de référence (une par famille).
+        replace: Autorise l'écrasement d'un nom déjà enregistré.
+    """
+    if name in _ENGINES and not replace:
+        raise ValueError(f"Moteur déjà enregistré : {name}")
+    if reference:
+        current = reference_engine(family)
+        if current is not None and current != name:
+            raise ValueError(f"La famille {family} a déjà une référence : {current}")
+    spec = EngineSpec(name=name, factory=factory, family=family, reference=reference, description=description)
+    _ENGINES[name] = spec
+    return spec
+
+def unregister_engine(name: str):
+    _ENGINES.pop(name, None)
+
+def get_engine_spec(name: str) -> EngineSpec:
+    if name not in _ENGINES:
+        raise ValueError(f"Moteur DRBG inconnu : {name} (disponibles : {available_engines()})")
+    return _ENGINES[name]
+
+def available_engines() -> List[str]:
+    return sorted(_ENGINES)
+
+def reference_engine(family: str) -> Optional[str]:
+    """Nom de la référence d'une famille (None si elle n'en a pas)."""
+    for spec in _ENGINES.values():
+        if spec.family == family and spec.reference:
+            return spec.name
+    return None
+
+def resolve_engine_name(name: Optional[str] = None) -> str:
+    """Nom explicite, sinon RNG_ENGINE, sinon DEFAULT_ENGINE ; validé contre le registre."""
+    name = name or os.environ.get(ENGINE_ENV) or DEFAULT_ENGINE
+    get_engine_spec(name)
+    return name
+
+def create_engine(name: Optional[str] = None) -> DrbgEngine:
+    """Instancie le moteur 'name' (résolu par resolve_engine_name)."""
+    return get_engine_spec(resolve_engine_name(name)).factory()
+
+# Moteurs intégrés : le cœur LWR avec chacun des produits Lattice
+
+def _lwr_factory(lattice: str) -> Callable[[], DrbgEngine]:
+    def factory() -> DrbgEngine:
+        from src_python.core.lwr_drbg import LwrDrbgCore
+        return LwrDrbgCore(engine=lattice)
+    return factory
+
+register_engine("dense", _lwr_factory("dense"), family="lwr-dense-int32", reference=True,
+                description="Matrice dense, accumulation int32 (flux historique)")
+register_engine("exact_ref", _lwr_factory("exact_ref"), family="lwr-dense", reference=True,
+                description="Matrice dense, produit int64 (référence de 'exact')")
+register_engine("exact", _lwr_factory("exact"), family="lwr-dense",
+                description="Matrice dense uint16 par blocs, accumulation uint32")
+register_engine("ntt_ref", _lwr_factory("ntt_ref"), family="lwr-module", reference=True,
+                description="Module-LWR, produit négacyclique naïf (référence de 'ntt')")
+register_engine("ntt", _lwr_factory("ntt"), family="lwr-module",
+                description="Module-LWR, produit dans le domaine NTT")
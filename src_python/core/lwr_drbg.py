@@ -4,8 +4,18 @@ import numpy as np
 from typing import Tuple, Optional
 
 # Imports internes
-from src_python.utils.constants import N, K, Q, P, RESEED_INTERVAL
-from src_python.core.conditioner import Conditioner
+from src_python.utils.constants import N, K, Q, P, RESEED_INTERVAL, MAX_BYTES_PER_REQUEST
+from src_python.core.conditioner import Conditioner, DOMAIN_DRBG_UPDATE, DOMAIN_OUTPUT
+from src_python.core.lattice import LATTICE_ENGINES
+from src_python.utils.metrics import METRICS
+
+# Arrondi LWR en virgule fixe : floor(P * v / Q) == (v * LWR_ROUND_MULT) >> LWR_ROUND_SHIFT
+# pour tout v dans [0, Q) (vérifié exhaustivement dans les tests unitaires).
+LWR_ROUND_SHIFT = 23
+LWR_ROUND_MULT = -(-(P << LWR_ROUND_SHIFT) // Q)  # ceil(P * 2^23 / Q)
+
+# Taille de export_state() : K*N coefficients uint16 + compteur uint64
+STATE_EXPORT_BYTES = K * N * 2 + 8
 
 class LwrDrbgCore:
     """
@@ -23,25 +33,38 @@ class LwrDrbgCore:
     Retrouver le secret 's' à partir des sorties nécessite de résoudre
     le problème CVP (Closest Vector Problem) sur un réseau euclidien.
     Aucun algorithme quantique connu (ni Shor, ni Grover) ne résout ça efficacement.
+
+    MOTEURS DISPONIBLES (paramètre 'engine') :
+    ------------------------------------------
+    - "dense" : matrice 768x768 (historique).
+    - "ntt"   : Module-LWR structuré, produit dans le domaine NTT.
+    - "exact" : matrice 768x768 en uint16, arithmétique entière sans débordement.
+    - "exact_ref" / "ntt_ref" : références lentes de "exact" et "ntt"
+      (conformité, voir src_python.core.conformance).
+    La sélection par nom côté API passe par src_python.core.engines.
     """
 
-    def __init__(self):
+    def __init__(self, engine: str = "dense"):
+        if engine not in LATTICE_ENGINES:
+            raise ValueError(f"Moteur Lattice inconnu : {engine} (disponibles : {sorted(LATTICE_ENGINES)})")
+        self.engine_name = engine
         self.conditioner = Conditioner()
         
-        # Le Secret 's' (La clé du réseau)
+        # Génération de la Matrice Publique A (La base du réseau)
+        self._instantiate_matrix_A()
+        
+        # Le Secret 's' (La clé du réseau), au format de stockage du moteur
         # Dimension : K * N (ex: 3 * 256 = 768 coefficients)
-        self.state_s = np.zeros(K * N, dtype=np.int32)
+        self.state_dtype = self.engine.state_dtype
+        self.state_s = np.zeros(K * N, dtype=self.state_dtype)
         
         # Compteur de sécurité NIST
         self.reseed_counter = 0
-        
-        # Génération de la Matrice Publique A (La base du réseau)
-        self._instantiate_matrix_A()
 
     def _instantiate_matrix_A(self):
-        """Génère la matrice A (Structure publique du Lattice)."""
-        rng_public = np.random.default_rng(seed=42)
-        self.matrix_A = rng_public.integers(0, Q, size=(K * N, K * N), dtype=np.int32)
+        """Génère la matrice A (Structure publique du Lattice) via le moteur choisi."""
+        self.engine = LATTICE_ENGINES[self.engine_name]()
+        self.matrix_A = self.engine.matrix_A
 
     def _lwr_rounding(self, vector_v: np.ndarray) -> np.ndarray:
         """
@@ -51,53 +74,199 @@ class LwrDrbgCore:
         
         C'est cette opération qui détruit l'information et empêche
         l'inversion par un ordinateur quantique.
+        
+        Calcul entier (multiplication + décalage) : aucun flottant,
+        résultat identique à l'ancienne formule sur tout [0, Q).
         """
-        return np.floor((P / Q) * vector_v).astype(np.int32)
+        y = (vector_v.astype(np.uint64) * LWR_ROUND_MULT) >> LWR_ROUND_SHIFT
+        return y.astype(np.uint16)
 
-    def update(self, provided_data: bytes):
+    def _mix_state(self, provided_data: bytes):
         """
-        Mise à jour de l'état secret 's'.
-        Utilise SHAKE-256 (Quantum-Resistant Hash) pour mélanger.
+        Remplace 's' par SHAKE-256(DRBG_UPDATE_LWR || s || données).
+        Partagé par update() (reseed) et la rotation Forward Secrecy.
+        L'état est absorbé en place (pas de concaténation).
         """
-        current_state_bytes = self.state_s.tobytes()
         needed_bytes = (K * N * 2)
         
-        seed_material = self.conditioner.condition(
-            raw_entropy=current_state_bytes + provided_data,
-            personalization_string=b"DRBG_UPDATE_LWR",
-            output_bits=needed_bytes * 8
+        seed_material = self.conditioner.condition_parts(
+            (self.state_s.data, provided_data), DOMAIN_DRBG_UPDATE, needed_bytes
         )
         
-        new_state = np.frombuffer(seed_material, dtype=np.uint16).astype(np.int32)
-        self.state_s = new_state[:K*N] % Q
+        new_state = np.frombuffer(seed_material, dtype=np.uint16)[:K*N] % Q
+        self.state_s = new_state.astype(self.state_dtype, copy=False)
+
+    def update(self, provided_data: bytes):
+        """
+        Mise à jour de l'état secret 's'.
+        Utilise SHAKE-256 (Quantum-Resistant Hash) pour mélanger.
+        Un update est un reseed : le compteur NIST repart à 1.
+        """
+        with METRICS.timer("lwr.update"):
+            self._mix_state(provided_data)
         self.reseed_counter = 1
 
-    def generate(self, num_bytes: int) -> bytes:
+    def instantiate(self, seed_material: bytes):
         """
-        Génération via Lattice Operation.
+        (Ré)instanciation complète à partir d'une seed : l'état précédent est
+        oublié. Deux instances instanciées avec la même seed produisent le
+        même flux (utile pour les workers et la reproductibilité).
         """
-        if self.reseed_counter > RESEED_INTERVAL:
-            raise RuntimeError("DRBG: Reseed Required.")
+        self.state_s = np.zeros(K * N, dtype=self.state_dtype)
+        self.update(seed_material)
+
+    def export_state(self) -> bytes:
+        """
+        État interne au format canonique, indépendant du moteur :
+        K*N coefficients uint16 little-endian, puis le compteur de reseed
+        (uint64 little-endian). Sert aux tests de conformité et à la
+        comparaison de moteurs ; ne JAMAIS le persister ni le journaliser.
+        """
+        values = self.state_s.astype("<u2").tobytes()
+        return values + self.reseed_counter.to_bytes(8, "little")
+
+    def import_state(self, blob: bytes):
+        """Restaure un état produit par export_state() (de n'importe quel moteur)."""
+        if len(blob) != STATE_EXPORT_BYTES:
+            raise ValueError(f"État exporté invalide ({len(blob)} octets, attendu {STATE_EXPORT_BYTES}).")
+        values = np.frombuffer(blob, dtype="<u2", count=K * N)
+        if values.max() >= Q:
+            raise ValueError("État exporté invalide (coefficient hors de [0, Q)).")
+        self.state_s = values.astype(self.state_dtype)
+        self.reseed_counter = int.from_bytes(blob[K * N * 2:], "little")
+
+    def reseeded_copy(self, seed_material: bytes) -> "LwrDrbgCore":
+        """
+        Nouvelle instance (même moteur, matrice partagée) dont l'état vaut
+        update(état courant, seed_material). L'instance courante n'est pas
+        modifiée : le reseed se prépare à côté, puis l'appelant bascule.
+        """
+        child = LwrDrbgCore(engine=self.engine_name)
+        # _mix_state remplace le tableau d'état sans le modifier en place :
+        # la référence lue ici est un instantané cohérent.
+        child.state_s = self.state_s
+        child.update(seed_material)
+        return child
 
+    def wipe(self):
+        """Efface l'état secret (fin d'usage) : instantiate() obligatoire avant réutilisation."""
+        self.state_s = np.zeros(K * N, dtype=self.state_dtype)
+        self.reseed_counter = RESEED_INTERVAL + 1
+
+    def replay_rotations(self, count: int):
+        """
+        Applique 'count' rotations Forward Secrecy (sans produire de sortie)
+        et avance le compteur d'autant : rattrape, sur un état reseedé à côté,
+        les requêtes servies par l'état actif depuis l'instantané.
+        """
+        with METRICS.timer("lwr.rotation"):
+            for _ in range(count):
+                self._mix_state(b"FS_ROTATE")
+        self.reseed_counter += count
+
+    def _lattice_step(self) -> bytes:
+        """
+        Une évaluation Lattice : v = A*s, arrondi LWR, sérialisation.
+        C'est l'étape coûteuse, payée une fois par requête.
+        """
         # 1. Opération LWE/LWR : Produit Matrice-Vecteur
         # C'est lourd, mais c'est ça qui donne la sécurité géométrique.
-        vector_v = np.dot(self.matrix_A, self.state_s) % Q
+        with METRICS.timer("lwr.matmul"):
+            vector_v = self.engine.multiply(self.state_s)
         
         # 2. Extraction du Bruit Déterministe (LWR Rounding)
-        vector_y = self._lwr_rounding(vector_v)
+        with METRICS.timer("lwr.rounding"):
+            vector_y = self._lwr_rounding(vector_v)
         
         # 3. Sérialisation
-        raw_output = vector_y.astype(np.uint16).tobytes()
+        return vector_y.tobytes()
+
+    def generate(self, num_bytes: int) -> bytes:
+        """
+        Génération via Lattice Operation.
+        Les requêtes > MAX_BYTES_PER_REQUEST passent par le mode bulk.
+        """
+        if num_bytes > MAX_BYTES_PER_REQUEST:
+            return bytes(self.generate_bulk(num_bytes))
+
+        if self.reseed_counter > RESEED_INTERVAL:
+            raise RuntimeError("DRBG: Reseed Required.")
+
+        # 1-3. Évaluation Lattice
+        raw_output = self._lattice_step()
         
         # 4. Ajustement de taille (Whitening final)
-        final_output = self.conditioner.condition(
-            raw_entropy=raw_output,
-            personalization_string=b"LWR_OUTPUT",
-            output_bits=num_bytes * 8
-        )
+        with METRICS.timer("lwr.whitening"):
+            final_output = self.conditioner.condition_parts((raw_output,), DOMAIN_OUTPUT, num_bytes)
         
-        # 5. Forward Secrecy (Rotation de l'état)
-        self.update(b"FS_ROTATE")
+        # 5. Forward Secrecy (Rotation de l'état, sans remise à zéro du compteur)
+        with METRICS.timer("lwr.rotation"):
+            self._mix_state(b"FS_ROTATE")
         self.reseed_counter += 1
         
-        return final_output
\ No newline at end of file
+        if METRICS.enabled:
+            METRICS.inc("drbg_requests")
+            METRICS.inc("bytes_generated", num_bytes)
+        return final_output
+
+    def generate_bulk(self, num_bytes: int, out=None):
+        """
+        MODE BULK (Sortie XOF amorcée par le Lattice).
+
+        Chaque requête SP 800-90A (au plus MAX_BYTES_PER_REQUEST octets) coûte :
+        - UNE évaluation Lattice qui amorce un flux SHAKE-256,
+        - le flux est pressé directement vers la sortie (vitesse SHAKE brute),
+        - UNE rotation d'état (Forward Secrecy) et +1 sur le compteur de reseed.
+
+        Pour num_bytes <= MAX_BYTES_PER_REQUEST, la sortie est identique à generate().
+
+        Args:
+            num_bytes: Nombre total d'octets demandés.
+            out: Tampon inscriptible optionnel (bytearray, mmap, tableau NumPy
+                 contigu...), rempli en place sans copie intermédiaire.
+        Returns:
+            'out' (ou un nouveau bytearray s'il n'est pas fourni).
+        Raises:
+            RuntimeError: si la requête franchirait la limite de reseed
+                          (vérifié AVANT de produire le moindre octet).
+        """
+        num_requests = max(1, -(-num_bytes // MAX_BYTES_PER_REQUEST))
+        if self.reseed_counter + num_requests - 1 > RESEED_INTERVAL:
+            raise RuntimeError("DRBG: Reseed Required.")
+
+        if out is None:
+            out = bytearray(num_bytes)
+        view = memoryview(out).cast("B")
+        if view.nbytes < num_bytes:
+            raise ValueError("Le tampon de sortie est trop petit.")
+
+        offset = 0
+        while offset < num_bytes:
+            block_len = min(MAX_BYTES_PER_REQUEST, num_bytes - offset)
+
+            raw_output = self._lattice_step()
+            with METRICS.timer("lwr.whitening"):
+                self.conditioner.condition_parts(
+                    (raw_output,), DOMAIN_OUTPUT, block_len, out=view[offset:offset + block_len]
+                )
+            offset += block_len
+
+            # Forward Secrecy : une rotation par requête (pas par bloc pressé)
+            with METRICS.timer("lwr.rotation"):
+                self._mix_state(b"FS_ROTATE")
+            self.reseed_counter += 1
+
+        if METRICS.enabled:
+            METRICS.inc("drbg_requests", num_requests)
+            METRICS.inc("bytes_generated", num_bytes)
+        return out
+
+    def readinto(self, buffer) -> int:
+        """
+        Remplit entièrement 'buffer' (protocole buffer inscriptible) avec la sortie DRBG.
+        Returns:
+            Nombre d'octets écrits.
+        """
+        num_bytes = memoryview(buffer).nbytes
+        self.generate_bulk(num_bytes, out=buffer)
+        return num_bytes
@@ -0,0 +1,180 @@
+# Évaluation Lattice groupée : M flux DRBG indépendants, UN produit matriciel
+#
+# Chaque LwrDrbgCore paie son propre produit matrice-vecteur A * s : servir
+# M flux (un DRBG par client ou par connexion) coûte M parcours de la
+# matrice publique de 2,36 Mo. Ici les M secrets sont rangés dans une seule
+# matrice d'état S (M x K*N, ligne i = s_i) et V = S * A^T (c'est-à-dire
+# A * [s_1 ... s_M], transposé) avance tous les flux en un GEMM BLAS.
+#
+# Exactitude : en float64, toute somme de 768 produits < 3329^2 est un
+# entier < 2^53, donc le GEMM est exact quel que soit l'ordre des sommes.
+# - moteur "exact" : V mod Q (vrai A * s mod Q) ;
+# - moteur "dense" : le moteur historique accumule en int32 ; l'addition
+#   modulo 2^32 étant associative, son résultat est la somme exacte
+#   ramenée en int32 signé, puis mod Q. Reproduit bit à bit.
+#
+# Le flux i est bit-exact avec un LwrDrbgCore du même moteur dans le même
+# état (arrondi LWR, whitening SHAKE DOMAIN_OUTPUT, rotation Forward
+# Secrecy) : export_state()/import_state() passent de l'un à l'autre.
+# Isolation : état et compteur de reseed propres à chaque flux ; les
+# seeds des flux sont séparées par domaine (derive_stream_seed).
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src_python.utils.constants import N, K, Q, RESEED_INTERVAL, MAX_BYTES_PER_REQUEST
+from src_python.core.conditioner import Conditioner, DOMAIN_DRBG_UPDATE, DOMAIN_OUTPUT, DOMAIN_MULTI_STREAM
+from src_python.core.lwr_drbg import LWR_ROUND_MULT, LWR_ROUND_SHIFT, STATE_EXPORT_BYTES
+from src_python.core.public_matrix import get_public_matrix, DENSE
+from src_python.utils.metrics import METRICS
+
+# Moteurs reproductibles par GEMM -> format de stockage de l'état (celui du moteur simple)
+GEMM_ENGINES = {"dense": np.int32, "exact": np.uint16}
+
+STREAM_SEED_BYTES = 48
+
+def derive_stream_seed(master_seed: bytes, index: int) -> bytes:
+    """Seed du flux 'index' : SHAKE-256(maître || index) sous le domaine DOMAIN_MULTI_STREAM."""
+    return Conditioner().condition_parts((master_seed, index.to_bytes(8, "little")), DOMAIN_MULTI_STREAM,
+                                         STREAM_SEED_BYTES)
+
+class MultiStreamDrbg:
+    """
+    Banque de M DRBG LWR avancés ensemble (un GEMM par pas Lattice).
+
+    Toutes les opérations prennent 'streams' (indices des flux concernés,
+    défaut : tous) ; seuls ces flux avancent, les autres restent intacts.
+    """
+
+    def __init__(self, num_streams: int, engine: str = "dense"):
+        if engine not in GEMM_ENGINES:
+            raise ValueError(f"Moteur sans évaluation groupée : {engine} (disponibles : {sorted(GEMM_ENGINES)})")
+        if num_streams <= 0:
+            raise ValueError("num_streams doit être > 0.")
+        self.engine_name = engine
+        self.num_streams = num_streams
+        self.state_dtype = GEMM_ENGINES[engine]
+        self.conditioner = Conditioner()
+
+        # A^T en float64 (vue transposée : BLAS la lit sans copie)
+        self.matrix_T = get_public_matrix(DENSE, dtype=np.float64).T
+
+        # 1. États secrets (une ligne par flux) et compteurs NIST par flux
+        self.states = np.zeros((num_streams, K * N), dtype=self.state_dtype)
+        self.reseed_counters = np.zeros(num_streams, dtype=np.int64)
+
+    def _rows(self, streams: Optional[Sequence[int]]) -> np.ndarray:
+        if streams is None:
+            return np.arange(self.num_streams)
+        rows = np.asarray(streams, dtype=np.int64).ravel()
+        if rows.size and (rows.min() < 0 or rows.max() >= self.num_streams):
+            raise IndexError(f"Flux hors de [0, {self.num_streams}).")
+        if np.unique(rows).size != rows.size:
+            raise ValueError("Flux en double dans la requête.")
+        return rows
+
+    # --- Reseed / instanciation ---
+
+    def _mix_rows(self, rows: np.ndarray, data: Sequence[bytes]):
+        """s_i = SHAKE-256(DRBG_UPDATE_LWR || s_i || données_i) pour chaque flux (cf. LwrDrbgCore._mix_state)."""
+        digests = self.conditioner.condition_batch(
+            [(self.states[i].data, d) for i, d in zip(rows, data)], DOMAIN_DRBG_UPDATE, K * N * 2)
+        raw = np.frombuffer(b"".join(digests), dtype=np.uint16).reshape(rows.size, K * N)
+        self.states[rows] = raw % Q
+
+    def update(self, provided_data: bytes, streams: Optional[Sequence[int]] = None):
+        """Reseed des flux choisis avec les mêmes données ; leurs compteurs repartent à 1."""
+        rows = self._rows(streams)
+        with METRICS.timer("multi.update"):
+            self._mix_rows(rows, [provided_data] * rows.size)
+        self.reseed_counters[rows] = 1
+
+    def instantiate(self, seeds: Sequence[bytes], streams: Optional[Sequence[int]] = None):
+        """(Ré)instanciation : une seed par flux, l'état précédent du flux est oublié."""
+        rows = self._rows(streams)
+        if len(seeds) != rows.size:
+            raise ValueError("Une seed par flux.")
+        self.states[rows] = 0
+        with METRICS.timer("multi.update"):
+            self._mix_rows(rows, seeds)
+        self.reseed_counters[rows] = 1
+
+    def instantiate_all(self, master_seed: bytes):
+        """Tous les flux depuis une seed maître (seeds séparées par domaine)."""
+        self.instantiate([derive_stream_seed(master_seed, i) for i in range(self.num_streams)])
+
+    def wipe(self, streams: Optional[Sequence[int]] = None):
+        """Efface l'état des flux (fin de session) : reseed obligatoire avant réutilisation."""
+        rows = self._rows(streams)
+        self.states[rows] = 0
+        self.reseed_counters[rows] = RESEED_INTERVAL + 1
+
+    # --- Génération ---
+
+    def _lattice_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Un pas Lattice pour les flux 'rows' : V = S * A^T (GEMM), mod Q, arrondi LWR."""
+        with METRICS.timer("multi.gemm"):
+            v = (self.states[rows].astype(np.float64) @ self.matrix_T).astype(np.int64)
+            if self.state_dtype == np.int32:
+                # Débordement int32 du moteur "dense" : somme exacte mod 2^32, signée
+                v = v.astype(np.uint32).view(np.int32) % Q
+            else:
+                v %= Q
+        with METRICS.timer("multi.rounding"):
+            return ((v.astype(np.uint64) * LWR_ROUND_MULT) >> LWR_ROUND_SHIFT).astype(np.uint16)
+
+    def generate(self, num_bytes: int, streams: Optional[Sequence[int]] = None) -> List[bytes]:
+        """
+        num_bytes pour chacun des flux choisis (même sortie que
+        LwrDrbgCore.generate sur chaque flux, mode bulk compris).
+
+        Un GEMM par requête SP 800-90A (au plus MAX_BYTES_PER_REQUEST
+        octets) pour tous les flux ; whitening et rotation par flux.
+
+        Raises:
+            RuntimeError: si un des flux franchirait la limite de reseed
+                          (vérifié AVANT de produire le moindre octet).
+        """
+        rows = self._rows(streams)
+        num_requests = max(1, -(-num_bytes // MAX_BYTES_PER_REQUEST))
+        over = rows[self.reseed_counters[rows] + num_requests - 1 > RESEED_INTERVAL]
+        if over.size:
+            raise RuntimeError(f"DRBG: Reseed Required (flux {over.tolist()}).")
+        if rows.size == 0:
+            return []
+
+        blocks: List[List[bytes]] = []
+        for r in range(num_requests):
+            block_len = min(MAX_BYTES_PER_REQUEST, num_bytes - r * MAX_BYTES_PER_REQUEST)
+            vector_y = self._lattice_rows(rows)
+            with METRICS.timer("multi.whitening"):
+                blocks.append(self.conditioner.condition_batch([y.data for y in vector_y], DOMAIN_OUTPUT, block_len))
+            # Forward Secrecy : une rotation par flux et par requête
+            with METRICS.timer("multi.rotation"):
+                self._mix_rows(rows, [b"FS_ROTATE"] * rows.size)
+            self.reseed_counters[rows] += 1
+
+        if METRICS.enabled:
+            METRICS.inc("drbg_requests", num_requests * rows.size)
+            METRICS.inc("bytes_generated", num_bytes * rows.size)
+        if num_requests == 1:
+            return blocks[0]
+        return [b"".join(parts) for parts in zip(*blocks)]
+
+    # --- État (format LwrDrbgCore.export_state) ---
+
+    def export_state(self, stream: int) -> bytes:
+        """État canonique du flux (ne JAMAIS le persister ni le journaliser)."""
+        row = int(self._rows([stream])[0])
+        return self.states[row].astype("<u2").tobytes() + int(self.reseed_counters[row]).to_bytes(8, "little")
+
+    def import_state(self, stream: int, blob: bytes):
+        """Charge dans le flux un état exporté (par ce moteur ou un LwrDrbgCore)."""
+        row = int(self._rows([stream])[0])
+        if len(blob) != STATE_EXPORT_BYTES:
+            raise ValueError(f"État exporté invalide ({len(blob)} octets, attendu {STATE_EXPORT_BYTES}).")
+        values = np.frombuffer(blob, dtype="<u2", count=K * N)
+        if values.max() >= Q:
+            raise ValueError("État exporté invalide (coefficient hors de [0, Q)).")
+        self.states[row] = values
+        self.reseed_counters[row] = int.from_bytes(blob[K * N * 2:], "little")
@@ -0,0 +1,275 @@
+# Matrice publique A : dérivation SHAKE-128 (façon Kyber) + cache par processus
+import os
+import hashlib
+import tempfile
+import threading
+from typing import Optional, Dict, Tuple
+
+import numpy as np
+from Crypto.Hash import SHAKE128
+
+from src_python.utils.constants import N, K, Q, PUBLIC_MATRIX_SEED
+
+# Dossier de cache .npy (optionnel). Peut aussi être fixé via set_cache_dir().
+CACHE_DIR_ENV = "RNG_MATRIX_CACHE_DIR"
+
+# Formes de matrice supportées
+DENSE = "dense"    # (K*N) x (K*N), coefficients en domaine normal
+MODULE = "module"  # K x K x N, polynômes en domaine NTT
+DENSE_BLOCKED = "dense_blocked"  # DENSE_COLUMN_BLOCKS x (K*N) x (K*N / blocs), uint16
+
+# Découpage en colonnes de la forme DENSE_BLOCKED : un bloc de 384 colonnes
+# borne chaque somme partielle à 384 * 3328^2 = 4 253 073 408 < 2^32
+# (accumulation exacte en uint32, sans réduction intermédiaire).
+DENSE_COLUMN_BLOCKS = 2
+
+_cache: Dict[Tuple[str, bytes, str], np.ndarray] = {}
+_cache_lock = threading.Lock()
+_cache_dir: Optional[str] = None
+
+# Segment partagé pour serveurs pre-fork : "1" (dossier par défaut) ou un chemin
+SHARED_ENV = "RNG_MATRIX_SHARED"
+_shared_dir: Optional[str] = None
+
+def _private_dir(path: str) -> str:
+    """
+    Crée 'path' au besoin et vérifie qu'il appartient à l'utilisateur courant
+    et n'est inscriptible que par lui (une matrice A altérée affaiblirait le DRBG).
+    Raises:
+        OSError: dossier inaccessible ou partagé.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+        raise OSError(f"{path} n'est pas un dossier privé de l'utilisateur courant")
+    return path
+
+def set_cache_dir(path: Optional[str]) -> Optional[str]:
+    """
+    Active (ou désactive avec None) la persistance .npy de la matrice publique.
+    Même exigence que enable_shared_matrix : dossier privé de l'utilisateur.
+
+    Returns:
+        Le dossier utilisé, ou None si désactivé ou refusé.
+    """
+    global _cache_dir
+    _cache_dir = None
+    if path is None:
+        return None
+    try:
+        _cache_dir = _private_dir(path)
+    except OSError as e:
+        print(f"[WARN] Cache matrice désactivé : {e}")
+    return _cache_dir
+
+def default_shared_dir() -> str:
+    """tmpfs (/dev/shm) si disponible : la matrice ne touche jamais le disque."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(base, f"lwr-rng-{uid}")
+
+def enable_shared_matrix(path: Optional[str] = None) -> Optional[str]:
+    """
+    Place les matrices publiques dans un segment de mémoire partagée
+    (fichier .npy sur tmpfs) projeté en LECTURE SEULE par chaque processus :
+    une seule copie physique, quel que soit le nombre de workers (fork ou
+    spawn), et aucune duplication copy-on-write.
+
+    Le dossier doit appartenir à l'utilisateur courant et n'être inscriptible
+    que par lui (une matrice A altérée affaiblirait le DRBG). Prioritaire :
+    set_cache_dir() s'il est configuré (même vérification).
+
+    Seules les matrices obtenues APRÈS l'appel sont partagées : les moteurs
+    déjà construits gardent leur référence à leur copie privée (même
+    contenu, même flux) tant qu'ils vivent. L'activer au démarrage, avant
+    de créer les DRBG et de forker les workers.
+
+    Returns:
+        Le dossier utilisé, ou None si refusé (matrice privée par processus).
+    """
+    global _shared_dir
+    path = path or default_shared_dir()
+    try:
+        _private_dir(path)
+    except OSError as e:
+        print(f"[WARN] Matrice partagée désactivée : {e}")
+        return None
+    _shared_dir = path
+    # Les copies privées déjà chargées sont remplacées au prochain accès
+    clear_cache()
+    return path
+
+def disable_shared_matrix():
+    """Revient aux matrices privées (mêmes limites que enable_shared_matrix pour les moteurs existants)."""
+    global _shared_dir
+    _shared_dir = None
+    clear_cache()
+
+def sample_uniform(seed: bytes, count: int) -> np.ndarray:
+    """
+    Échantillonnage uniforme mod Q par rejet (Parse de Kyber, FIPS 203 Alg. 7).
+
+    SHAKE-128(seed) est lu par groupes de 3 octets -> deux candidats de 12 bits ;
+    un candidat est gardé s'il est < Q. Vectorisé : on presse un lot d'octets
+    à la fois et on complète si le rejet en a consommé trop.
+    """
+    xof = SHAKE128.new(seed)
+    out = np.empty(count, dtype=np.uint16)
+    filled = 0
+    # Taux d'acceptation Q/4096 ~ 81% : un lot de ~1.3x suffit presque toujours
+    batch_triplets = (count * 4096 // (2 * Q)) * 13 // 10 + 8
+    while filled < count:
+        raw = np.frombuffer(xof.read(3 * batch_triplets), dtype=np.uint8).reshape(-1, 3).astype(np.uint16)
+        candidates = np.empty(2 * batch_triplets, dtype=np.uint16)
+        candidates[0::2] = raw[:, 0] | ((raw[:, 1] & 0x0F) << 8)
+        candidates[1::2] = (raw[:, 1] >> 4) | (raw[:, 2] << 4)
+        accepted = candidates[candidates < Q]
+        take = min(count - filled, accepted.size)
+        out[filled:filled + take] = accepted[:take]
+        filled += take
+    return out
+
+def expand_dense(seed: bytes = PUBLIC_MATRIX_SEED) -> np.ndarray:
+    """Ligne r de A = Parse(SHAKE-128(seed || r)), r sur 2 octets little-endian."""
+    rows = [sample_uniform(seed + r.to_bytes(2, "little"), K * N) for r in range(K * N)]
+    return np.stack(rows)
+
+def expand_module(seed: bytes = PUBLIC_MATRIX_SEED) -> np.ndarray:
+    """A[i][j] = Parse(SHAKE-128(seed || j || i)), directement en domaine NTT (Kyber)."""
+    a_hat = np.empty((K, K, N), dtype=np.uint16)
+    for i in range(K):
+        for j in range(K):
+            a_hat[i, j] = sample_uniform(seed + bytes([j, i]), N)
+    return a_hat
+
+def expand_dense_blocked(seed: bytes = PUBLIC_MATRIX_SEED) -> np.ndarray:
+    """Même matrice que expand_dense, rangée par blocs de colonnes contigus : [b, i, j] = A[i, b*W + j]."""
+    dense = expand_dense(seed)
+    width = (K * N) // DENSE_COLUMN_BLOCKS
+    return np.ascontiguousarray(dense.reshape(K * N, DENSE_COLUMN_BLOCKS, width).transpose(1, 0, 2))
+
+_EXPANDERS = {DENSE: expand_dense, MODULE: expand_module, DENSE_BLOCKED: expand_dense_blocked}
+
+_SHAPES = {
+    DENSE: (K * N, K * N),
+    MODULE: (K, K, N),
+    DENSE_BLOCKED: (DENSE_COLUMN_BLOCKS, K * N, (K * N) // DENSE_COLUMN_BLOCKS),
+}
+
+def _cache_path(kind: str, seed: bytes, dtype: np.dtype) -> Optional[str]:
+    """Nom du fichier : forme, dtype, forme attendue et empreinte SHA3-256 complète de la seed."""
+    directory = _cache_dir or _shared_dir
+    if not directory:
+        return None
+    shape = "x".join(str(d) for d in _SHAPES[kind])
+    tag = hashlib.sha3_256(seed).hexdigest()
+    return os.path.join(directory, f"matrix_A_{kind}_{dtype.name}_{shape}_{tag}.npy")
+
+def _digest(matrix: np.ndarray) -> str:
+    """Empreinte SHA3-256 de la matrice entière (octets du tableau C-contigu)."""
+    return hashlib.sha3_256(memoryview(np.ascontiguousarray(matrix)).cast("B")).hexdigest()
+
+def _first_row(kind: str, matrix: np.ndarray) -> np.ndarray:
+    """Premier polynôme/ligne échantillonné par l'expandeur, lu dans 'matrix'."""
+    if kind == DENSE:
+        return matrix[0]
+    if kind == DENSE_BLOCKED:
+        return matrix[:, 0, :].ravel()
+    return matrix[0, 0]
+
+def _check_cached(kind: str, seed: bytes, dtype: np.dtype, matrix: np.ndarray, digest: str):
+    """
+    Rejette un .npy périmé, tronqué ou altéré : forme et dtype exacts,
+    première ligne recalculée depuis la seed, et empreinte SHA3-256 de la
+    matrice entière égale à celle écrite à côté du fichier (.sha3).
+    """
+    if matrix.shape != _SHAPES[kind] or matrix.dtype != dtype:
+        raise ValueError(f"forme {matrix.shape} / {matrix.dtype}, attendu {_SHAPES[kind]} / {dtype}")
+    if kind == MODULE:
+        expected = sample_uniform(seed + bytes([0, 0]), N)
+    else:
+        expected = sample_uniform(seed + (0).to_bytes(2, "little"), K * N)
+    if not np.array_equal(_first_row(kind, matrix), expected.astype(dtype)):
+        raise ValueError("contenu différent de la matrice dérivée de la seed")
+    if _digest(matrix) != digest:
+        raise ValueError("empreinte SHA3-256 de la matrice invalide")
+
+def _write_atomic(path: str, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def _load_or_build(kind: str, seed: bytes, dtype: np.dtype) -> np.ndarray:
+    path = _cache_path(kind, seed, dtype)
+    digest_path = f"{path}.sha3" if path else None
+    if path and os.path.exists(path):
+        try:
+            with open(digest_path, "r", encoding="ascii") as f:
+                digest = f.read().strip()
+            # Projection mémoire en lecture seule : pages partagées via le cache disque de l'OS
+            matrix = np.load(path, mmap_mode="r")
+            _check_cached(kind, seed, dtype, matrix, digest)
+            return matrix
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Cache matrice invalide ({e}), recalcul.")
+
+    matrix = _EXPANDERS[kind](seed).astype(dtype, copy=False)
+
+    if path:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            digest = _digest(matrix).encode("ascii")
+            _write_atomic(digest_path, lambda f: f.write(digest))
+            _write_atomic(path, lambda f: np.save(f, matrix))
+            return np.load(path, mmap_mode="r")
+        except OSError as e:
+            print(f"[WARN] Écriture du cache matrice impossible : {e}")
+    return matrix
+
+def get_public_matrix(kind: str, seed: bytes = PUBLIC_MATRIX_SEED, dtype=np.uint16) -> np.ndarray:
+    """
+    Matrice publique A (lecture seule), calculée AU PLUS UNE FOIS par processus.
+    Toutes les instances DRBG partagent le même tableau : une nouvelle
+    instance ne coûte ni calcul ni mémoire supplémentaire.
+
+    Args:
+        kind: DENSE, MODULE ou DENSE_BLOCKED.
+        seed: Seed publique (rho).
+        dtype: Type de stockage voulu par le moteur (évite une conversion par appel).
+    """
+    if kind not in _EXPANDERS:
+        raise ValueError(f"Forme de matrice inconnue : {kind}")
+    dtype = np.dtype(dtype)
+    key = (kind, seed, dtype.name)
+    matrix = _cache.get(key)
+    if matrix is not None:
+        return matrix
+    with _cache_lock:
+        matrix = _cache.get(key)
+        if matrix is None:
+            matrix = _load_or_build(kind, seed, dtype)
+            matrix.setflags(write=False)
+            _cache[key] = matrix
+    return matrix
+
+def clear_cache():
+    """
+    Vide le cache du processus (tests, changement de dossier partagé).
+    Les moteurs déjà construits conservent la matrice qu'ils référencent ;
+    seuls les prochains get_public_matrix() la rechargent.
+    """
+    with _cache_lock:
+        _cache.clear()
+
+if os.environ.get(CACHE_DIR_ENV):
+    set_cache_dir(os.environ[CACHE_DIR_ENV])
+if os.environ.get(SHARED_ENV):
+    enable_shared_matrix(None if os.environ[SHARED_ENV] == "1" else os.environ[SHARED_ENV])
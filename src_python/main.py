@@ -1,27 +1,243 @@
+# Point d'entrée en ligne de commande : flux de sortie DRBG (façon dd if=/dev/urandom)
+#
+# Écrit N octets (ou sans limite) sur la sortie standard ou dans un fichier,
+# par gros blocs écrits d'un coup. Affiche en continu le débit et les
+# percentiles de latence par appel (sur stderr), puis un bilan : reseeds et
+# temps passé dans chaque étape (instrumentation METRICS).
+#
+# Sources :
+# - par défaut, MobileRNG (entropie réelle, état TEE) ;
+# - --seed : flux reproductible (BulkGenerator, un DRBG par bloc), identique
+#   pour (seed, taille de bloc) fixés quel que soit le nombre de workers ;
+# - --workers N > 1 : blocs produits en parallèle (ProcessPoolExecutor).
+#
+# Usage :
+#   python -m src_python.main --bytes 1G --output alea.bin
+#   python -m src_python.main --bytes 256M --seed 00112233 --workers 4 > test.bin
+#   python -m src_python.main --engine ntt --chunk-size 4M | head -c 100M > /dev/null
+#   python -m src_python.main --demo
 import sys
 import os
+import re
+import time
+import json
+import argparse
 import binascii
+import contextlib
+from typing import Dict, Iterator, List, Optional
 
-# Fix PYTHONPATH
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(current_dir)
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+KIB = 1024
+MIB = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1 * MIB
+_SIZE_UNITS = {"": 1, "K": KIB, "M": MIB, "G": 1024 * MIB, "T": 1024 * 1024 * MIB}
+_SIZE_RE = re.compile(r"^(\d+)([KMGT]?)(?:I?B)?$")
 
-try:
-    from src_python.api.mobile_rng import MobileRNG
-except ImportError as e:
-    print(f"[ERREUR] {e}")
-    sys.exit(1)
+def _fix_pythonpath():
+    """
+    Lancement direct (python src_python/main.py) : ajoute la racine du projet
+    au chemin. Inutile avec python -m src_python.main ; n'est jamais fait à l'import.
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+def parse_size(text: str) -> int:
+    """'4096', '64K', '1M', '2GiB'... (multiples binaires, comme dd)."""
+    match = _SIZE_RE.match(text.strip().upper())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Taille invalide : {text}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2)]
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class StreamStats:
+    """Débit et latence par appel de génération (une mesure par bloc)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.bytes = 0
+        self.latencies: List[float] = []
+        self._window_start = self.started
+        self._window_bytes = 0
+        self._window_index = 0
+
+    def record(self, num_bytes: int, seconds: float):
+        self.bytes += num_bytes
+        self._window_bytes += num_bytes
+        self.latencies.append(seconds)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def live_line(self) -> str:
+        """Ligne de suivi : débit instantané (depuis la ligne précédente) et moyen."""
+        now = time.perf_counter()
+        window = self.latencies[self._window_index:]
+        current = self._window_bytes / max(now - self._window_start, 1e-9) / MIB
+        average = self.bytes / max(now - self.started, 1e-9) / MIB
+        recent = sorted(window)
+        self._window_start, self._window_bytes, self._window_index = now, 0, len(self.latencies)
+        return (f"{self.bytes / MIB:10.1f} MiB  {current:8.1f} MiB/s (moy. {average:.1f})  "
+                f"p50 {_percentile(recent, 50) * 1e3:.2f} ms  p99 {_percentile(recent, 99) * 1e3:.2f} ms")
+
+    def summary(self) -> Dict:
+        wall = self.elapsed()
+        lat = sorted(self.latencies)
+        return {
+            "bytes": self.bytes,
+            "calls": len(lat),
+            "wall_s": wall,
+            "mb_s": self.bytes / wall / MIB if wall > 0 else 0.0,
+            "p50_ms": _percentile(lat, 50) * 1e3,
+            "p90_ms": _percentile(lat, 90) * 1e3,
+            "p99_ms": _percentile(lat, 99) * 1e3,
+            "max_ms": (lat[-1] if lat else 0.0) * 1e3,
+        }
+
+# 1. Sources de blocs
+
+def _open_source(args, rng) -> Iterator:
+    """Itérateur de blocs (bytes ou memoryview réutilisé) selon seed / workers."""
+    if args.seed is not None or args.workers > 1:
+        from src_python.api.bulk import BulkGenerator
+        bulk = BulkGenerator(rng=rng, workers=args.workers, chunk_size=args.chunk_size, engine=args.engine)
+        return bulk.iter_chunks(args.bytes, seed=args.seed)
+    from src_python.api.stream import iter_chunks
+    return iter_chunks(rng, chunk_size=args.chunk_size, total=args.bytes, reuse_buffer=True)
+
+def _open_output(path: str):
+    if path == "-":
+        return sys.stdout.buffer, False
+    return open(path, "wb"), True
+
+# 2. Boucle de copie
+
+def run_stream(args, status=None) -> Dict:
+    """Copie le flux vers la sortie ; retourne le bilan (octets, débit, latences, étapes)."""
+    status = status or sys.stderr
+    out, must_close = _open_output(args.output)
+    try:
+        # Les messages de diagnostic des modules (print) ne doivent pas se
+        # mêler aux octets écrits sur la sortie standard
+        with contextlib.redirect_stdout(status):
+            return _copy_stream(args, out, status)
+    finally:
+        if must_close:
+            out.close()
+
+def _copy_stream(args, out, status) -> Dict:
+    from src_python.utils.metrics import METRICS
+    from src_python.core.engines import resolve_engine_name
+
+    # Vérifié avant l'initialisation du RNG (BulkGenerator le refuserait ensuite)
+    if args.seed is not None or args.workers > 1:
+        from src_python.api.bulk import MAX_CHUNK_SIZE
+        if args.chunk_size > MAX_CHUNK_SIZE:
+            raise ValueError("--chunk-size trop grand pour un DRBG worker.")
+
+    metrics_were_enabled = METRICS.enabled
+    METRICS.reset()
+    METRICS.enable(not args.no_metrics)
+    rng = None
+    init_started = time.perf_counter()
+    if args.seed is None:
+        from src_python.api.mobile_rng import MobileRNG
+        rng = MobileRNG(engine=args.engine, state_file=args.state_file)
+        if not rng.initialize():
+            raise RuntimeError("Initialisation du RNG impossible.")
+
+    init_s = time.perf_counter() - init_started
+    stats = StreamStats()
+    interrupted = None
+    source = _open_source(args, rng)
+    next_report = stats.started + args.interval
+    try:
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(source, None)
+            elapsed = time.perf_counter() - t0
+            if chunk is None:
+                break
+            with METRICS.timer("cli.write"):
+                out.write(chunk)
+            stats.record(len(chunk), elapsed)
+            if not args.quiet and time.perf_counter() >= next_report:
+                print(stats.live_line(), file=status, flush=True)
+                next_report += args.interval
+        out.flush()
+    except BrokenPipeError:
+        # Lecteur parti (ex. | head -c) : fin normale, comme dd
+        interrupted = "broken_pipe"
+        if args.output == "-":
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+    except KeyboardInterrupt:
+        interrupted = "interrupted"
+    finally:
+        if hasattr(source, "close"):
+            source.close()
+        if rng is not None:
+            rng.close()
+
+    report = stats.summary()
+    report["init_s"] = init_s
+    report["engine"] = resolve_engine_name(args.engine)
+    report["source"] = "seed" if args.seed is not None else "mobile_rng"
+    report["workers"] = args.workers
+    report["chunk_size"] = args.chunk_size
+    report["interrupted"] = interrupted
+    snapshot = METRICS.snapshot()
+    counters = snapshot["counters"]
+    report["reseeds"] = int(counters.get("reseeds", 0))
+    report["background_reseeds"] = int(counters.get("background_reseeds", 0))
+    report["forced_reseeds"] = int(counters.get("forced_reseeds", 0))
+    report["stages"] = {stage: {"count": s["count"], "total_s": s["sum_s"], "mean_ms": s["mean_s"] * 1e3}
+                        for stage, s in snapshot["stages"].items()}
+    METRICS.enable(metrics_were_enabled)
+    return report
+
+def format_summary(report: Dict) -> str:
+    lines = [
+        f"{report['bytes']} octets ({report['bytes'] / MIB:.1f} MiB) en {report['wall_s']:.2f} s, "
+        f"{report['mb_s']:.1f} MiB/s (+ init {report['init_s'] * 1e3:.0f} ms)  [source {report['source']}, moteur {report['engine']}, "
+        f"workers {report['workers']}, blocs {report['chunk_size']} o]",
+        f"latence/appel  p50 {report['p50_ms']:.2f} ms  p90 {report['p90_ms']:.2f} ms  "
+        f"p99 {report['p99_ms']:.2f} ms  max {report['max_ms']:.2f} ms  ({report['calls']} appels)",
+        f"reseeds        {report['reseeds']} (arrière-plan {report['background_reseeds']}, "
+        f"bloquants {report['forced_reseeds']})",
+    ]
+    if report["interrupted"]:
+        lines.append(f"arrêt          {report['interrupted']}")
+    if report["stages"]:
+        # Part du temps total, initialisation (MobileRNG, matrice) comprise
+        total = report["wall_s"] + report["init_s"]
+        lines.append(f"{'étape':<22} {'appels':>8} {'total (s)':>10} {'moy. (ms)':>10} {'% temps':>8}")
+        for stage, s in sorted(report["stages"].items(), key=lambda item: -item[1]["total_s"]):
+            share = 100.0 * s["total_s"] / total if total > 0 else 0.0
+            lines.append(f"{stage:<22} {s['count']:>8} {s['total_s']:>10.3f} {s['mean_ms']:>10.3f} {share:>7.1f}%")
+        if report["workers"] > 1:
+            lines.append("(étapes DRBG des workers exécutées dans d'autres processus : non mesurées ici)")
+    return "\n".join(lines)
+
+# 3. Démonstration (ancien main)
+
+def demo():
+    try:
+        from src_python.api.mobile_rng import MobileRNG
+    except ImportError as e:
+        print(f"[ERREUR] {e}")
+        sys.exit(1)
 
-def main():
     print("==================================================")
     print("   DEMO RNG MOBILE POST-QUANTIQUE (Module-LWR)    ")
     print("   Sécurité basée sur les Réseaux Euclidiens      ")
     print("==================================================\n")
 
     rng = MobileRNG()
-    
+
     print(">>> 1. Initialisation (Chargement TEE + Source Entropie)...")
     if rng.initialize():
         print("[SUCCÈS] Moteur LWR prêt.")
@@ -32,7 +248,7 @@ def main():
     # ICI : On change le message pour être clair
     print("\n>>> 2. Génération d'ALÉA POST-QUANTIQUE (Lattice-Based)")
     print("Ces octets sont générés par le problème mathématique LWR.\n")
-    
+
     for i in range(5):
         # On génère 32 octets (Taille d'une clé AES-256)
         data, status = rng.generate(32)
@@ -44,5 +260,43 @@ def main():
     print("\n>>> 3. Vérification Santé")
     print(rng.health_check())
 
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flux de sortie du DRBG post-quantique (façon dd).")
+    parser.add_argument("--bytes", type=parse_size, default=None, help="Octets à produire (défaut : sans limite)")
+    parser.add_argument("--output", "-o", default="-", help="Fichier de sortie ('-' : sortie standard)")
+    parser.add_argument("--chunk-size", type=parse_size, default=DEFAULT_CHUNK_SIZE, help="Octets par appel/écriture")
+    parser.add_argument("--engine", default=None, help="Moteur DRBG (défaut : RNG_ENGINE ou dense)")
+    parser.add_argument("--workers", type=int, default=1, help="Processus de génération (> 1 : BulkGenerator)")
+    parser.add_argument("--seed", type=bytes.fromhex, default=None, help="Seed hex : flux reproductible")
+    parser.add_argument("--state-file", default="secure_state.bin", help="Fichier d'état du MobileRNG")
+    parser.add_argument("--interval", type=float, default=1.0, help="Période du suivi en direct (s)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Sans suivi en direct")
+    parser.add_argument("--no-metrics", action="store_true", help="Sans temps par étape (METRICS)")
+    parser.add_argument("--json", action="store_true", help="Bilan JSON sur stderr")
+    parser.add_argument("--force", action="store_true", help="Autorise l'écriture binaire sur un terminal")
+    parser.add_argument("--demo", action="store_true", help="Démonstration (5 clés de 32 octets)")
+    args = parser.parse_args(argv)
+
+    if args.demo:
+        demo()
+        return 0
+    if args.chunk_size <= 0 or args.workers <= 0:
+        parser.error("--chunk-size et --workers doivent être > 0.")
+    if args.output == "-" and sys.stdout.isatty() and not args.force:
+        parser.error("refus d'écrire du binaire sur un terminal (rediriger, --output, --force ou --demo).")
+
+    try:
+        report = run_stream(args)
+    except (ValueError, RuntimeError) as e:
+        print(f"[ERREUR CLI] {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(report, indent=2), file=sys.stderr)
+    else:
+        print(format_summary(report), file=sys.stderr)
+    return 130 if report["interrupted"] == "interrupted" else 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if not __package__:
+        _fix_pythonpath()
+    sys.exit(main())
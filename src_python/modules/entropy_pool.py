@@ -0,0 +1,253 @@
+# Pool d'entropie alimenté en continu (thread de fond + comptabilité de crédit)
+import os
+import time
+import threading
+from collections import deque
+from typing import Optional, List, Dict
+
+import numpy as np
+
+from src_python.core.conditioner import Conditioner
+from src_python.modules.entropy_src import (
+    NoiseCollector, JitterCollector, EntropySourceManager, EntropyHealthError
+)
+
+# 1. Sources supplémentaires
+class UrandomCollector(NoiseCollector):
+    """Entropie du noyau (os.urandom) : source de secours / renfort."""
+
+    def __init__(self, sample_bytes: int = 32):
+        self.sample_bytes = sample_bytes
+
+    def sample(self) -> bytes:
+        return os.urandom(self.sample_bytes)
+
+class EventCollector(NoiseCollector):
+    """
+    Événements fournis par l'application (toucher écran, capteurs, réseau...).
+    Chaque événement est horodaté et résumé en 16 octets à l'arrivée ;
+    sample_batch() vide la file (peut retourner moins de n lignes, voire 0).
+    """
+
+    RECORD_BYTES = 16
+
+    def __init__(self, max_events: int = 4096):
+        self._events = deque(maxlen=max_events)
+        self._cond = Conditioner()
+
+    def add_event(self, data: bytes):
+        stamp = time.perf_counter_ns().to_bytes(8, "little")
+        self._events.append(self._cond.condition(stamp + data, b"EVENT", self.RECORD_BYTES * 8))
+
+    def sample(self) -> bytes:
+        return self._events.popleft() if self._events else b""
+
+    def sample_batch(self, n: int) -> np.ndarray:
+        records = []
+        while self._events and len(records) < n:
+            records.append(self._events.popleft())
+        return np.frombuffer(b"".join(records), dtype=np.uint8).reshape(len(records), self.RECORD_BYTES)
+
+# 2. Le Pool
+class _Source:
+    def __init__(self, collector: NoiseCollector, credit_bits: float, batch: int,
+                 health: Optional[EntropySourceManager]):
+        self.collector = collector
+        self.credit_bits = credit_bits
+        self.batch = batch
+        self.health = health
+        self.samples = 0
+        self.failures = 0
+
+class EntropyPool:
+    """
+    Pool d'entropie conditionné, alimenté par un thread de fond.
+
+    - Chaque source (NoiseCollector) est échantillonnée par lots, passe ses
+      tests de santé (startup puis continus), puis est mélangée dans un état
+      SHAKE-256 de POOL_BYTES octets.
+    - Crédit d'entropie : chaque lot sain crédite credit_bits par échantillon,
+      plafonné à la taille du pool. Un lot en échec n'est pas crédité.
+    - get_entropy() est immédiat si le crédit suffit, sinon attend (timeout).
+    - Chaque extraction fait avancer l'état (pas de retour en arrière possible).
+    """
+
+    POOL_BYTES = 64
+
+    def __init__(self, conditioner: Optional[Conditioner] = None, refresh_interval: float = 1.0):
+        """
+        Args:
+            conditioner: Conditionneur SHAKE-256 partagé.
+            refresh_interval: Quand le pool est plein, période de collecte
+                              (les tests de santé continuent de tourner).
+        """
+        self.cond = conditioner or Conditioner()
+        self.refresh_interval = refresh_interval
+        self.capacity_bits = self.POOL_BYTES * 8
+
+        self._state = bytes(self.POOL_BYTES)
+        self._credit = 0.0
+        self._sources: List[_Source] = []
+        self._lock = threading.Condition()
+        self._running = False
+        self._worker: Optional[threading.Thread] = None
+        self._failure: Optional[str] = None
+        self.events: Optional[EventCollector] = None
+        self.startup_done = False
+        self.extractions = 0
+
+    def add_source(self, collector: NoiseCollector, credit_bits: float = 0.0,
+                   batch: int = 16, health_tests: bool = True):
+        """
+        Ajoute une source.
+        Args:
+            credit_bits: Entropie créditée par échantillon (bits) ; 0 = mélangée sans crédit.
+            batch: Échantillons collectés par tour.
+            health_tests: Active les tests SP 800-90B (startup + continus) sur cette source.
+        """
+        health = EntropySourceManager(collector, self.cond) if health_tests else None
+        with self._lock:
+            self._sources.append(_Source(collector, credit_bits, batch, health))
+
+    @classmethod
+    def default(cls, conditioner: Optional[Conditioner] = None,
+                collector: Optional[JitterCollector] = None) -> "EntropyPool":
+        """
+        Pool standard : jitter (crédit prudent) + os.urandom (renfort)
+        + événements applicatifs (add_event), mélangés sans crédit.
+        """
+        pool = cls(conditioner)
+        jitter = collector or JitterCollector()
+        pool.add_source(jitter, credit_bits=jitter.k * EntropySourceManager.DELTA_MIN_ENTROPY)
+        pool.add_source(UrandomCollector(), credit_bits=128, batch=1, health_tests=False)
+        pool.events = EventCollector()
+        pool.add_source(pool.events, batch=64, health_tests=False)
+        return pool
+
+    def add_event(self, data: bytes):
+        """Événement applicatif : mélangé au prochain tour de collecte (sans crédit)."""
+        if self.events is not None:
+            self.events.add_event(data)
+
+    # --- Cycle de vie ---
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._worker = threading.Thread(target=self._run, name="EntropyPool", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._lock.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def reset_after_fork(self):
+        """
+        Enfant après fork() : nouveau verrou, thread à redémarrer (get_entropy
+        le fait). L'état copié est remélangé avec le PID et l'horloge, et le
+        crédit remis à zéro : deux enfants ne peuvent pas extraire la même
+        entropie, et le crédit hérité a déjà été compté par le parent.
+        """
+        self._lock = threading.Condition()
+        self._running = False
+        self._worker = None
+        self._failure = None
+        fork_tag = os.getpid().to_bytes(8, "little") + time.time_ns().to_bytes(8, "little")
+        self._state = self.cond.condition(self._state + fork_tag + os.urandom(32), b"POOL_FORK", self.POOL_BYTES * 8)
+        self._credit = 0.0
+
+    # --- Thread de collecte ---
+
+    def _collect_round(self):
+        for source in list(self._sources):
+            samples = source.collector.sample_batch(source.batch)
+            if samples.shape[0] == 0:
+                continue
+
+            if source.health is not None:
+                rep = source.health.startup_tests() if not source.health.startup_done else None
+                if rep is None or rep.ok:
+                    rep = source.health.check_batch(samples, "Continuous")
+                if not rep.ok:
+                    source.failures += 1
+                    with self._lock:
+                        self._failure = rep.reason
+                        # Le crédit gagné avant l'échec n'est plus fiable
+                        self._credit = 0.0
+                        self._lock.notify_all()
+                    continue
+
+            raw = samples.tobytes()
+            with self._lock:
+                self._state = self.cond.condition(self._state + raw, b"POOL_MIX", self.POOL_BYTES * 8)
+                self._credit = min(self.capacity_bits, self._credit + source.credit_bits * samples.shape[0])
+                source.samples += samples.shape[0]
+                self._lock.notify_all()
+
+        with self._lock:
+            self.startup_done = all(s.health is None or s.health.startup_done for s in self._sources)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                if self._credit >= self.capacity_bits:
+                    self._lock.wait(timeout=self.refresh_interval)
+                    if not self._running:
+                        return
+            try:
+                self._collect_round()
+            except Exception as e:
+                print(f"[ERREUR POOL] {e}")
+                time.sleep(0.01)
+
+    # --- Extraction ---
+
+    def get_entropy(self, num_bytes: int = 48, timeout: Optional[float] = 1.0) -> bytes:
+        """
+        Extrait num_bytes conditionnés, en débitant num_bytes*8 bits de crédit.
+        Une extraction ne peut pas dépasser la taille du pool (POOL_BYTES).
+
+        Raises:
+            ValueError: num_bytes > POOL_BYTES (plus d'entropie que le pool n'en contient).
+            EntropyHealthError: une source a échoué ses tests depuis la dernière extraction.
+            TimeoutError: crédit insuffisant à l'expiration du délai.
+        """
+        if num_bytes > self.POOL_BYTES:
+            raise ValueError(f"Extraction de {num_bytes} octets > taille du pool ({self.POOL_BYTES}).")
+        needed = num_bytes * 8
+        self.start()
+        with self._lock:
+            ready = self._lock.wait_for(lambda: self._failure is not None or self._credit >= needed, timeout)
+            if self._failure is not None:
+                reason, self._failure = self._failure, None
+                raise EntropyHealthError(reason)
+            if not ready:
+                raise TimeoutError(f"Pool d'entropie : {self._credit:.0f}/{needed} bits disponibles.")
+
+            self.extractions += 1
+            counter = self.extractions.to_bytes(8, "little")
+            output = self.cond.condition(self._state + counter, b"POOL_OUT", num_bytes * 8)
+            self._state = self.cond.condition(self._state + counter, b"POOL_NEXT", self.POOL_BYTES * 8)
+            self._credit -= needed
+            self._lock.notify_all()
+            return output
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "credit_bits": self._credit,
+                "capacity_bits": self.capacity_bits,
+                "extractions": self.extractions,
+                "sources": [
+                    {"source": type(s.collector).__name__, "samples": s.samples, "failures": s.failures}
+                    for s in self._sources
+                ],
+            }
@@ -1,17 +1,23 @@
 import os
+import math
 import time
-import struct
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from src_python.utils.metrics import METRICS
 
 # Import relatif propre au projet
 try:
-    from src_python.core.conditioner import Conditioner
+    from src_python.core.conditioner import Conditioner, DOMAIN_ENTROPY
 except ImportError:
     # Fallback si exécuté en standalone (pour debug)
     print("[WARN] Import relatif échoué, mode dégradé.")
+    DOMAIN_ENTROPY = b"ENTROPY"
     class Conditioner:
         def condition(self, r, p, b): return b'\x00' * (b//8)
+        def condition_parts(self, parts, d, n): return b'\x00' * n
 
 # 1. Structures de Données
 class EntropyHealthError(Exception): pass
@@ -27,21 +33,63 @@ class HealthReport:
 class NoiseCollector:
     def sample(self) -> bytes: raise NotImplementedError
 
+    def sample_batch(self, n: int) -> np.ndarray:
+        """
+        n échantillons d'un coup, une ligne par échantillon (octets bruts).
+        Implémentation générique ; les collecteurs rapides la surchargent.
+        """
+        return np.stack([np.frombuffer(self.sample(), dtype=np.uint8) for _ in range(n)])
+
 class JitterCollector(NoiseCollector):
     def __init__(self, k_deltas: int = 32):
         self.k = k_deltas
     
     def sample(self) -> bytes:
-        last = time.perf_counter_ns()
-        deltas = []
-        for _ in range(self.k):
-            now = time.perf_counter_ns()
-            delta = (now - last) & 0xFFFFFFFFFFFFFFFF
-            deltas.append(delta)
-            last = now
-        return b"".join(struct.pack("<Q", d) for d in deltas)
+        return self.sample_batch(1).tobytes()
+
+    def sample_batch(self, n: int) -> np.ndarray:
+        """
+        Collecte VECTORISÉE : n échantillons de k deltas.
+
+        La seule boucle Python est la lecture des n*k+1 horodatages ;
+        les deltas sont calculés d'un bloc par NumPy (uint64, modulo 2^64).
+        Chaque ligne sérialisée (tobytes) a exactement le format de sample() :
+        k deltas uint64 little-endian.
+        """
+        clock = time.perf_counter_ns
+        stamps = np.array([clock() for _ in range(n * self.k + 1)], dtype=np.uint64)
+        return np.diff(stamps).astype("<u8", copy=False).reshape(n, self.k)
 
 # 3. Tests de Santé (Optimisés)
+def _as_rows(samples: Union[np.ndarray, Sequence[bytes]]) -> np.ndarray:
+    """Normalise un lot d'échantillons en matrice d'octets (une ligne par échantillon)."""
+    if isinstance(samples, np.ndarray):
+        rows = np.ascontiguousarray(samples)
+        return rows.view(np.uint8).reshape(rows.shape[0], -1)
+    return np.frombuffer(b"".join(samples), dtype=np.uint8).reshape(len(samples), -1)
+
+def rct_cutoff(min_entropy: float, alpha_exp: int = 20) -> int:
+    """Seuil RCT SP 800-90B (4.4.1) : C = 1 + ceil(alpha_exp / H)."""
+    return 1 + math.ceil(alpha_exp / min_entropy)
+
+def apt_cutoff(min_entropy: float, window: int = 512, alpha_exp: int = 20) -> int:
+    """
+    Seuil APT SP 800-90B (4.4.2) : plus petit c tel que P(X <= c) >= 1 - 2^-alpha_exp,
+    X ~ Binomiale(window, 2^-H). Le test échoue si le compteur dépasse c.
+    """
+    p = 2.0 ** -min_entropy
+    if p >= 1.0:
+        return window
+    target = 1.0 - 2.0 ** -alpha_exp
+    cdf = 0.0
+    for c in range(window + 1):
+        log_pmf = (math.lgamma(window + 1) - math.lgamma(c + 1) - math.lgamma(window - c + 1)
+                   + c * math.log(p) + (window - c) * math.log1p(-p))
+        cdf += math.exp(log_pmf)
+        if cdf >= target:
+            return c
+    return window
+
 class RepetitionCountTest:
     def __init__(self, cutoff: int = 20):
         self.cutoff = cutoff
@@ -61,6 +109,35 @@ class RepetitionCountTest:
             self._count = 1
         return True
 
+    def update_batch(self, samples: Union[np.ndarray, Sequence[bytes]]) -> bool:
+        """
+        Version vectorisée de update() sur un lot complet.
+        Même verdict que n appels successifs à update() (l'état est reporté
+        d'un lot à l'autre) : False dès qu'une série atteint le seuil.
+        """
+        rows = _as_rows(samples)
+        n = rows.shape[0]
+        if n == 0:
+            return True
+
+        # same[i] : l'échantillon i est identique au précédent
+        same = np.empty(n, dtype=bool)
+        same[0] = self._last is not None and rows[0].tobytes() == self._last
+        same[1:] = np.all(rows[1:] == rows[:-1], axis=1)
+
+        # Longueur de la série courante à chaque position
+        idx = np.arange(n)
+        run_start = np.maximum.accumulate(np.where(same, -1, idx))
+        counts = idx - run_start + 1
+        carried = run_start < 0
+        counts[carried] = idx[carried] + 1 + self._count
+
+        if np.any(counts >= self.cutoff):
+            return False
+        self._last = rows[-1].tobytes()
+        self._count = int(counts[-1])
+        return True
+
 class AdaptiveProportionTest:
     def __init__(self, window: int = 512, cutoff: int = 13):
         self.window = window
@@ -84,34 +161,113 @@ class AdaptiveProportionTest:
             return res
         return True
 
+    def update_batch(self, samples: Union[np.ndarray, Sequence[bytes]]) -> bool:
+        """
+        Version vectorisée de update() : chaque fenêtre est évaluée d'un
+        bloc (comparaison de toutes ses lignes à la cible). Même verdict que
+        n appels successifs à update() ; l'état de fenêtre est reporté.
+        """
+        rows = _as_rows(samples)
+        n = rows.shape[0]
+        i = 0
+        while i < n:
+            if self.sample_count == 0:
+                self.sample_count = 1
+                self.target = rows[i].tobytes()
+                self.target_count = 1
+                i += 1
+                continue
+
+            m = min(n - i, self.window - self.sample_count)
+            target = np.frombuffer(self.target, dtype=np.uint8)
+            self.target_count += int(np.count_nonzero(np.all(rows[i:i + m] == target, axis=1)))
+            self.sample_count += m
+            i += m
+
+            if self.sample_count >= self.window:
+                res = (self.target_count <= self.cutoff)
+                self.sample_count = 0
+                self.target = None
+                self.target_count = 0
+                if not res:
+                    return False
+        return True
+
 # 4. Le Gestionnaire (C'est lui que le test appelle !)
 class EntropySourceManager:
-    def __init__(self, collector: NoiseCollector, conditioner: Conditioner):
+    # Entropie minimale supposée par delta de jitter (bits), pour les tests par delta.
+    # Valeur prudente : les deltas successifs sont corrélés (séries de ~20 observées).
+    DELTA_MIN_ENTROPY = 0.5
+
+    def __init__(self, collector: NoiseCollector, conditioner: Conditioner,
+                 pool=None, pool_timeout: Optional[float] = 1.0):
+        """
+        Args:
+            pool: EntropyPool optionnel. S'il est fourni, get_entropy() puise
+                  dans le pool alimenté en arrière-plan (non bloquant si le
+                  crédit suffit) au lieu de collecter de manière synchrone.
+            pool_timeout: Attente maximale du crédit d'entropie (secondes).
+        """
         self.collector = collector
         self.cond = conditioner
+        self.pool = pool
+        self.pool_timeout = pool_timeout
         self.rct = RepetitionCountTest()
         self.apt = AdaptiveProportionTest()
         self.startup_done = False
 
+        # Tests SP 800-90B par échantillon brut (chaque delta de jitter)
+        self.delta_rct = None
+        self.delta_apt = None
+        if isinstance(collector, JitterCollector):
+            h = self.DELTA_MIN_ENTROPY
+            self.delta_rct = RepetitionCountTest(cutoff=rct_cutoff(h))
+            self.delta_apt = AdaptiveProportionTest(window=512, cutoff=apt_cutoff(h, 512))
+
+    def check_batch(self, samples: np.ndarray, phase: str) -> HealthReport:
+        """Tests de santé d'un lot (chronométrés, échecs comptés)."""
+        with METRICS.timer("entropy.health"):
+            rep = self._run_health_tests(samples, phase)
+        if not rep.ok and METRICS.enabled:
+            METRICS.inc("health_failures")
+        return rep
+
+    def _run_health_tests(self, samples: np.ndarray, phase: str) -> HealthReport:
+        """Tests de santé d'un lot : blobs entiers puis deltas individuels."""
+        if not self.rct.update_batch(samples): return HealthReport(False, False, True, f"{phase} RCT Fail")
+        if not self.apt.update_batch(samples): return HealthReport(False, True, False, f"{phase} APT Fail")
+        if self.delta_rct is not None:
+            deltas = samples.reshape(-1, 1)
+            if not self.delta_rct.update_batch(deltas): return HealthReport(False, False, True, f"{phase} Delta RCT Fail")
+            if not self.delta_apt.update_batch(deltas): return HealthReport(False, True, False, f"{phase} Delta APT Fail")
+        return HealthReport(True, True, True, f"{phase} OK")
+
     def startup_tests(self) -> HealthReport:
-        for _ in range(64):
-            x = self.collector.sample()
-            if not self.rct.update(x): return HealthReport(False, False, True, "Startup RCT Fail")
-            if not self.apt.update(x): return HealthReport(False, True, False, "Startup APT Fail")
-        self.startup_done = True
-        return HealthReport(True, True, True, "Startup OK")
+        with METRICS.timer("entropy.collect"):
+            samples = self.collector.sample_batch(64)
+        rep = self.check_batch(samples, "Startup")
+        if rep.ok:
+            self.startup_done = True
+        return rep
 
     def get_entropy(self, num_bytes: int = 48) -> bytes:
+        with METRICS.timer("entropy.get_entropy"):
+            return self._get_entropy(num_bytes)
+
+    def _get_entropy(self, num_bytes: int) -> bytes:
+        if self.pool is not None:
+            data = self.pool.get_entropy(num_bytes, timeout=self.pool_timeout)
+            self.startup_done = self.pool.startup_done
+            return data
+
         if not self.startup_done:
             rep = self.startup_tests()
             if not rep.ok: raise EntropyHealthError(rep.reason)
         
-        buffer = bytearray()
         needed = max(1, num_bytes // 8) * 2
-        for _ in range(needed):
-            sample = self.collector.sample()
-            if not self.rct.update(sample): raise EntropyHealthError("Continuous RCT Fail")
-            if not self.apt.update(sample): raise EntropyHealthError("Continuous APT Fail")
-            buffer.extend(sample)
+        with METRICS.timer("entropy.collect"):
+            samples = self.collector.sample_batch(needed)
+        rep = self.check_batch(samples, "Continuous")
+        if not rep.ok: raise EntropyHealthError(rep.reason)
             
-        return self.cond.condition(buffer, b"ENTROPY", num_bytes * 8)
\ No newline at end of file
+        return self.cond.condition_parts((samples.data,), DOMAIN_ENTROPY, num_bytes)
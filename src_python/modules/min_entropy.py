@@ -0,0 +1,281 @@
+# Estimateurs de min-entropie SP 800-90B (section 6.3) pour les échantillons bruts
+#
+# Appliqués aux deltas de JitterCollector pour vérifier l'hypothèse
+# d'entropie des tests de santé (EntropySourceManager.DELTA_MIN_ENTROPY).
+# Les deltas (uint64) sont réduits à leurs bits de poids faible (symboles
+# de 8 bits au plus, comme l'exige SP 800-90B).
+#
+# Estimateurs : Most Common Value (6.3.1), Collision (6.3.2, binaire),
+# Markov (6.3.3, binaire), t-Tuple (6.3.5), LRS (6.3.6), Lag Prediction
+# (6.3.8). Les estimateurs non binaires sont aussi appliqués à la chaîne
+# de bits (6.1) : h = min(H_original, bits_par_symbole * H_bitstring).
+import math
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Quantile 99,5 % de la loi normale (bornes de confiance de SP 800-90B)
+Z_ALPHA = 2.576
+# Seuil du t-Tuple : un motif doit apparaître au moins 35 fois
+TUPLE_CUTOFF = 35
+# Nombre de retards du Lag Predictor
+LAG_DEPTH = 128
+# Longueur maximale de chaîne de bits analysée (comme l'outil de référence)
+MAX_BITSTRING = 1_000_000
+# Longueur maximale de motif examinée par le LRS (données dégénérées)
+MAX_TUPLE_LENGTH = 512
+
+# Multiplicateur impair pour le hachage des motifs longs (au-delà de 64 bits)
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+@dataclass
+class EntropyAssessment:
+    samples: int
+    bits_per_symbol: int
+    estimates: Dict[str, float]
+    min_entropy: float
+    assumed: float
+    passed: bool
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+# 1. Utilitaires
+
+def jitter_symbols(deltas: np.ndarray, bits: int = 8) -> np.ndarray:
+    """Symboles de 'bits' bits (poids faible de chaque delta uint64)."""
+    if not 1 <= bits <= 8:
+        raise ValueError("Symboles de 1 à 8 bits.")
+    return (np.asarray(deltas, dtype=np.uint64).ravel() & np.uint64((1 << bits) - 1)).astype(np.uint8)
+
+def to_bitstring(symbols: np.ndarray, bits: int) -> np.ndarray:
+    """Concatène les symboles (bit de poids fort d'abord), tronqué à MAX_BITSTRING bits."""
+    count = min(symbols.size, -(-MAX_BITSTRING // bits))
+    out = np.unpackbits(symbols[:count, None], axis=1)[:, 8 - bits:]
+    return out.ravel()[:MAX_BITSTRING]
+
+def _upper_bound(p: float, n: int) -> float:
+    return min(1.0, p + Z_ALPHA * math.sqrt(p * (1.0 - p) / (n - 1)))
+
+def _bits(p: float) -> float:
+    return -math.log2(p) if p > 0 else float("inf")
+
+def _longest_true_run(flags: np.ndarray) -> int:
+    if not flags.any():
+        return 0
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return int(np.max(edges[1::2] - edges[::2]))
+
+def _local_probability(r: int, n: int) -> float:
+    """
+    P_local (6.3.7/6.3.8) : p tel que la probabilité de n'observer aucune
+    série de r succès en n essais vaille 0.99 (recherche dichotomique).
+    """
+    def no_run_log_prob(p: float) -> float:
+        q = 1.0 - p
+        x = 1.0
+        for _ in range(10):
+            x = 1.0 + q * p ** r * x ** (r + 1)
+        num = 1.0 - p * x
+        den = (r + 1.0 - r * x) * q
+        if num <= 0 or den <= 0:
+            return -math.inf
+        return math.log(num) - math.log(den) - (n + 1) * math.log(x)
+
+    target = math.log(0.99)
+    lo, hi = 0.0, 1.0 - 1e-12
+    for _ in range(60):
+        mid = (lo + hi) / 2.0
+        if no_run_log_prob(mid) > target:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+# 2. Estimateurs
+
+def most_common_value(s: np.ndarray) -> float:
+    """6.3.1 Most Common Value."""
+    p_hat = np.bincount(s).max() / s.size
+    return _bits(_upper_bound(p_hat, s.size))
+
+def collision_estimate(bits: np.ndarray) -> float:
+    """
+    6.3.2 Collision (données binaires).
+
+    Chaque collision dure 2 (deux bits égaux) ou 3 échantillons. Pour des
+    données binaires, l'équation de 6.3.2 se réduit à E[t] = 2 + 2p(1-p),
+    résolue directement.
+    """
+    b = bits.astype(np.int8)
+    lengths = np.where(b[:-1] == b[1:], 2, 3).tolist()
+    times = []
+    i, last = 0, b.size - 2
+    while i < last:
+        t = lengths[i]
+        times.append(t)
+        i += t
+    t = np.asarray(times, dtype=np.float64)
+    mean = t.mean() - Z_ALPHA * t.std(ddof=1) / math.sqrt(t.size)
+    if mean >= 2.5:
+        return 1.0
+    if mean <= 2.0:
+        return 0.0
+    p = (1.0 + math.sqrt(1.0 - 2.0 * (mean - 2.0))) / 2.0
+    return _bits(p)
+
+def markov_estimate(bits: np.ndarray) -> float:
+    """6.3.3 Markov (données binaires) : séquence de 128 bits la plus probable."""
+    b = bits.astype(np.int64)
+    p1 = b.mean()
+    p0 = 1.0 - p1
+    pairs = np.bincount(2 * b[:-1] + b[1:], minlength=4)
+    from0, from1 = pairs[0] + pairs[1], pairs[2] + pairs[3]
+    p00, p01 = (pairs[0] / from0, pairs[1] / from0) if from0 else (0.0, 0.0)
+    p10, p11 = (pairs[2] / from1, pairs[3] / from1) if from1 else (0.0, 0.0)
+
+    def log2p(*factors) -> float:
+        total = 0.0
+        for p, e in factors:
+            if e == 0:
+                continue
+            if p == 0:
+                return -math.inf
+            total += e * math.log2(p)
+        return total
+
+    candidates = (
+        log2p((p0, 1), (p00, 127)),
+        log2p((p0, 1), (p01, 64), (p10, 63)),
+        log2p((p0, 1), (p01, 1), (p11, 126)),
+        log2p((p1, 1), (p10, 1), (p00, 126)),
+        log2p((p1, 1), (p10, 64), (p01, 63)),
+        log2p((p1, 1), (p11, 127)),
+    )
+    return min(-max(candidates) / 128.0, 1.0)
+
+def _tuple_statistics(s: np.ndarray, bits: int) -> Tuple[Dict[int, int], Dict[int, float]]:
+    """
+    Pour chaque longueur W = 1, 2, ... : effectif du motif le plus fréquent
+    et somme des C(c, 2) (paires de motifs identiques), jusqu'au premier W
+    sans répétition.
+
+    Les motifs sont codés en uint64 (exact tant que W * bits <= 64, puis
+    hachage multiplicatif ; collisions en ~L²/2^64).
+    """
+    exact_len = 64 // bits
+    sym = s.astype(np.uint64)
+    exact = np.zeros(s.size, dtype=np.uint64)
+    hashed = np.zeros(s.size, dtype=np.uint64)
+    most, pairs = {}, {}
+    width = 1
+    while width <= MAX_TUPLE_LENGTH and width <= s.size - 1:
+        tail = sym[width - 1:]
+        exact = (exact[:tail.size] << np.uint64(bits)) | tail
+        hashed = hashed[:tail.size] * _HASH_MULT + tail + np.uint64(1)
+        codes = np.sort(exact if width <= exact_len else hashed)
+        bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        counts = np.diff(np.concatenate(([0], bounds, [codes.size])))
+        most[width] = int(counts.max())
+        if most[width] < 2:
+            break
+        pairs[width] = float(np.sum(counts * (counts - 1) / 2.0))
+        width += 1
+    return most, pairs
+
+def tuple_estimates(s: np.ndarray, bits: int) -> Tuple[float, Optional[float]]:
+    """6.3.5 t-Tuple et 6.3.6 LRS (None si le LRS ne s'applique pas)."""
+    L = s.size
+    most, pairs = _tuple_statistics(s, bits)
+
+    t = max([w for w, q in most.items() if q >= TUPLE_CUTOFF], default=0)
+    if t:
+        p_max = max((most[i] / (L - i + 1)) ** (1.0 / i) for i in range(1, t + 1))
+        t_tuple = _bits(_upper_bound(p_max, L))
+    else:
+        t_tuple = _bits(_upper_bound(np.bincount(s).max() / L, L))
+
+    u, v = t + 1, max(pairs, default=0)
+    if v < u:
+        return t_tuple, None
+    p_max = max((pairs[w] / ((L - w + 1) * (L - w) / 2.0)) ** (1.0 / w) for w in range(u, v + 1))
+    return t_tuple, _bits(_upper_bound(p_max, L))
+
+def lag_prediction_estimate(s: np.ndarray, alphabet: int, depth: int = LAG_DEPTH,
+                            block: int = 4096) -> float:
+    """
+    6.3.8 Lag Prediction.
+
+    Le tableau de scores est vectorisé par blocs de positions : scores
+    cumulés (depth x block), puis gagnant après chaque pas = plus grand
+    retard incrémenté atteignant le score maximal (même règle de départage
+    que la boucle de référence), propagé vers l'avant.
+    """
+    L = s.size
+    lags = np.arange(1, depth + 1)[:, None]
+    scores = np.zeros(depth, dtype=np.int64)
+    winner = 0  # indice du retard 1
+    correct = np.zeros(L, dtype=bool)
+    for start in range(1, L, block):
+        idx = np.arange(start, min(L, start + block))
+        width = idx.size
+        past = idx[None, :] - lags
+        match = (past >= 0) & (s[np.maximum(past, 0)] == s[idx][None, :])
+        cum = scores[:, None] + np.cumsum(match, axis=1)
+
+        leaders = match & (cum == cum.max(axis=0)[None, :])
+        changed = leaders.any(axis=0)
+        last = depth - 1 - np.argmax(leaders[::-1], axis=0)
+        seen = np.maximum.accumulate(np.where(changed, np.arange(width), -1))
+        after = np.where(seen >= 0, last[np.maximum(seen, 0)], winner)
+        before = np.concatenate(([winner], after[:-1]))
+
+        predicted = idx - (before + 1)
+        correct[start:start + width] = (predicted >= 0) & (s[np.maximum(predicted, 0)] == s[idx])
+        scores = cum[:, -1]
+        winner = int(after[-1])
+
+    n = L - 1
+    hits = int(np.count_nonzero(correct))
+    p_global = hits / n
+    p_global = _upper_bound(p_global, n) if hits else 1.0 - 0.01 ** (1.0 / n)
+    p_local = _local_probability(_longest_true_run(correct[1:]) + 1, n)
+    return _bits(max(p_global, p_local, 1.0 / alphabet))
+
+# 3. Évaluation
+
+def _estimate_all(s: np.ndarray, bits: int) -> Dict[str, float]:
+    out = {"most_common_value": most_common_value(s)}
+    t_tuple, lrs = tuple_estimates(s, bits)
+    out["t_tuple"] = t_tuple
+    if lrs is not None:
+        out["lrs"] = lrs
+    out["lag_prediction"] = lag_prediction_estimate(s, 1 << bits)
+    if bits == 1:
+        out["collision"] = collision_estimate(s)
+        out["markov"] = markov_estimate(s)
+    return out
+
+def assess(symbols: np.ndarray, bits: int, assumed: float = 0.0) -> EntropyAssessment:
+    """
+    Min-entropie par symbole (6.1) : minimum des estimateurs sur les
+    symboles et, si bits > 1, sur la chaîne de bits (ramenée par symbole).
+    """
+    symbols = np.ascontiguousarray(symbols, dtype=np.uint8)
+    estimates = _estimate_all(symbols, bits)
+    if bits > 1:
+        for name, h in _estimate_all(to_bitstring(symbols, bits), 1).items():
+            estimates[f"bitstring.{name}"] = bits * h
+    h = min(min(estimates.values()), float(bits))
+    return EntropyAssessment(samples=int(symbols.size), bits_per_symbol=bits, estimates=estimates,
+                             min_entropy=h, assumed=assumed, passed=h >= assumed)
+
+def assess_collector(collector=None, num_samples: int = 1_000_000, bits: int = 8) -> EntropyAssessment:
+    """Évalue num_samples deltas bruts d'un JitterCollector (défaut : k = 32)."""
+    from src_python.modules.entropy_src import JitterCollector, EntropySourceManager
+    collector = collector or JitterCollector()
+    rows = -(-num_samples // collector.k)
+    deltas = collector.sample_batch(rows).ravel()[:num_samples]
+    return assess(jitter_symbols(deltas, bits), bits, assumed=EntropySourceManager.DELTA_MIN_ENTROPY)
@@ -0,0 +1,186 @@
+# Tampon de sortie pré-généré (Prefetch) rempli en arrière-plan
+import threading
+from typing import Callable, Optional, Dict
+
+class PrefetchBuffer:
+    """
+    Réserve bornée d'octets DRBG pré-générés, propre à une instance.
+
+    - Un thread de fond (daemon) remplit la réserve dès que le niveau passe
+      sous le seuil bas (low watermark) : les requêtes ne paient jamais le
+      Lattice, le SHAKE ni les reseeds.
+    - La réserve est UN tampon circulaire préalloué (offset de lecture +
+      niveau) : take(n) fait au plus deux copies de tranche, quel que soit
+      le nombre de remplissages passés (coût O(n) de la seule copie, aucun
+      calcul cryptographique sur le chemin de la requête).
+    - Les octets servis sont effacés (mis à zéro) dans la réserve : aucun
+      octet livré ne reste en mémoire côté RNG.
+    """
+
+    def __init__(self,
+                 refill_fn: Callable[[int], bytearray],
+                 capacity: int = 64 * 1024,
+                 low_watermark: Optional[int] = None):
+        """
+        Args:
+            refill_fn: Produit n octets frais (appelé uniquement par le worker).
+            capacity: Taille maximale de la réserve (octets).
+            low_watermark: Seuil de déclenchement du remplissage (défaut : capacity / 4).
+        """
+        if capacity <= 0:
+            raise ValueError("La capacité du tampon doit être > 0.")
+        self.capacity = capacity
+        self.low_watermark = capacity // 4 if low_watermark is None else min(low_watermark, capacity)
+        self._refill_fn = refill_fn
+
+        # Réserve circulaire : octets valides = [_read, _read + _available) mod capacity
+        self._ring = bytearray(capacity)
+        self._read = 0
+        self._available = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._worker: Optional[threading.Thread] = None
+
+        # Métriques
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.bytes_served = 0
+        self.refill_errors = 0
+
+    # --- Cycle de vie ---
+
+    def start(self):
+        """Démarre le worker de remplissage (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._worker = threading.Thread(target=self._run, name="PrefetchBuffer", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """Arrête le worker et efface la réserve."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self.wipe()
+
+    def reset_after_fork(self):
+        """
+        Enfant après fork() : le worker n'existe plus et la réserve est une
+        copie de celle du parent (octets qu'il peut encore servir). Nouveau
+        verrou, réserve effacée, worker à redémarrer par start().
+        """
+        self._cond = threading.Condition()
+        self._clear()
+        self._running = False
+        self._worker = None
+
+    def wipe(self):
+        """Met à zéro et libère tous les octets en réserve."""
+        with self._cond:
+            self._clear()
+
+    def _clear(self):
+        self._ring[:] = bytes(self.capacity)
+        self._read = 0
+        self._available = 0
+
+    def _segments(self, start: int, length: int):
+        """(début, fin) des au plus deux tranches du tampon circulaire couvrant [start, start + length)."""
+        first = min(length, self.capacity - start)
+        yield start, start + first
+        if first < length:
+            yield 0, length - first
+
+    # --- Chemin de la requête ---
+
+    def take(self, num_bytes: int) -> Optional[bytes]:
+        """
+        Sert num_bytes depuis la réserve.
+        Retourne None (miss) si la réserve ne suffit pas : l'appelant
+        bascule alors sur la génération directe.
+        """
+        with self._cond:
+            if num_bytes > self._available:
+                self.misses += 1
+                self._cond.notify()
+                return None
+
+            with memoryview(self._ring) as ring:
+                if self._read + num_bytes <= self.capacity:
+                    # Cas courant : tranche contiguë, copiée directement dans le résultat
+                    data = bytes(ring[self._read:self._read + num_bytes])
+                else:
+                    out = bytearray(num_bytes)
+                    filled = 0
+                    for start, end in self._segments(self._read, num_bytes):
+                        out[filled:filled + end - start] = ring[start:end]
+                        filled += end - start
+                    data = bytes(out)
+                    # La copie intermédiaire est effacée aussi : seul l'appelant garde la sortie
+                    out[:] = bytes(num_bytes)
+            # Effacement des octets livrés
+            for start, end in self._segments(self._read, num_bytes):
+                self._ring[start:end] = bytes(end - start)
+            self._read = (self._read + num_bytes) % self.capacity
+
+            self._available -= num_bytes
+            self.hits += 1
+            self.bytes_served += num_bytes
+            if self._available < self.low_watermark:
+                self._cond.notify()
+            return data
+
+    # --- Worker ---
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._available >= self.low_watermark:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                needed = self.capacity - self._available
+
+            # Génération hors du verrou du tampon : les hits continuent d'être servis
+            try:
+                fresh = self._refill_fn(needed)
+            except Exception as e:
+                self.refill_errors += 1
+                print(f"[ERREUR PREFETCH] {e}")
+                with self._cond:
+                    self._cond.wait(timeout=0.1)
+                continue
+
+            with self._cond:
+                # Seul le worker ajoute des octets : la place libre n'a fait que croître
+                with memoryview(fresh) as src:
+                    src = src.cast("B")[:needed]
+                    filled = 0
+                    for start, end in self._segments((self._read + self._available) % self.capacity, len(src)):
+                        self._ring[start:end] = src[filled:filled + end - start]
+                        filled += end - start
+                    self._available += len(src)
+                self.refills += 1
+            if isinstance(fresh, bytearray):
+                fresh[:] = bytes(len(fresh))  # la copie du DRBG ne reste pas sur le tas
+
+    # --- Diagnostic ---
+
+    def metrics(self) -> Dict:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "low_watermark": self.low_watermark,
+                "available": self._available,
+                "hits": self.hits,
+                "misses": self.misses,
+                "refills": self.refills,
+                "bytes_served": self.bytes_served,
+                "refill_errors": self.refill_errors,
+            }
@@ -0,0 +1,215 @@
+# Planificateur de reseed hors du chemin des requêtes (état DRBG double-tampon)
+import time
+import threading
+from collections import deque
+from typing import Callable, Optional, Dict, Any
+
+class ReseedPolicy:
+    """
+    Quand déclencher un reseed. Chaque critère vaut None pour être ignoré ;
+    le premier critère atteint l'emporte.
+
+    - max_requests : requêtes DRBG depuis le dernier reseed
+    - max_bytes    : octets produits par le DRBG depuis le dernier reseed
+    - max_age      : secondes écoulées depuis le dernier reseed (même sans trafic)
+    - Événement externe : MobileRNG.add_external_entropy() déclenche toujours
+      un reseed (touch events, capteurs, entropie OS fournie par l'appelant).
+    """
+
+    def __init__(self, max_requests: Optional[int] = 1000, max_bytes: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def reason(self, requests: int, bytes_out: int, age: float) -> Optional[str]:
+        """Retourne le critère atteint ("requests", "bytes", "age") ou None."""
+        if self.max_requests is not None and requests >= self.max_requests:
+            return "requests"
+        if self.max_bytes is not None and bytes_out >= self.max_bytes:
+            return "bytes"
+        if self.max_age is not None and age >= self.max_age:
+            return "age"
+        return None
+
+class ReseedScheduler:
+    """
+    Prépare le prochain état DRBG en arrière-plan puis le bascule d'un coup.
+
+    - record() est appelé après chaque requête DRBG : simple comptage, le
+      chemin de la requête ne fait jamais de collecte d'entropie, de reseed
+      ni d'écriture d'état.
+    - Le worker appelle prepare_fn(entropie externe) HORS verrou DRBG
+      (collecte jitter, nouvel état, jeton de checkpoint), puis
+      commit_fn(préparé) qui échange l'état en une affectation.
+    - La limite dure SP 800-90A (RESEED_INTERVAL) reste gérée par
+      l'appelant en reseed bloquant si le worker n'a pas suivi.
+    - background=False : même politique, reseed exécuté en ligne par record().
+    """
+
+    def __init__(self,
+                 prepare_fn: Callable[[Optional[bytes]], Any],
+                 commit_fn: Callable[[Any], None],
+                 policy: Optional[ReseedPolicy] = None,
+                 background: bool = True):
+        self.policy = policy or ReseedPolicy()
+        self.background = background
+        self._prepare_fn = prepare_fn
+        self._commit_fn = commit_fn
+
+        # Compteurs depuis le dernier reseed
+        self._requests = 0
+        self._bytes = 0
+        self._last_reseed = time.monotonic()
+
+        self._events = deque()  # entropie externe en attente
+        self._triggered = False
+        self._in_flight = False
+        self._cond = threading.Condition()
+        self._running = False
+        self._worker: Optional[threading.Thread] = None
+
+        # Métriques
+        self.scheduled = 0
+        self.completed = 0
+        self.failures = 0
+        self.last_reason: Optional[str] = None
+
+    # --- Cycle de vie ---
+
+    def start(self):
+        """Démarre le worker (idempotent, sans effet si background=False)."""
+        if not self.background:
+            return
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._last_reseed = time.monotonic()
+        self._worker = threading.Thread(target=self._run, name="ReseedScheduler", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def reset_after_fork(self):
+        """Enfant après fork() : nouveau verrou, worker à redémarrer par start()."""
+        self._cond = threading.Condition()
+        self._triggered = False
+        self._in_flight = False
+        self._running = False
+        self._worker = None
+
+    # --- Chemin de la requête ---
+
+    def record(self, num_bytes: int, requests: int = 1):
+        """Comptabilise une requête DRBG ; déclenche un reseed si la politique l'exige."""
+        with self._cond:
+            self._requests += requests
+            self._bytes += num_bytes
+            if self._triggered or self._in_flight:
+                return
+            reason = self.policy.reason(self._requests, self._bytes, time.monotonic() - self._last_reseed)
+            if reason is None:
+                return
+            self._trigger(reason)
+        if not self.background:
+            self._reseed_once()
+
+    def external_event(self, entropy: bytes):
+        """Entropie externe fournie par l'application : reseed dès que possible."""
+        with self._cond:
+            self._events.append(entropy)
+            if not (self._triggered or self._in_flight):
+                self._trigger("external")
+        if not self.background:
+            self._reseed_once()
+
+    def reset(self):
+        """Un reseed vient d'avoir lieu (planifié ou manuel) : compteurs à zéro."""
+        with self._cond:
+            self._requests = 0
+            self._bytes = 0
+            self._last_reseed = time.monotonic()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend qu'aucun reseed ne soit en attente ni en cours (tests, arrêt).
+        Sans worker actif (non démarré, arrêté ou background=False), un
+        reseed en attente ne sera jamais traité : retour immédiat (False).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._in_flight or (self._triggered and self._running):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(timeout=remaining)
+            return not self._triggered
+
+    # --- Worker ---
+
+    def _trigger(self, reason: str):
+        """(sous self._cond)"""
+        self._triggered = True
+        self.scheduled += 1
+        self.last_reason = reason
+        self._cond.notify_all()
+
+    def _reseed_once(self):
+        with self._cond:
+            if not self._triggered:
+                return
+            self._triggered = False
+            self._in_flight = True
+            external = b"".join(self._events) or None
+            self._events.clear()
+        try:
+            # Préparation hors verrou DRBG, bascule atomique dans commit_fn
+            self._commit_fn(self._prepare_fn(external))
+            self.completed += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"[ERREUR RESEED] Reseed planifié : {e}")
+        finally:
+            with self._cond:
+                self._in_flight = False
+                self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._triggered:
+                    timeout = None
+                    if self.policy.max_age is not None:
+                        timeout = self._last_reseed + self.policy.max_age - time.monotonic()
+                        if timeout <= 0:
+                            self._trigger("age")
+                            break
+                    self._cond.wait(timeout=timeout)
+                if not self._running:
+                    return
+            self._reseed_once()
+
+    def metrics(self) -> Dict:
+        with self._cond:
+            return {
+                "policy": {
+                    "max_requests": self.policy.max_requests,
+                    "max_bytes": self.policy.max_bytes,
+                    "max_age": self.policy.max_age,
+                },
+                "background": self.background,
+                "requests_since_reseed": self._requests,
+                "bytes_since_reseed": self._bytes,
+                "scheduled": self.scheduled,
+                "completed": self.completed,
+                "failures": self.failures,
+                "last_reason": self.last_reason,
+                "in_flight": self._in_flight or self._triggered,
+            }
@@ -0,0 +1,690 @@
+# Batterie statistique SP 800-22 vectorisée (validation de gros volumes de sortie DRBG)
+#
+# Méthodologie NIST : la sortie est découpée en séquences de n bits, chaque
+# test produit une p-valeur par séquence, puis le rapport vérifie la
+# proportion de séquences acceptées et l'uniformité des p-valeurs.
+#
+# Les séquences sont traitées par blocs (matrice NumPy : une ligne par
+# séquence) : chaque test est calculé pour toutes les lignes d'un coup,
+# la mémoire reste bornée par la taille d'un bloc.
+#
+# Usage :
+#   python -m src_python.modules.stat_battery --file sortie.bin
+#   python -m src_python.modules.stat_battery --rng --bytes 1G --workers 4
+#   python -m src_python.modules.stat_battery --rng --bytes 256M --entropy 1000000 --json rapport.json
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Seuil de décision des tests (SP 800-22, 4.2.1)
+ALPHA = 0.01
+# Seuil d'uniformité des p-valeurs (SP 800-22, 4.2.2)
+UNIFORMITY_ALPHA = 0.0001
+# Nombre minimal de séquences pour le test d'uniformité
+MIN_SEQUENCES_UNIFORMITY = 55
+
+DEFAULT_SEQUENCE_BITS = 1_000_000
+DEFAULT_SEQUENCES_PER_BLOCK = 64
+
+TESTS = ("frequency", "block_frequency", "runs", "longest_run", "serial",
+         "approximate_entropy", "cumulative_sums")
+
+# Longest Run of Ones (SP 800-22, 2.4.2) : taille de bloc M -> (bornes des classes, probabilités)
+# (probabilités exactes de l'implémentation de référence sts pour M = 8 et 128)
+LONGEST_RUN_TABLES = {
+    8: ((1, 4), (0.21484375, 0.3671875, 0.23046875, 0.1875)),
+    128: ((4, 9), (0.1174035788, 0.242955959, 0.249363483, 0.17517706, 0.102701071, 0.112398847)),
+    10000: ((10, 16), (0.0882, 0.2092, 0.2483, 0.1933, 0.1208, 0.0675, 0.0727)),
+}
+
+# 1. Fonctions spéciales (sans SciPy)
+
+def igamc(a: float, x: float) -> float:
+    """Fonction gamma incomplète supérieure régularisée Q(a, x)."""
+    if x <= 0.0:
+        return 1.0
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1.0:
+        # Série de P(a, x), puis Q = 1 - P
+        ap, term = a, 1.0 / a
+        total = term
+        for _ in range(100000):
+            ap += 1.0
+            term *= x / ap
+            total += term
+            if term < total * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # Fraction continue de Q(a, x) (Lentz modifié)
+    tiny = 1e-300
+    b = x + 1.0 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    for i in range(1, 100000):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        d = d if abs(d) > tiny else tiny
+        c = b + an / c
+        c = c if abs(c) > tiny else tiny
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+_igamc = np.frompyfunc(igamc, 2, 1)
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+def _vigamc(a, x) -> np.ndarray:
+    return _igamc(a, x).astype(np.float64)
+
+def _verfc(x) -> np.ndarray:
+    return _erfc(x).astype(np.float64)
+
+def _normal_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * _verfc(-np.asarray(x, dtype=np.float64) / math.sqrt(2.0))
+
+# 2. Tables par octet (bits lus du poids fort au poids faible, comme np.unpackbits)
+
+def _byte_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    ones = np.zeros(256, dtype=np.uint8)
+    prefix_max = np.zeros(256, dtype=np.int8)
+    prefix_min = np.zeros(256, dtype=np.int8)
+    for value in range(256):
+        s = hi = lo = 0
+        for bit in range(7, -1, -1):
+            s += 1 if (value >> bit) & 1 else -1
+            hi, lo = max(hi, s), min(lo, s)
+        ones[value] = bin(value).count("1")
+        prefix_max[value], prefix_min[value] = hi, lo
+    return ones, prefix_max, prefix_min
+
+_POPCOUNT, _PREFIX_MAX, _PREFIX_MIN = _byte_tables()
+
+def _word_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mêmes tables pour des mots de 16 bits (octet de poids fort lu en premier)."""
+    hi, lo = np.divmod(np.arange(1 << 16), 256)
+    step = 2 * _POPCOUNT.astype(np.int32) - 8
+    steps = (step[hi] + step[lo]).astype(np.int8)
+    highest = np.maximum(_PREFIX_MAX[hi], step[hi] + _PREFIX_MAX[lo]).astype(np.int8)
+    lowest = np.minimum(_PREFIX_MIN[hi], step[hi] + _PREFIX_MIN[lo]).astype(np.int8)
+    return steps, highest, lowest
+
+_WORD_STEPS, _WORD_MAX, _WORD_MIN = _word_tables()
+
+def _popcount(data: np.ndarray) -> np.ndarray:
+    """Nombre de bits à 1 de chaque octet (uint8)."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(data)
+    return _POPCOUNT[data]
+
+# 3. Tests SP 800-22 (une ligne = une séquence ; retour : une p-valeur par ligne)
+
+def frequency_test(ones: np.ndarray, n: int) -> np.ndarray:
+    """2.1 Frequency (Monobit)."""
+    s = 2.0 * ones - n
+    return _verfc(np.abs(s) / math.sqrt(2.0 * n))
+
+def block_frequency_test(byte_ones: np.ndarray, block_bits: int) -> np.ndarray:
+    """2.2 Frequency Test within a Block."""
+    block_bytes = block_bits // 8
+    num_blocks = byte_ones.shape[1] // block_bytes
+    blocks = byte_ones[:, :num_blocks * block_bytes].reshape(byte_ones.shape[0], num_blocks, block_bytes)
+    pi = blocks.sum(axis=2, dtype=np.int64) / block_bits
+    chi2 = 4.0 * block_bits * np.sum((pi - 0.5) ** 2, axis=1)
+    return _vigamc(num_blocks / 2.0, chi2 / 2.0)
+
+def runs_test(data: np.ndarray, ones: np.ndarray, n: int) -> np.ndarray:
+    """2.3 Runs : nombre de transitions entre bits consécutifs (octets voisins compris)."""
+    previous = np.zeros_like(data)
+    previous[:, 1:] = data[:, :-1]
+    transitions = data ^ ((data >> 1) | (previous << 7))
+    transitions[:, 0] &= 0x7F  # pas de bit avant le premier
+    v_obs = _popcount(transitions).sum(axis=1, dtype=np.int64) + 1
+
+    pi = ones / n
+    spread = pi * (1.0 - pi)
+    p = _verfc(np.abs(v_obs - 2.0 * n * spread) / np.maximum(2.0 * math.sqrt(2.0 * n) * spread, 1e-300))
+    # Prérequis du test : fréquence acceptable, sinon p = 0
+    p[np.abs(pi - 0.5) >= 2.0 / math.sqrt(n)] = 0.0
+    return p
+
+def _shift_left(words: np.ndarray, bits: int) -> np.ndarray:
+    """Décale chaque ligne de mots uint64 de 'bits' (< 64) positions vers le début du bloc."""
+    out = words << np.uint64(bits)
+    out[:, :-1] |= words[:, 1:] >> np.uint64(64 - bits)
+    return out
+
+def _longest_run_classes(data: np.ndarray, block_bits: int, low: int, high: int) -> np.ndarray:
+    """
+    Plus longue série de 1 de chaque bloc, bornée à [low, high] (seules les
+    classes du test comptent).
+
+    Chaque bloc est vu comme une suite de mots uint64 gros-boutistes (dans
+    l'ordre des bits). A_L marque les positions où commence une série d'au
+    moins L uns : A_{a+b} = A_a & (A_b << a). On obtient A_low par
+    doublements, puis A_{L+1} = A_L & (A_L << 1) jusqu'à high, en retirant
+    les blocs épuisés au fur et à mesure.
+    """
+    rows = data.shape[0]
+    block_bytes = block_bits // 8
+    num_blocks = data.shape[1] // block_bytes
+    word_bytes = -(-block_bytes // 8) * 8
+    padded = np.zeros((rows * num_blocks, word_bytes), dtype=np.uint8)
+    padded[:, :block_bytes] = data[:, :num_blocks * block_bytes].reshape(-1, block_bytes)
+    runs = padded.view(">u8").astype(np.uint64)  # A_1
+
+    # 1. A_low par décomposition binaire de low
+    acc, acc_len, power, power_len = None, 0, runs, 1
+    remaining = low
+    while remaining:
+        if remaining & 1:
+            acc = power if acc is None else acc & _shift_left(power, acc_len)
+            acc_len += power_len
+        remaining >>= 1
+        if remaining:
+            power = power & _shift_left(power, power_len)
+            power_len *= 2
+
+    # 2. Pas unitaires de low à high sur les blocs encore actifs
+    longest = np.full(rows * num_blocks, low, dtype=np.int64)
+    ids = np.flatnonzero(acc.any(axis=1))
+    words = acc[ids]
+    length = low
+    while ids.size and length < high:
+        words = words & _shift_left(words, 1)
+        alive = words.any(axis=1)
+        ids, words = ids[alive], words[alive]
+        length += 1
+        longest[ids] = length
+    return longest.reshape(rows, num_blocks)
+
+def longest_run_test(data: np.ndarray, block_bits: int) -> np.ndarray:
+    """2.4 Test for the Longest Run of Ones in a Block."""
+    (low, high), probabilities = LONGEST_RUN_TABLES[block_bits]
+    classes = _longest_run_classes(data, block_bits, low, high) - low
+    k = len(probabilities) - 1
+    counts = np.zeros((data.shape[0], k + 1), dtype=np.int64)
+    for c in range(k + 1):
+        counts[:, c] = np.count_nonzero(classes == c, axis=1)
+    num_blocks = classes.shape[1]
+    expected = num_blocks * np.asarray(probabilities)
+    chi2 = np.sum((counts - expected) ** 2 / expected, axis=1)
+    return _vigamc(k / 2.0, chi2 / 2.0)
+
+def pattern_counts(data: np.ndarray, m: int) -> np.ndarray:
+    """
+    Occurrences des motifs de m bits (m <= 17) à chaque position, avec
+    recouvrement et bouclage (les m-1 premiers bits sont ajoutés à la fin).
+
+    Chaque octet j donne une fenêtre de 24 bits (octets j, j+1, j+2) d'où
+    l'on extrait les motifs commençant aux 8 positions de l'octet. Le
+    comptage se fait ligne par ligne (un bincount pour les 8 positions) :
+    la table de 2^m compteurs reste en cache.
+    """
+    if not 1 <= m <= 17:
+        raise ValueError("Longueur de motif hors limites (1..17).")
+    rows, cols = data.shape
+    mask = (1 << m) - 1
+    counts = np.empty((rows, 1 << m), dtype=np.int64)
+    ext = np.empty(cols + 2, dtype=np.intp)
+    codes = np.empty((8, cols), dtype=np.intp)
+    for r in range(rows):
+        ext[:cols] = data[r]
+        ext[cols:] = data[r, :2]
+        windows = (ext[:-2] << 16) | (ext[1:-1] << 8) | ext[2:]
+        for k in range(8):
+            np.right_shift(windows, 24 - m - k, out=codes[k])
+        np.bitwise_and(codes, mask, out=codes)
+        counts[r] = np.bincount(codes.ravel(), minlength=1 << m)
+    return counts
+
+def marginal_counts(counts: np.ndarray, m: int) -> Dict[int, np.ndarray]:
+    """
+    Comptes des motifs de m, m-1, ..., 1 bits déduits des comptes de motifs
+    de m bits (avec bouclage, chaque motif court prolonge exactement un long).
+    """
+    out = {m: counts}
+    for length in range(m - 1, 0, -1):
+        longer = out[length + 1]
+        out[length] = longer.reshape(longer.shape[0], -1, 2).sum(axis=2)
+    return out
+
+def _psi2(marginals: Dict[int, np.ndarray], m: int, n: int) -> np.ndarray:
+    if m <= 0:
+        return np.zeros(next(iter(marginals.values())).shape[0])
+    c = marginals[m]
+    return (1 << m) / n * np.einsum("ij,ij->i", c, c).astype(np.float64) - n
+
+def serial_test(marginals: Dict[int, np.ndarray], m: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """2.11 Serial : deux p-valeurs (∇ψ² et ∇²ψ²)."""
+    psi_m, psi_m1, psi_m2 = _psi2(marginals, m, n), _psi2(marginals, m - 1, n), _psi2(marginals, m - 2, n)
+    p1 = _vigamc(2.0 ** (m - 2), (psi_m - psi_m1) / 2.0)
+    p2 = _vigamc(2.0 ** (m - 3), (psi_m - 2.0 * psi_m1 + psi_m2) / 2.0)
+    return p1, p2
+
+def _phi(marginals: Dict[int, np.ndarray], m: int, n: int) -> np.ndarray:
+    c = marginals[m] / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sum(np.where(c > 0, c * np.log(c), 0.0), axis=1)
+
+def approximate_entropy_test(marginals: Dict[int, np.ndarray], m: int, n: int) -> np.ndarray:
+    """2.12 Approximate Entropy."""
+    apen = _phi(marginals, m, n) - _phi(marginals, m + 1, n)
+    chi2 = 2.0 * n * (math.log(2.0) - apen)
+    return _vigamc(2.0 ** (m - 1), chi2 / 2.0)
+
+def _cusum_p_value(z: int, n: int) -> float:
+    if z == 0:
+        return 1.0
+    sqrt_n = math.sqrt(n)
+    # Au-delà de |x| = 40, Φ(x) vaut 0 ou 1 en double précision : termes nuls
+    k_cap = int(40.0 * sqrt_n / (4.0 * z)) + 2
+    k1 = np.arange(max(int((-n / z + 1) / 4), -k_cap), min(int((n / z - 1) / 4), k_cap) + 1)
+    k2 = np.arange(max(int((-n / z - 3) / 4), -k_cap), min(int((n / z - 1) / 4), k_cap) + 1)
+    s1 = np.sum(_normal_cdf((4 * k1 + 1) * z / sqrt_n) - _normal_cdf((4 * k1 - 1) * z / sqrt_n))
+    s2 = np.sum(_normal_cdf((4 * k2 + 3) * z / sqrt_n) - _normal_cdf((4 * k2 + 1) * z / sqrt_n))
+    return min(1.0, max(0.0, 1.0 - s1 + s2))
+
+def cumulative_sums_test(data: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    2.13 Cumulative Sums, modes avant et arrière.
+
+    Les extrêmes des sommes partielles S_k (k = 0..n) suffisent :
+    avant z = max|S_k|, arrière z = max|S_n - S_k|. Calcul par mots de
+    16 bits : S au début de chaque mot + extrêmes à l'intérieur du mot (tables).
+    """
+    words = data.view(">u2")
+    steps = _WORD_STEPS[words]
+    starts = np.cumsum(steps, axis=1, dtype=np.int32)
+    total = starts[:, -1].astype(np.int64)
+    starts -= steps  # S au début de chaque mot
+    highest = np.max(starts + _WORD_MAX[words], axis=1).astype(np.int64)
+    lowest = np.min(starts + _WORD_MIN[words], axis=1).astype(np.int64)
+    forward = np.maximum(highest, -lowest)
+    backward = np.maximum(total - lowest, highest - total)
+    return (np.array([_cusum_p_value(int(z), n) for z in forward]),
+            np.array([_cusum_p_value(int(z), n) for z in backward]))
+
+# 4. La batterie
+
+class StatBattery:
+    """
+    Tests SP 800-22 sur des blocs de séquences.
+
+    Paramètres par défaut de SP 800-22 (section 2) pour n = 10^6 bits :
+    blocs de 128 bits (Block Frequency), m = 16 (Serial), m = 10
+    (Approximate Entropy) ; la taille de bloc du Longest Run dépend de n.
+    """
+
+    def __init__(self, sequence_bits: int = DEFAULT_SEQUENCE_BITS, block_frequency_bits: int = 128,
+                 serial_m: int = 16, apen_m: int = 10, tests: Sequence[str] = TESTS):
+        if sequence_bits % 64 or sequence_bits < 1024:
+            raise ValueError("sequence_bits doit être un multiple de 64 et >= 1024.")
+        unknown = set(tests) - set(TESTS)
+        if unknown:
+            raise ValueError(f"Tests inconnus : {sorted(unknown)} (disponibles : {TESTS})")
+        if block_frequency_bits % 8:
+            raise ValueError("block_frequency_bits doit être un multiple de 8.")
+        log_n = int(math.log2(sequence_bits))
+        if not 2 <= serial_m < log_n - 2 or not 1 <= apen_m < log_n - 5:
+            raise ValueError(f"Paramètres m trop grands pour n = {sequence_bits}.")
+        if max(serial_m, apen_m + 1) > 17:
+            raise ValueError("Motifs limités à 17 bits.")
+
+        self.sequence_bits = sequence_bits
+        self.sequence_bytes = sequence_bits // 8
+        self.block_frequency_bits = block_frequency_bits
+        self.longest_run_bits = 8 if sequence_bits < 6272 else 128 if sequence_bits < 750000 else 10000
+        self.serial_m = serial_m
+        self.apen_m = apen_m
+        self.tests = tuple(tests)
+
+    def result_names(self) -> List[str]:
+        """Une entrée par p-valeur produite (Serial et Cumulative Sums en donnent deux)."""
+        names = []
+        for test in self.tests:
+            if test == "serial":
+                names += ["serial_1", "serial_2"]
+            elif test == "cumulative_sums":
+                names += ["cumulative_sums_forward", "cumulative_sums_backward"]
+            else:
+                names.append(test)
+        return names
+
+    def run_block(self, data: np.ndarray, timings: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Teste un bloc de séquences.
+
+        Args:
+            data: matrice uint8 (une ligne de sequence_bytes octets par séquence).
+            timings: si fourni, reçoit le temps cumulé de chaque test (secondes).
+
+        Returns:
+            {nom: p-valeurs (une par séquence)}
+        """
+        data = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1, self.sequence_bytes)
+        n = self.sequence_bits
+        timings = {} if timings is None else timings
+        results: Dict[str, np.ndarray] = {}
+        clock = time.perf_counter
+
+        t0 = clock()
+        byte_ones = _popcount(data)
+        ones = byte_ones.sum(axis=1, dtype=np.int64)
+        timings["popcount"] = timings.get("popcount", 0.0) + clock() - t0
+
+        def timed(test: str, func, *args):
+            t = clock()
+            out = func(*args)
+            timings[test] = timings.get(test, 0.0) + clock() - t
+            return out
+
+        if "frequency" in self.tests:
+            results["frequency"] = timed("frequency", frequency_test, ones, n)
+        if "block_frequency" in self.tests:
+            results["block_frequency"] = timed("block_frequency", block_frequency_test,
+                                               byte_ones, self.block_frequency_bits)
+        if "runs" in self.tests:
+            results["runs"] = timed("runs", runs_test, data, ones, n)
+        if "longest_run" in self.tests:
+            results["longest_run"] = timed("longest_run", longest_run_test, data, self.longest_run_bits)
+        if "serial" in self.tests or "approximate_entropy" in self.tests:
+            # Un seul comptage de motifs pour les deux tests (marginales pour m-1, m-2...)
+            m = max(self.serial_m, self.apen_m + 1)
+            marginals = timed("pattern_counts", lambda: marginal_counts(pattern_counts(data, m), m))
+            if "serial" in self.tests:
+                results["serial_1"], results["serial_2"] = timed("serial", serial_test, marginals, self.serial_m, n)
+            if "approximate_entropy" in self.tests:
+                results["approximate_entropy"] = timed("approximate_entropy", approximate_entropy_test,
+                                                       marginals, self.apen_m, n)
+        if "cumulative_sums" in self.tests:
+            forward, backward = timed("cumulative_sums", cumulative_sums_test, data, n)
+            results["cumulative_sums_forward"], results["cumulative_sums_backward"] = forward, backward
+        return results
+
+class BatteryResults:
+    """
+    Synthèse SP 800-22 (4.2) en mémoire constante : pour chaque p-valeur,
+    seuls le nombre de séquences acceptées et l'histogramme en 10 classes
+    (test d'uniformité) sont conservés.
+    """
+
+    def __init__(self, battery: StatBattery):
+        self.battery = battery
+        self.accepted = {name: 0 for name in battery.result_names()}
+        self.histograms = {name: np.zeros(10, dtype=np.int64) for name in battery.result_names()}
+        self.sequences = 0
+        self.timings: Dict[str, float] = {}
+        self.wall_seconds = 0.0
+
+    def add(self, block_results: Dict[str, np.ndarray], timings: Optional[Dict[str, float]] = None):
+        for name, values in block_results.items():
+            self.accepted[name] += int(np.count_nonzero(values >= ALPHA))
+            self.histograms[name] += np.bincount(np.minimum((values * 10).astype(np.int64), 9), minlength=10)
+        self.sequences += len(next(iter(block_results.values()), ()))
+        for test, seconds in (timings or {}).items():
+            self.timings[test] = self.timings.get(test, 0.0) + seconds
+
+    def summary(self) -> Dict[str, Dict]:
+        out = {}
+        m = self.sequences
+        p_hat = 1.0 - ALPHA
+        min_proportion = p_hat - 3.0 * math.sqrt(p_hat * ALPHA / m) if m else 1.0
+        for name in self.accepted:
+            proportion = self.accepted[name] / m if m else 0.0
+            uniformity = None
+            if m >= MIN_SEQUENCES_UNIFORMITY:
+                chi2 = float(np.sum((self.histograms[name] - m / 10.0) ** 2 / (m / 10.0)))
+                uniformity = igamc(4.5, chi2 / 2.0)
+            passed = m > 0 and proportion >= min_proportion and (uniformity is None or uniformity >= UNIFORMITY_ALPHA)
+            out[name] = {"sequences": m, "proportion": proportion, "min_proportion": min_proportion,
+                         "uniformity_p": uniformity, "histogram": self.histograms[name].tolist(),
+                         "passed": passed}
+        return out
+
+    def report(self) -> Dict:
+        tested = self.sequences * self.battery.sequence_bytes
+        # "source" = lecture du fichier ou génération DRBG, hors temps de test
+        test_seconds = sum(sec for test, sec in self.timings.items() if test != "source")
+        mib = tested / (1024 * 1024)
+        tests = self.summary()
+        return {
+            "sequence_bits": self.battery.sequence_bits,
+            "sequences": self.sequences,
+            "bytes": tested,
+            "test_seconds": test_seconds,
+            "wall_seconds": self.wall_seconds,
+            "mb_s_per_core": mib / test_seconds if test_seconds else 0.0,
+            "mb_s": mib / self.wall_seconds if self.wall_seconds else 0.0,
+            "stage_mb_s": {test: mib / sec for test, sec in self.timings.items() if sec},
+            "tests": tests,
+            "passed": bool(tests) and all(t["passed"] for t in tests.values()),
+        }
+
+class StreamingBattery:
+    """
+    Interface en flux : update() accepte des morceaux de taille quelconque
+    (sortie de MobileRNG.generate, lecture de fichier...) et teste chaque
+    bloc complet. Mémoire bornée par un bloc de séquences.
+    """
+
+    def __init__(self, battery: Optional[StatBattery] = None,
+                 sequences_per_block: int = DEFAULT_SEQUENCES_PER_BLOCK):
+        self.battery = battery or StatBattery()
+        self.results = BatteryResults(self.battery)
+        self._block = np.empty(sequences_per_block * self.battery.sequence_bytes, dtype=np.uint8)
+        self._fill = 0
+        self._started = time.perf_counter()
+
+    def update(self, data) -> None:
+        src = np.frombuffer(memoryview(data).cast("B"), dtype=np.uint8)
+        pos = 0
+        while pos < src.size:
+            take = min(src.size - pos, self._block.size - self._fill)
+            self._block[self._fill:self._fill + take] = src[pos:pos + take]
+            self._fill += take
+            pos += take
+            if self._fill == self._block.size:
+                self._run(self._block)
+                self._fill = 0
+
+    def _run(self, block: np.ndarray):
+        timings: Dict[str, float] = {}
+        res = self.battery.run_block(block.reshape(-1, self.battery.sequence_bytes), timings)
+        self.results.add(res, timings)
+
+    def finish(self) -> Dict:
+        """Teste les séquences complètes restantes (le reliquat < 1 séquence est ignoré)."""
+        complete = self._fill - self._fill % self.battery.sequence_bytes
+        if complete:
+            self._run(self._block[:complete])
+        self._fill = 0
+        self.results.wall_seconds = time.perf_counter() - self._started
+        return self.results.report()
+
+# 5. Exécution parallèle (un bloc de séquences par tâche)
+
+_WORKER_BATTERY: Optional[StatBattery] = None
+_WORKER_CORE = None
+
+def _init_worker(battery: StatBattery, engine: Optional[str]):
+    global _WORKER_BATTERY, _WORKER_CORE
+    _WORKER_BATTERY = battery
+    if engine is not None:
+        from src_python.core.engines import create_engine
+        _WORKER_CORE = create_engine(engine)
+
+def _release_worker():
+    """Chemin en processus (workers=1) : efface le DRBG et oublie les globales du worker."""
+    global _WORKER_BATTERY, _WORKER_CORE
+    if _WORKER_CORE is not None:
+        _WORKER_CORE.wipe()
+    _WORKER_BATTERY = None
+    _WORKER_CORE = None
+
+def _read_block(path: str, offset: int, length: int) -> np.ndarray:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return np.frombuffer(f.read(length), dtype=np.uint8)
+
+def _generate_block(parent_seed: bytes, index: int, length: int) -> np.ndarray:
+    """Même flux que BulkGenerator (bloc i = DRBG instancié avec derive_chunk_seed(seed, i))."""
+    from src_python.api.bulk import derive_chunk_seed
+    _WORKER_CORE.instantiate(derive_chunk_seed(parent_seed, index))
+    return np.frombuffer(_WORKER_CORE.generate_bulk(length), dtype=np.uint8)
+
+def _test_task(source: Tuple, index: int, offset: int, length: int) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+    kind, arg = source
+    t0 = time.perf_counter()
+    data = _read_block(arg, offset, length) if kind == "file" else _generate_block(arg, index, length)
+    timings = {"source": time.perf_counter() - t0}
+    res = _WORKER_BATTERY.run_block(data[:length - length % _WORKER_BATTERY.sequence_bytes], timings)
+    return res, timings
+
+def run_battery(num_bytes: int, path: Optional[str] = None, seed: Optional[bytes] = None,
+                battery: Optional[StatBattery] = None, workers: Optional[int] = None,
+                sequences_per_block: int = DEFAULT_SEQUENCES_PER_BLOCK, engine: Optional[str] = None) -> Dict:
+    """
+    Teste num_bytes octets d'un fichier (path) ou du flux BulkGenerator(seed).
+
+    Chaque tâche lit/génère puis teste un bloc de séquences dans un processus
+    worker ; au plus 2*workers blocs en vol (mémoire constante). workers=1
+    exécute tout dans le processus courant.
+    """
+    battery = battery or StatBattery()
+    if (path is None) == (seed is None):
+        raise ValueError("Il faut soit un fichier (path), soit une seed (flux DRBG).")
+    if path is not None:
+        num_bytes = min(num_bytes, os.path.getsize(path))
+        source = ("file", path)
+    else:
+        from src_python.core.engines import resolve_engine_name
+        engine = resolve_engine_name(engine)
+        source = ("rng", seed)
+    block_bytes = sequences_per_block * battery.sequence_bytes
+    tasks = [(i, off, min(block_bytes, num_bytes - off))
+             for i, off in enumerate(range(0, num_bytes, block_bytes))]
+    tasks = [t for t in tasks if t[2] >= battery.sequence_bytes]
+
+    results = BatteryResults(battery)
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    engine_arg = engine if path is None else None
+    if workers == 1:
+        _init_worker(battery, engine_arg)
+        try:
+            for index, offset, length in tasks:
+                results.add(*_test_task(source, index, offset, length))
+        finally:
+            _release_worker()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(battery, engine_arg)) as pool:
+            in_flight = deque()
+            for index, offset, length in tasks:
+                in_flight.append(pool.submit(_test_task, source, index, offset, length))
+                if len(in_flight) >= 2 * workers:
+                    results.add(*in_flight.popleft().result())
+            while in_flight:
+                results.add(*in_flight.popleft().result())
+    results.wall_seconds = time.perf_counter() - started
+
+    report = results.report()
+    report["workers"] = workers
+    report["source"] = path if path is not None else f"bulk:{engine}"
+    return report
+
+# 6. Rapport texte et ligne de commande
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Séquences : {report['sequences']} x {report['sequence_bits']} bits "
+        f"({report['bytes'] / (1024 * 1024):.1f} Mio, source {report.get('source', 'flux')})",
+        f"Débit     : {report['mb_s']:.1f} Mio/s ({report['mb_s_per_core']:.1f} Mio/s par cœur de test, "
+        f"{report.get('workers', 1)} worker(s))",
+        "Étapes    : " + ", ".join(f"{test} {rate:.0f}" for test, rate in report["stage_mb_s"].items()) + " (Mio/s)",
+        "",
+        f"{'Test':<28}{'Proportion':>12}{'Min':>10}{'Uniformité':>12}  Verdict",
+    ]
+    for name, t in report["tests"].items():
+        uniformity = "n/a" if t["uniformity_p"] is None else f"{t['uniformity_p']:.4f}"
+        lines.append(f"{name:<28}{t['proportion']:>12.4f}{t['min_proportion']:>10.4f}{uniformity:>12}  "
+                     f"{'OK' if t['passed'] else 'ÉCHEC'}")
+    entropy = report.get("entropy")
+    if entropy:
+        lines += ["", f"SP 800-90B ({entropy['samples']} deltas de jitter, symboles de "
+                      f"{entropy['bits_per_symbol']} bits) :"]
+        for name, h in entropy["estimates"].items():
+            lines.append(f"  {name:<28}{h:>8.4f} bits/symbole")
+        lines.append(f"  {'min-entropie retenue':<28}{entropy['min_entropy']:>8.4f} bits/symbole "
+                     f"(hypothèse des tests de santé : {entropy['assumed']}) "
+                     f"{'OK' if entropy['passed'] else 'ÉCHEC'}")
+    lines += ["", "RÉSULTAT : " + ("OK" if report["passed"] else "ÉCHEC")]
+    return "\n".join(lines)
+
+def _parse_size(text: str) -> int:
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B").rstrip("I")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validation statistique (SP 800-22 / SP 800-90B).")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="Fichier binaire à tester")
+    source.add_argument("--rng", action="store_true", help="Tester le flux DRBG (comme BulkGenerator)")
+    parser.add_argument("--bytes", default="128M", help="Volume à tester (ex. 512M, 4G)")
+    parser.add_argument("--seed", default=None, help="Seed hexadécimale du flux --rng (défaut : MobileRNG)")
+    parser.add_argument("--engine", default=None, help="Moteur DRBG du flux --rng (défaut : RNG_ENGINE ou dense)")
+    parser.add_argument("--workers", type=int, default=None, help="Processus de test (défaut : nb de CPU)")
+    parser.add_argument("--sequence-bits", type=int, default=DEFAULT_SEQUENCE_BITS)
+    parser.add_argument("--tests", default=",".join(TESTS), help="Tests SP 800-22 (liste séparée par des virgules)")
+    parser.add_argument("--entropy", type=int, default=0, metavar="N",
+                        help="Estimateurs SP 800-90B sur N deltas bruts de JitterCollector")
+    parser.add_argument("--json", default=None, help="Écrire le rapport JSON dans ce fichier")
+    args = parser.parse_args(argv)
+
+    num_bytes = _parse_size(args.bytes)
+    battery = StatBattery(sequence_bits=args.sequence_bits, tests=[t for t in args.tests.split(",") if t])
+    if args.file:
+        report = run_battery(num_bytes, path=args.file, battery=battery, workers=args.workers)
+    else:
+        if args.seed is not None:
+            seed = bytes.fromhex(args.seed)
+        else:
+            from src_python.api.bulk import WORKER_SEED_BYTES
+            from src_python.api.mobile_rng import MobileRNG
+            rng = MobileRNG(engine=args.engine)
+            seed, status = rng.generate(WORKER_SEED_BYTES) if rng.initialize() else (b"", -1)
+            rng.close()
+            if status != 0:
+                print(f"[ERREUR] MobileRNG indisponible (statut {status}).")
+                return 2
+        report = run_battery(num_bytes, seed=seed, battery=battery, workers=args.workers, engine=args.engine)
+
+    if args.entropy:
+        from src_python.modules.min_entropy import assess_collector
+        report["entropy"] = assess_collector(num_samples=args.entropy).as_dict()
+        report["passed"] = report["passed"] and report["entropy"]["passed"]
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["passed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,61 +1,122 @@
 # Simulation TEE/Secure Storage + Entropie Système + Entropie Utilisateur
 import os
-import json
 import time
-from src_python.utils.converters import bytes_le_to_int, int_to_bytes_le
+import atexit
+from typing import Optional
+
+from src_python.modules.state_storage import (
+    StateBackend, FileStateBackend, CoalescingWriter, StateRecordError,
+    pack_record, unpack_record, RECORD_MAGIC, DEFAULT_DEVICE_KEY
+)
+from src_python.utils.metrics import METRICS
 
 class StateManager:
     """
     Simule une zone de stockage sécurisée (TEE/Secure Element).
     Rôle : Sauvegarder l'état du DRBG pour la persistance entre redémarrages.
+
+    Format : enregistrement binaire fixe authentifié (HMAC), écrit de manière
+    atomique via un backend interchangeable (fichier, mémoire...).
+    Les anciens fichiers JSON (secure_state.json) restent lisibles.
     """
-    
-    def __init__(self, filename="secure_state.json"):
+
+    def __init__(self, filename: str = "secure_state.bin", backend: Optional[StateBackend] = None,
+                 device_key: bytes = DEFAULT_DEVICE_KEY, fsync: bool = False,
+                 coalesce_interval: float = 0.0, background: bool = False,
+                 legacy_filename: Optional[str] = None):
+        """
+        Args:
+            filename: Fichier d'état (ignoré si un backend est fourni).
+            backend: Backend de stockage (défaut : FileStateBackend(filename)).
+            device_key: Clé du MAC (simule la clé scellée du TEE).
+            fsync: Force la persistance disque à chaque écriture.
+            coalesce_interval: Au plus une écriture par intervalle (secondes).
+            background: Écritures sur un thread dédié (hors du chemin appelant).
+            legacy_filename: Ancien état JSON à relire si aucun état binaire
+                             n'existe (défaut : même nom en .json).
+        """
         self.filename = filename
+        self.backend = backend or FileStateBackend(filename, fsync=fsync)
+        self.device_key = device_key
+        if legacy_filename is None:
+            legacy_filename = os.path.splitext(filename)[0] + ".json"
+        self.legacy_filename = legacy_filename
+        self.writer = CoalescingWriter(self.backend, coalesce_interval, background)
         self.in_memory_state = {}
+        # Les écritures en attente (coalescence) sont vidées à la sortie
+        if coalesce_interval > 0 or background:
+            atexit.register(self.writer.close)
 
     def save_state(self, seed: bytes, reseed_counter: int):
         """
         Écrit l'état de manière atomique (simule une écriture Flash sécurisée).
+        Avec coalescence ou écriture de fond, l'appel ne fait que déposer
+        l'enregistrement : seul le plus récent sera écrit.
         """
-        state_data = {
-            "seed_hex": seed.hex(),
-            "reseed_counter": reseed_counter,
-            "timestamp": time.time(),
-            "checksum": self._compute_checksum(seed, reseed_counter)
-        }
-        
-        # Simulation d'écriture sécurisée (Sealing)
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(state_data, f, indent=4)
-        except IOError as e:
-            print(f"[ERREUR TEE] Échec sauvegarde état: {e}")
+        with METRICS.timer("state.save"):
+            timestamp = time.time()
+            record = pack_record(seed, reseed_counter, timestamp, self.device_key)
+            self.in_memory_state = {"reseed_counter": reseed_counter, "timestamp": timestamp}
+            self.writer.submit(record)
+
+    def flush(self):
+        """Force l'écriture de l'état en attente."""
+        self.writer.flush()
+
+    def reset_after_fork(self):
+        """Enfant après fork() : l'écrivain repart de zéro, thread relancé au premier save_state()."""
+        self.writer.reset_after_fork()
+
+    def close(self):
+        """Vide l'attente et arrête le thread d'écriture."""
+        atexit.unregister(self.writer.close)
+        self.writer.close()
 
     def load_state(self):
         """
         Charge l'état au démarrage. Retourne (seed, counter) ou (None, 0) si vide.
         """
-        if not os.path.exists(self.filename):
-            return None, 0
-            
+        with METRICS.timer("state.load"):
+            return self._load_state()
+
+    def _load_state(self):
+        self.writer.flush()
+        record = self.backend.read()
+        if record:
+            if record.startswith(RECORD_MAGIC):
+                try:
+                    seed, counter, _ = unpack_record(record, self.device_key)
+                    return seed, counter
+                except StateRecordError as e:
+                    print(f"[ALERTE SÉCURITÉ] {e}")
+                    return None, 0
+            # Ancien format JSON écrit sous le même nom
+            return self._load_legacy_json(record)
+
+        if self.legacy_filename != self.filename and os.path.exists(self.legacy_filename):
+            with open(self.legacy_filename, "rb") as f:
+                return self._load_legacy_json(f.read())
+        return None, 0
+
+    def _load_legacy_json(self, raw: bytes):
+        """Relit l'ancien format JSON (seed_hex, reseed_counter, checksum)."""
+        import json  # chemin de migration uniquement : hors du démarrage normal
         try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
-                
+            data = json.loads(raw)
+
             seed = bytes.fromhex(data["seed_hex"])
             counter = data["reseed_counter"]
-            
+
             # Vérification anti-corruption
             if data["checksum"] != self._compute_checksum(seed, counter):
                 print("[ALERTE SÉCURITÉ] Checksum invalide ! État corrompu.")
                 return None, 0
-                
+
             return seed, counter
-            
-        except (json.JSONDecodeError, KeyError):
+
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, ValueError):
             return None, 0
 
     def _compute_checksum(self, seed: bytes, counter: int) -> int:
-        """Checksum simple pour détecter la corruption (pas une signature crypto ici)."""
-        return sum(seed) + counter
\ No newline at end of file
+        """Checksum simple de l'ancien format JSON (pas une signature crypto ici)."""
+        return sum(seed) + counter
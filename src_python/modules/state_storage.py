@@ -0,0 +1,253 @@
+# Backends de stockage de l'état DRBG (format binaire fixe, écriture atomique)
+import os
+import hmac
+import time
+import struct
+import hashlib
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src_python.utils.constants import SEED_SIZE_BYTES
+from src_python.utils.metrics import METRICS
+
+# --- Format binaire de l'enregistrement d'état ---
+#
+#   magic      4 o   b"PQST"
+#   version    u16   RECORD_VERSION
+#   réservé    u16   0
+#   compteur   u64   reseed_counter
+#   horodatage f64   time.time()
+#   seed       32 o  jeton de seed (jamais la clé active)
+#   mac        32 o  HMAC-SHA3-256(clé appareil, tout ce qui précède)
+#
+# Total : 88 octets, little-endian.
+RECORD_MAGIC = b"PQST"
+RECORD_VERSION = 1
+_HEADER = struct.Struct("<4sHHQd")
+_MAC_BYTES = 32
+RECORD_SIZE = _HEADER.size + SEED_SIZE_BYTES + _MAC_BYTES
+
+# Clé d'appareil SIMULÉE (un vrai TEE la garderait scellée dans le matériel).
+# Surcharge possible via la variable d'environnement RNG_TEE_KEY (hex).
+DEFAULT_DEVICE_KEY = bytes.fromhex(os.environ["RNG_TEE_KEY"]) if "RNG_TEE_KEY" in os.environ \
+    else b"API_RNG_MOBILE_PQ/simulated-tee-device-key"
+
+class StateRecordError(Exception): pass
+
+def _mac(key: bytes, data: bytes) -> bytes:
+    return hmac.new(key, data, hashlib.sha3_256).digest()
+
+def pack_record(seed: bytes, reseed_counter: int, timestamp: float, key: bytes = DEFAULT_DEVICE_KEY) -> bytes:
+    """Sérialise l'état en enregistrement binaire authentifié."""
+    if len(seed) != SEED_SIZE_BYTES:
+        raise ValueError(f"Seed de {len(seed)} octets (attendu : {SEED_SIZE_BYTES}).")
+    body = _HEADER.pack(RECORD_MAGIC, RECORD_VERSION, 0, reseed_counter, timestamp) + seed
+    return body + _mac(key, body)
+
+def unpack_record(record: bytes, key: bytes = DEFAULT_DEVICE_KEY):
+    """
+    Vérifie et désérialise un enregistrement.
+    Returns:
+        (seed, reseed_counter, timestamp)
+    Raises:
+        StateRecordError: taille, version ou MAC invalide.
+    """
+    if len(record) != RECORD_SIZE:
+        raise StateRecordError(f"Taille d'enregistrement invalide ({len(record)} octets).")
+    body, tag = record[:-_MAC_BYTES], record[-_MAC_BYTES:]
+    if not hmac.compare_digest(tag, _mac(key, body)):
+        raise StateRecordError("MAC invalide : état corrompu ou falsifié.")
+    magic, version, _, counter, timestamp = _HEADER.unpack_from(body)
+    if magic != RECORD_MAGIC or version != RECORD_VERSION:
+        raise StateRecordError(f"Format inconnu (magic={magic!r}, version={version}).")
+    return body[_HEADER.size:], counter, timestamp
+
+# --- Backends ---
+
+class StateBackend(ABC):
+    """Stockage brut d'UN enregistrement (le dernier écrit gagne)."""
+
+    @abstractmethod
+    def write(self, record: bytes):
+        """Remplace l'enregistrement stocké."""
+        pass
+
+    @abstractmethod
+    def read(self) -> Optional[bytes]:
+        """Dernier enregistrement écrit, ou None s'il n'y en a pas."""
+        pass
+
+class FileStateBackend(StateBackend):
+    """
+    Fichier local, écriture atomique : fichier temporaire unique + os.replace().
+    Un crash pendant l'écriture laisse l'ancien état intact (jamais de fichier tronqué).
+    fsync=True force la persistance du fichier ET du répertoire (plus lent).
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+
+    def write(self, record: bytes):
+        # Fichier temporaire propre à CET appel (workers forkés, threads) :
+        # jamais de rename d'un enregistrement qu'un autre écrivain remplit encore
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(record)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def read(self) -> Optional[bytes]:
+        try:
+            with open(self.path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+class MemoryStateBackend(StateBackend):
+    """Stockage en mémoire (tests, environnements sans disque)."""
+
+    def __init__(self):
+        self.record: Optional[bytes] = None
+        self.writes = 0
+
+    def write(self, record: bytes):
+        self.record = record
+        self.writes += 1
+
+    def read(self) -> Optional[bytes]:
+        return self.record
+
+class CoalescingWriter:
+    """
+    Coalescence des écritures : au plus UNE écriture backend par intervalle.
+    Seul le dernier enregistrement en attente est écrit (les intermédiaires
+    sont remplacés). En mode background, l'écriture se fait sur un thread
+    dédié : save_state() ne touche jamais le disque sur le chemin appelant.
+    En mode synchrone, un dépôt fait pendant l'intervalle est écrit par un
+    minuteur à son expiration (jamais laissé en attente indéfiniment).
+    """
+
+    def __init__(self, backend: StateBackend, interval: float = 0.0, background: bool = False):
+        self.backend = backend
+        self.interval = interval
+        self.background = background
+        self.flushes = 0
+        self._pending: Optional[bytes] = None
+        self._last_flush = float("-inf")
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._running = True
+        self._thread = None
+        self._timer: Optional[threading.Timer] = None
+        if background:
+            self._start_thread()
+
+    def _start_thread(self):
+        self._thread = threading.Thread(target=self._run, name="StateWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> Optional[bytes]:
+        return self._pending
+
+    def submit(self, record: bytes):
+        with self._cond:
+            self._pending = record
+            if self.background:
+                if self._thread is None:
+                    self._start_thread()  # Premier dépôt après fork()
+                self._cond.notify()
+                return
+            delay = self._last_flush + self.interval - self._clock()
+            if delay > 0:
+                # Écriture différée à la fin de l'intervalle (un seul minuteur)
+                if self._timer is None:
+                    self._timer = threading.Timer(delay, self._trailing_flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def _trailing_flush(self):
+        with self._cond:
+            self._timer = None
+        self.flush()
+
+    def flush(self):
+        """Écrit immédiatement l'enregistrement en attente (s'il y en a un)."""
+        with self._io_lock:
+            with self._cond:
+                record, self._pending = self._pending, None
+                if record is None:
+                    return
+                self._last_flush = self._clock()
+            try:
+                with METRICS.timer("state.write"):
+                    self.backend.write(record)
+                self.flushes += 1
+            except OSError as e:
+                print(f"[ERREUR TEE] Échec sauvegarde état: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                delay = self._last_flush + self.interval - self._clock()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+            self.flush()
+        self.flush()
+
+    def reset_after_fork(self):
+        """
+        Enfant après fork() : nouveaux verrous ; le thread d'écriture n'est
+        relancé qu'au premier submit() (rien de lourd dans le hook de fork).
+        L'enregistrement en attente est celui du parent (il l'écrira) : abandonné.
+        """
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending = None
+        self._running = True
+        self._thread = None
+        self._timer = None
+
+    def close(self):
+        """Arrête le thread d'écriture (ou le minuteur) après avoir vidé l'attente."""
+        with self._cond:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if self._thread is not None:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
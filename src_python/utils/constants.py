@@ -23,10 +23,20 @@ Q = 3329
 # P doit être < Q. Une puissance de 2 permet une extraction de bits facile.
 P = 1024 
 
+# Seed PUBLIQUE de la matrice A (rho dans Kyber).
+# A est dérivée de cette seed par SHAKE-128 + échantillonnage par rejet :
+# même matrice sur toutes les plateformes, indépendamment de NumPy.
+PUBLIC_MATRIX_SEED = b"API_RNG_MOBILE_PQ/LWR/matrix_A/v1"
+
 # --- Paramètres Système ---
 
 # Taille de la Seed en octets (256 bits)
 SEED_SIZE_BYTES = 32 
 
 # Limite de sécurité avant reseed obligatoire (NIST SP 800-90A)
-RESEED_INTERVAL = 10000
\ No newline at end of file
+RESEED_INTERVAL = 10000
+
+# Taille maximale d'une requête Generate (NIST SP 800-90A, Table 2 : 2^19 bits).
+# Au-delà, le mode "bulk" découpe la sortie en requêtes de cette taille :
+# une évaluation Lattice + une rotation d'état par requête.
+MAX_BYTES_PER_REQUEST = (1 << 19) // 8
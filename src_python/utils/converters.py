@@ -1,5 +1,6 @@
 # Gestion Little-Endian !! 
-import struct
+import math
+import functools
 import numpy as np
 
 def int_to_bytes_le(value: int, length: int = 4) -> bytes:
@@ -28,10 +29,103 @@ def polynomial_to_bytes(poly: np.ndarray, q: int) -> bytes:
     """
     Sérialise un polynôme (vecteur numpy) en octets pour le stockage ou la transmission.
     Chaque coefficient est normalisé modulo q.
+    Format non compressé (voir pack_polynomial pour la version compacte).
     """
-    buffer = bytearray()
-    for coeff in poly:
-        val = int(coeff) % q
-        # On stocke chaque coefficient sur 2 octets (car q=3329 tient sur 16 bits)
-        buffer.extend(int_to_bytes_le(val, length=2))
-    return bytes(buffer)
\ No newline at end of file
+    # On stocke chaque coefficient sur 2 octets (car q=3329 tient sur 16 bits)
+    return (np.asarray(poly, dtype=np.int64) % q).astype("<u2").tobytes()
+
+def bytes_to_polynomial(data: bytes, q: int) -> np.ndarray:
+    """Inverse de polynomial_to_bytes (2 octets Little-Endian par coefficient)."""
+    return np.frombuffer(data, dtype="<u2").astype(np.int64) % q
+
+# --- Compression par bits (façon ByteEncode_d de Kyber, FIPS 203 Alg. 5) ---
+#
+# Les coefficients sont concaténés bit à bit, poids faibles d'abord :
+# le coefficient i occupe les bits [i*d, (i+1)*d) du flux Little-Endian.
+#   d = 10 (P = 1024) : 4 coefficients -> 5 octets
+#   d = 12 (Q = 3329) : 2 coefficients -> 3 octets
+#
+# Vectorisation : un groupe de coefficients qui remplit un nombre entier
+# d'octets (<= 64 bits) est assemblé en un mot uint64 (produit par les poids
+# 2^(j*d)), puis on garde les octets utiles du mot Little-Endian.
+
+def packed_size(count: int, bits: int) -> int:
+    """Taille en octets de `count` coefficients de `bits` bits."""
+    return (count * bits + 7) // 8
+
+@functools.lru_cache(maxsize=None)
+def _group(bits: int):
+    """
+    (coefficients par groupe, octets par groupe, poids 2^(j*bits), décalages j*bits),
+    ou None si le groupe dépasse 64 bits (largeurs impaires > 8).
+    """
+    per_group = 8 // math.gcd(bits, 8)
+    if per_group * bits > 64:
+        return None
+    shifts = np.arange(per_group, dtype=np.uint64) * np.uint64(bits)
+    weights = (np.uint64(1) << shifts).astype("<u8")
+    return per_group, per_group * bits // 8, weights, shifts
+
+def _check_bits(bits: int):
+    if not 1 <= bits <= 16:
+        raise ValueError(f"[ERREUR] Largeur de {bits} bits non supportée (1 à 16).")
+
+def pack_bits(coeffs: np.ndarray, bits: int) -> bytes:
+    """Sérialise des coefficients entiers (0 <= c < 2^bits) sur `bits` bits chacun."""
+    _check_bits(bits)
+    c = np.asarray(coeffs).reshape(-1)
+    if c.size and (c.max() >> bits or (c.dtype.kind == "i" and c.min() < 0)):
+        raise ValueError(f"[ERREUR] Coefficient hors de l'intervalle [0, 2^{bits}).")
+    size = packed_size(c.size, bits)
+
+    group = _group(bits)
+    if group is None:
+        # Générique : matrice de bits (count x bits) puis regroupement par octets
+        bit_matrix = (c.astype(np.uint32)[:, None] >> np.arange(bits, dtype=np.uint32)) & 1
+        return np.packbits(bit_matrix.astype(np.uint8).reshape(-1), bitorder="little").tobytes()
+
+    per_group, group_bytes, weights, _ = group
+    if c.size % per_group:
+        c = np.concatenate([c, np.zeros(per_group - c.size % per_group, dtype=c.dtype)])
+    words = c.reshape(-1, per_group).astype("<u8") @ weights
+    return words.view(np.uint8).reshape(-1, 8)[:, :group_bytes].tobytes()[:size]
+
+def unpack_bits(data: bytes, bits: int, count: int) -> np.ndarray:
+    """Inverse de pack_bits : retourne `count` coefficients (uint16)."""
+    _check_bits(bits)
+    size = packed_size(count, bits)
+    if len(data) < size:
+        raise ValueError(f"[ERREUR] {len(data)} octets pour {count} coefficients de {bits} bits.")
+    raw = np.frombuffer(data, dtype=np.uint8, count=size)
+
+    group = _group(bits)
+    if group is None:
+        bit_matrix = np.unpackbits(raw, bitorder="little")[:count * bits].reshape(count, bits)
+        return (bit_matrix.astype(np.uint32) @ (1 << np.arange(bits, dtype=np.uint32))).astype(np.uint16)
+
+    per_group, group_bytes, _, shifts = group
+    groups = -(-count // per_group)
+    body = np.zeros(groups * group_bytes, dtype=np.uint8)
+    body[:size] = raw
+    padded = np.zeros((groups, 8), dtype=np.uint8)
+    padded[:, :group_bytes] = body.reshape(groups, group_bytes)
+    words = padded.view("<u8")
+    coeffs = (words >> shifts) & np.uint64((1 << bits) - 1)
+    return coeffs.reshape(-1)[:count].astype(np.uint16)
+
+def pack_polynomial(poly: np.ndarray, q: int) -> bytes:
+    """
+    Sérialisation compacte d'un polynôme ou d'un vecteur de polynômes
+    (coefficients normalisés mod q, ceil(log2 q) bits chacun : 12 bits pour Q).
+    """
+    bits = (q - 1).bit_length()
+    return pack_bits(np.asarray(poly, dtype=np.int64).reshape(-1) % q, bits)
+
+def unpack_polynomial(data: bytes, q: int, shape) -> np.ndarray:
+    """Inverse de pack_polynomial ; `shape` = N ou (K, N). Rejette les coefficients >= q."""
+    bits = (q - 1).bit_length()
+    count = int(np.prod(shape))
+    coeffs = unpack_bits(data, bits, count)
+    if count and int(coeffs.max()) >= q:
+        raise ValueError(f"[ERREUR] Coefficient >= {q} : données corrompues.")
+    return coeffs.reshape(shape)
@@ -0,0 +1,53 @@
+# Détection de fork() pour les objets à état secret (serveurs pre-fork)
+#
+# Après fork(), l'enfant hérite d'une copie exacte de la mémoire du parent :
+# état DRBG, compteurs, réserves d'octets... Sans intervention, tous les
+# workers produiraient les mêmes octets que le parent et entre eux.
+#
+# - os.register_at_fork(after_in_child=...) appelle _after_fork_in_child()
+#   de chaque objet enregistré, dans l'enfant, juste après le fork : l'objet
+#   y remplace ses verrous (peut-être tenus par un thread qui n'existe plus)
+#   et marque le reseed à faire avant la prochaine sortie.
+# - Repli : un fork qui contourne les hooks Python (appel C direct à fork())
+#   est détecté par changement de PID (ForkGuard.forked()).
+import os
+import weakref
+
+_instances = weakref.WeakSet()
+
+def register(obj):
+    """Enregistre un objet muni d'une méthode _after_fork_in_child()."""
+    _instances.add(obj)
+
+def _run_child_hooks():
+    for obj in list(_instances):
+        try:
+            obj._after_fork_in_child()
+        except Exception as e:
+            print(f"[ERREUR FORK] {type(obj).__name__} : {e}")
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_run_child_hooks)
+
+class ForkGuard:
+    """
+    Indicateur de fork d'un objet : positionné par le hook ou, à défaut,
+    par un PID différent de celui enregistré. Coût sur le chemin de la
+    requête : un test d'attribut et un os.getpid().
+    """
+
+    __slots__ = ("pid", "pending")
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.pending = False
+
+    def mark(self):
+        self.pending = True
+
+    def forked(self) -> bool:
+        return self.pending or self.pid != os.getpid()
+
+    def clear(self):
+        self.pid = os.getpid()
+        self.pending = False
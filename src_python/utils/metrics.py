@@ -0,0 +1,193 @@
+# Instrumentation du chemin critique : histogrammes de latence, compteurs, export Prometheus
+import os
+import io
+import time
+import bisect
+import threading
+import contextlib
+from typing import Dict, Optional
+
+# Bornes des histogrammes (secondes) : 1 us -> 10 s, progression x ~3
+LATENCY_BUCKETS = (1e-6, 3e-6, 1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 1e-1, 3e-1, 1.0, 3.0, 10.0)
+
+# Variable d'environnement d'activation (désactivé par défaut : surcoût quasi nul)
+METRICS_ENV = "RNG_METRICS"
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes (format Prometheus)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+        }
+
+class _StageTimer:
+    __slots__ = ("registry", "stage", "start")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+# Contexte vide partagé : aucune allocation quand l'instrumentation est coupée
+_NULL_TIMER = contextlib.nullcontext()
+
+class MetricsRegistry:
+    """
+    Registre de métriques du processus.
+
+    Usage dans le code instrumenté :
+        with METRICS.timer("lwr.matmul"):
+            ...
+        if METRICS.enabled: METRICS.inc("bytes_generated", n)
+
+    Désactivé : timer() retourne un contexte vide partagé, inc() ne fait rien.
+    """
+
+    def __init__(self, enabled: bool = False, prefix: str = "rng"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def timer(self, stage: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name: str, value: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """Vue JSON-compatible (utilisée par MobileRNG.health_check)."""
+        with self._lock:
+            return {
+                "stages": {stage: h.snapshot() for stage, h in sorted(self._histograms.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_prometheus(self) -> str:
+        """Export au format texte Prometheus (exposition 0.0.4)."""
+        lines = []
+        name = f"{self.prefix}_stage_seconds"
+        with self._lock:
+            if self._histograms:
+                lines.append(f"# HELP {name} Latence par étape du pipeline RNG.")
+                lines.append(f"# TYPE {name} histogram")
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.total:.9f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+            for counter, value in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{counter.replace('.', '_')}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    @contextlib.contextmanager
+    def profile(self, sort_by: str = "cumulative", top: int = 25, trace_memory: bool = False):
+        """
+        Profilage opt-in d'un bloc de code (cProfile + tracemalloc optionnel).
+
+            with METRICS.profile() as report:
+                rng.generate(1 << 20)
+            print(report["cpu"])
+        """
+        import cProfile
+        import pstats
+        import tracemalloc
+
+        report = {}
+        profiler = cProfile.Profile()
+        if trace_memory:
+            tracemalloc.start()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats(sort_by).print_stats(top)
+            report["cpu"] = out.getvalue()
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                report["memory_top"] = [str(s) for s in snapshot.statistics("lineno")[:top]]
+                report["memory_current"] = current
+                report["memory_peak"] = peak
+
+# Registre global du processus
+METRICS = MetricsRegistry(enabled=os.environ.get(METRICS_ENV) == "1")
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None):
+    """
+    Sert /metrics (format Prometheus) en local sur un thread daemon.
+    Returns:
+        Le serveur HTTP (appeler shutdown() pour l'arrêter).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or METRICS
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+    return server
@@ -1,2 +1,151 @@
 # Optimisation polynomes NTT (Number Theoretic Transform) pour les opérations dans les anneaux finis
-# Utilisé dans les algorithmes de chiffrement post-quantiques basés sur les réseaux, tels que LWR et LWE
\ No newline at end of file
+# Utilisé dans les algorithmes de chiffrement post-quantiques basés sur les réseaux, tels que LWR et LWE
+"""
+NTT VECTORISÉE SUR R_q = Z_q[X] / (X^N + 1)  (q = 3329, N = 256)
+
+Même structure que Kyber (FIPS 203) :
+- 17 est une racine primitive 256-ième de l'unité modulo 3329.
+- X^256 + 1 se factorise en 128 quadratiques (X^2 - zeta_i) : la NTT est
+  "incomplète" (7 couches au lieu de 8) et la multiplication point à point
+  se fait sur des paires de coefficients (basemul).
+
+Toutes les fonctions acceptent des tableaux de forme (..., N) : on transforme
+d'un coup les K polynômes d'un vecteur, ou les K*K d'une matrice.
+"""
+import numpy as np
+
+from src_python.utils.constants import N, Q
+
+# Racine primitive 256-ième de l'unité modulo Q
+ZETA = 17
+
+# Nombre de couches papillon (N = 2^8, on s'arrête aux paires : 7 couches)
+NTT_LAYERS = 7
+
+def _bit_reverse_7(i: int) -> int:
+    """Inverse l'ordre des 7 bits de poids faible de i."""
+    return int(f"{i:07b}"[::-1], 2)
+
+# --- Tables précalculées (une seule fois à l'import) ---
+
+# ZETAS[i] = 17^brv7(i) mod Q (ordre bit-reversed, comme la référence Kyber)
+ZETAS = np.array([pow(ZETA, _bit_reverse_7(i), Q) for i in range(128)], dtype=np.int64)
+
+# Inverses modulaires des twiddles (pour la NTT inverse)
+ZETAS_INV = np.array([pow(int(z), Q - 2, Q) for z in ZETAS], dtype=np.int64)
+
+# Gamma des 128 quadratiques X^2 - gamma_i : (+zeta, -zeta) alternés
+GAMMAS = np.empty(N // 2, dtype=np.int64)
+GAMMAS[0::2] = ZETAS[64:]
+GAMMAS[1::2] = (-ZETAS[64:]) % Q
+
+# 128^-1 mod Q : facteur de normalisation de la NTT inverse
+N_INV = pow(N // 2, Q - 2, Q)
+
+# Découpage des couches : (longueur du demi-bloc, indices des twiddles)
+_LAYERS = []
+_k = 1
+_length = N // 2
+while _length >= 2:
+    _groups = N // (2 * _length)
+    _LAYERS.append((_length, slice(_k, _k + _groups)))
+    _k += _groups
+    _length //= 2
+
+# Borne de réduction paresseuse : tant que |r| * Q < 2^62, pas de débordement int64
+_LAZY_BOUND = (1 << 62) // Q
+
+def ntt(poly: np.ndarray) -> np.ndarray:
+    """
+    NTT directe (Cooley-Tukey, entrée ordre normal, sortie bit-reversed).
+
+    Les papillons sont calculés en place, couche par couche, sur toutes les
+    dimensions de tête à la fois. Réduction paresseuse : le modulo (coûteux)
+    n'est appliqué que lorsque la borne |r| menace de déborder l'int64.
+
+    Args:
+        poly: Coefficients entiers, forme (..., N).
+    Returns:
+        Représentation NTT, int64 dans [0, Q), même forme.
+    """
+    r = np.array(poly, dtype=np.int64) % Q
+    lead = r.shape[:-1]
+    bound = Q
+    for length, zslice in _LAYERS:
+        if bound > _LAZY_BOUND:
+            r %= Q
+            bound = Q
+        blocks = r.reshape(lead + (N // (2 * length), 2, length))
+        lo = blocks[..., 0, :]
+        hi = blocks[..., 1, :]
+        t = ZETAS[zslice][:, None] * hi
+        np.subtract(lo, t, out=hi)
+        lo += t
+        bound *= Q
+    r %= Q
+    return r
+
+def intt(poly_hat: np.ndarray) -> np.ndarray:
+    """
+    NTT inverse (Gentleman-Sande, entrée bit-reversed, sortie ordre normal).
+    Inclut la multiplication par 128^-1.
+    """
+    r = np.array(poly_hat, dtype=np.int64) % Q
+    lead = r.shape[:-1]
+    bound = Q
+    for length, zslice in reversed(_LAYERS):
+        if 2 * bound > _LAZY_BOUND:
+            r %= Q
+            bound = Q
+        blocks = r.reshape(lead + (N // (2 * length), 2, length))
+        lo = blocks[..., 0, :]
+        hi = blocks[..., 1, :]
+        t = lo - hi
+        lo += hi
+        np.multiply(ZETAS_INV[zslice][:, None], t, out=hi)
+        bound *= 2 * Q
+    r %= Q
+    r *= N_INV
+    r %= Q
+    return r
+
+def basemul(a_hat: np.ndarray, b_hat: np.ndarray) -> np.ndarray:
+    """
+    Produit point à point dans le domaine NTT.
+    (a0 + a1 X)(b0 + b1 X) mod (X^2 - gamma) pour chacune des 128 paires.
+    Supporte le broadcasting NumPy sur les dimensions de tête.
+    """
+    a = np.asarray(a_hat, dtype=np.int64)
+    b = np.asarray(b_hat, dtype=np.int64)
+    a0, a1 = a[..., 0::2], a[..., 1::2]
+    b0, b1 = b[..., 0::2], b[..., 1::2]
+    c0 = (a0 * b0 + ((a1 * b1) % Q) * GAMMAS) % Q
+    c1 = (a0 * b1 + a1 * b0) % Q
+    out = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.int64)
+    out[..., 0::2] = c0
+    out[..., 1::2] = c1
+    return out
+
+def matrix_vector_ntt(a_hat: np.ndarray, s_hat: np.ndarray) -> np.ndarray:
+    """
+    Produit Module (A * s) entièrement dans le domaine NTT.
+
+    Args:
+        a_hat: Matrice de polynômes NTT, forme (K, K, N).
+        s_hat: Vecteur de polynômes NTT, forme (K, N).
+    Returns:
+        (A * s) en domaine NTT, forme (K, N).
+    """
+    return basemul(a_hat, s_hat[None, :, :]).sum(axis=1) % Q
+
+def poly_mul_schoolbook(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Multiplication négacyclique naïve O(N^2) dans R_q.
+    Référence lente, utilisée uniquement pour valider la NTT.
+    """
+    a = np.asarray(a, dtype=np.int64) % Q
+    b = np.asarray(b, dtype=np.int64) % Q
+    full = np.convolve(a, b) % Q
+    out = full[:N].copy()
+    out[:len(full) - N] -= full[N:]
+    return out % Q
@@ -0,0 +1,41 @@
+import asyncio
+
+from src_python.api.async_rng import AsyncMobileRNG
+from src_python.api.mobile_rng import MobileRNG
+from src_python.modules.reseed_scheduler import ReseedPolicy
+from src_python.modules.state_mgr import StateManager
+from src_python.modules.state_storage import MemoryStateBackend
+
+def test_concurrent_small_requests_share_one_drbg_call():
+    rng = MobileRNG(state_manager=StateManager(backend=MemoryStateBackend()),
+                    reseed_policy=ReseedPolicy(max_requests=None), background_reseed=False)
+    calls = []
+    generate = rng.generate
+
+    def spy(num_bytes):
+        calls.append(num_bytes)
+        return generate(num_bytes)
+
+    rng.generate = spy
+    sizes = [8, 16, 32, 1, 100]
+
+    async def scenario():
+        arng = AsyncMobileRNG(rng=rng, max_batch_bytes=1024)
+        assert await arng.initialize()
+        state = rng.drbg.export_state()
+        results = await asyncio.gather(*(arng.generate(n) for n in sizes))
+        big = await arng.generate(2000)
+        report = await arng.health_check()
+        await arng.close()
+        return state, results, big, report
+
+    state, results, big, report = asyncio.run(scenario())
+    assert calls == [sum(sizes), 2000]
+    assert [len(d) for d, _ in results] == sizes and all(s == 0 for _, s in results)
+    assert len({d for d, _ in results}) == len(sizes)
+    assert report["async"]["batches"] == 1 and report["async"]["coalesced_requests"] == len(sizes)
+    assert big[1] == 0 and len(big[0]) == 2000
+
+    # Les tranches sont, dans l'ordre, la sortie de l'unique appel DRBG
+    rng.drbg.import_state(state)
+    assert b"".join(d for d, _ in results) == generate(sum(sizes))[0]
@@ -0,0 +1,37 @@
+import pytest
+
+from src_python.api import bulk
+from src_python.api.bulk import BulkGenerator, MAX_CHUNK_SIZE, WORKER_SEED_BYTES, derive_chunk_seed
+from src_python.core.multi_stream import derive_stream_seed
+
+SEED = bytes.fromhex("00ff") * 8
+
+def test_output_does_not_depend_on_worker_count():
+    outputs = []
+    for workers in (1, 3):
+        out = bytearray(250 * 1024)
+        bulk = BulkGenerator(workers=workers, chunk_size=64 * 1024)
+        assert bulk.generate_into(out, seed=SEED) == len(out)
+        outputs.append(bytes(out))
+    assert outputs[0] == outputs[1]
+    assert b"".join(BulkGenerator(workers=2, chunk_size=64 * 1024).iter_chunks(len(out), seed=SEED)) == outputs[0]
+
+def test_chunk_size_is_checked_at_construction():
+    with pytest.raises(ValueError):
+        BulkGenerator(chunk_size=MAX_CHUNK_SIZE + 1)
+    with pytest.raises(ValueError):
+        BulkGenerator(chunk_size=0)
+    with pytest.raises(ValueError):
+        BulkGenerator(workers=1).generate_into(bytearray(16))  # ni seed ni MobileRNG
+
+def test_chunk_seeds_are_domain_separated():
+    """Seeds de blocs : distinctes par bloc et séparées des seeds MultiStreamDrbg (même entrée)."""
+    seeds = [derive_chunk_seed(SEED, i) for i in range(4)]
+    assert all(len(seed) == WORKER_SEED_BYTES for seed in seeds)
+    assert len(set(seeds)) == 4
+    assert seeds[0] != derive_stream_seed(SEED, 0)
+
+def test_in_process_path_leaves_no_worker_state():
+    out = bytearray(10000)
+    assert BulkGenerator(workers=1, chunk_size=4096).generate_into(out, seed=SEED) == len(out)
+    assert bulk._WORKER_CORE is None
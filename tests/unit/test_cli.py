@@ -0,0 +1,30 @@
+import json
+
+from src_python.main import main, parse_size
+
+def test_parse_size():
+    assert parse_size("4096") == 4096
+    assert parse_size("64K") == 64 * 1024
+    assert parse_size("2GiB") == 2 * 1024 ** 3
+
+def test_seeded_stream_is_reproducible(tmp_path, capsys):
+    outputs = []
+    for workers in (1, 2):
+        path = tmp_path / f"out{workers}.bin"
+        assert main(["--bytes", "300K", "--chunk-size", "64K", "--seed", "00ff", "--workers", str(workers),
+                     "--output", str(path), "--quiet", "--json"]) == 0
+        report = json.loads(capsys.readouterr().err)
+        assert report["bytes"] == 300 * 1024 and report["calls"] == 5
+        outputs.append(path.read_bytes())
+    assert outputs[0] == outputs[1] and len(outputs[0]) == 300 * 1024
+
+def test_mobile_rng_stream_summary(tmp_path, capsys):
+    path = tmp_path / "out.bin"
+    assert main(["--bytes", "100000", "--chunk-size", "4K", "--engine", "ntt", "--output", str(path),
+                 "--state-file", str(tmp_path / "state.bin"), "--quiet", "--json"]) == 0
+    err = capsys.readouterr().err
+    # Les messages [INFO] des modules passent sur stderr, avant le bilan JSON
+    report = json.loads(err[err.index("{\n"):])
+    assert path.stat().st_size == report["bytes"] == 100000
+    assert report["engine"] == "ntt" and report["calls"] == 25
+    assert "lwr.matmul" in report["stages"] and report["stages"]["cli.write"]["count"] == 25
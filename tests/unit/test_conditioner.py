@@ -0,0 +1,45 @@
+import hashlib
+
+import numpy as np
+
+from src_python.core.conditioner import Conditioner, DOMAIN_DRBG_UPDATE, DOMAIN_OUTPUT
+
+DATA = bytes(range(256)) * 3
+
+def _single_call(domain: bytes, data: bytes, n: int) -> bytes:
+    """Forme de référence : SHAKE-256(len(domaine) || domaine || données) en un seul appel."""
+    return hashlib.shake_256(bytes([len(domain)]) + domain + data).digest(n)
+
+def test_parts_match_length_prefixed_single_call():
+    cond = Conditioner()
+    expected = _single_call(DOMAIN_OUTPUT, DATA, 100)
+    for cuts in ((), (1,), (7, 300), (0, 256, 512, 767)):
+        bounds = (0,) + cuts + (len(DATA),)
+        parts = [DATA[a:b] for a, b in zip(bounds, bounds[1:])]
+        assert cond.condition_parts(parts, DOMAIN_OUTPUT, 100) == expected
+    # Types de tampons mélangés
+    parts = (bytearray(DATA[:10]), memoryview(DATA)[10:500], np.frombuffer(DATA[500:], dtype=np.uint8))
+    assert cond.condition_parts(parts, DOMAIN_OUTPUT, 100) == expected
+
+def test_out_buffer_is_filled_in_place():
+    cond = Conditioner()
+    out = bytearray(120)
+    assert cond.condition_parts((DATA,), DOMAIN_OUTPUT, 100, out=out) is None
+    assert bytes(out[:100]) == _single_call(DOMAIN_OUTPUT, DATA, 100) and out[100:] == bytes(20)
+
+    array = np.zeros(25, dtype=np.uint32)
+    cond.condition_parts((DATA,), DOMAIN_OUTPUT, 100, out=array)
+    assert array.tobytes() == _single_call(DOMAIN_OUTPUT, DATA, 100)
+
+def test_batch_matches_loop():
+    cond = Conditioner()
+    inputs = [DATA[:i] for i in (0, 1, 64, 768)] + [(DATA[:5], DATA[5:90])]
+    expected = [cond.condition_parts(item if isinstance(item, tuple) else (item,), DOMAIN_DRBG_UPDATE, 48)
+                for item in inputs]
+    assert cond.condition_batch(inputs, DOMAIN_DRBG_UPDATE, 48) == expected
+
+def test_domains_are_separated():
+    cond = Conditioner()
+    assert cond.condition_parts((DATA,), DOMAIN_OUTPUT, 32) != cond.condition_parts((DATA,), DOMAIN_DRBG_UPDATE, 32)
+    # Le préfixe de longueur empêche de déplacer la frontière domaine / données
+    assert cond.condition_parts((b"C",), b"AB", 32) != cond.condition_parts((b"BC",), b"A", 32)
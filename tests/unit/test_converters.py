@@ -0,0 +1,37 @@
+import numpy as np
+
+from src_python.utils.constants import N, K, Q, P
+from src_python.utils.converters import (
+    pack_bits, unpack_bits, packed_size, pack_polynomial, unpack_polynomial,
+    polynomial_to_bytes, bytes_to_polynomial
+)
+
+def _reference_pack(coeffs, bits) -> bytes:
+    """Flux de bits Little-Endian construit bit par bit (référence lente)."""
+    bit_matrix = (np.asarray(coeffs, dtype=np.uint32)[:, None] >> np.arange(bits)) & 1
+    return np.packbits(bit_matrix.astype(np.uint8).reshape(-1), bitorder="little").tobytes()
+
+def test_pack_bits_roundtrip_all_widths():
+    """Toutes les largeurs 1..16 bits, tailles multiples ou non de la taille de groupe."""
+    rng = np.random.default_rng(4)
+    for bits in range(1, 17):
+        for count in (0, 1, 7, 13, K * N):
+            coeffs = rng.integers(0, 1 << bits, size=count)
+            packed = pack_bits(coeffs, bits)
+            assert len(packed) == packed_size(count, bits)
+            assert packed == _reference_pack(coeffs, bits)
+            assert np.array_equal(unpack_bits(packed, bits, count), coeffs)
+
+def test_polynomial_serialization():
+    """Vecteur (K, N) mod Q : 12 bits/coefficient ; format 2 octets inchangé."""
+    rng = np.random.default_rng(5)
+    vector = rng.integers(0, Q, size=(K, N))
+    packed = pack_polynomial(vector, Q)
+    assert len(packed) == K * N * 12 // 8
+    assert np.array_equal(unpack_polynomial(packed, Q, (K, N)), vector)
+    assert len(pack_bits(rng.integers(0, P, size=K * N), 10)) == K * N * 10 // 8
+
+    poly = vector[0] - Q  # coefficients négatifs normalisés mod q
+    legacy = polynomial_to_bytes(poly, Q)
+    assert legacy == b"".join(int(c).to_bytes(2, "little") for c in vector[0])
+    assert np.array_equal(bytes_to_polynomial(legacy, Q), vector[0])
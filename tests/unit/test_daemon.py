@@ -0,0 +1,169 @@
+import os
+import stat
+import socket
+import asyncio
+import threading
+
+from src_python.api.client import RNGClient
+from src_python.api.daemon import RNGDaemon
+from src_python.api.protocol import HEADER, RESPONSE, OP_GENERATE, OP_RESEED, OP_HEALTH, STATUS_OK, STATUS_BAD_REQUEST, MAX_REQUEST_BYTES
+
+def _serve(daemon: RNGDaemon):
+    """Démarre le démon dans une boucle asyncio dédiée ; retourne une fonction d'arrêt."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    assert asyncio.run_coroutine_threadsafe(daemon.start(), loop).result(timeout=60)
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(daemon.close(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+    return stop
+
+def test_daemon_roundtrip(tmp_path):
+    socket_path = str(tmp_path / "rng.sock")
+    daemon = RNGDaemon(socket_path, num_shards=2, state_file=str(tmp_path / "state.bin"))
+    stop = _serve(daemon)
+    client = RNGClient(socket_path, pool_size=2)
+    try:
+        assert client.initialize()
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        data, status = client.generate(100)
+        assert status == STATUS_OK and len(data) == 100
+
+        # Pipelining : réponses remises dans l'ordre des requêtes
+        results = client.generate_many([1, 32, 0, 4096])
+        assert [len(d) for d, _ in results] == [1, 32, 0, 4096]
+        assert all(s == STATUS_OK for _, s in results)
+        assert len({d for d, _ in results if d}) == 3
+
+        assert client.generate(MAX_REQUEST_BYTES + 1)[1] == STATUS_BAD_REQUEST
+        assert client.reseed(b"external")
+        assert client.health_check()["daemon"]["shards"] == 2
+    finally:
+        client.close()
+        stop()
+
+def test_pipelining_beyond_max_in_flight(tmp_path):
+    """Bien plus de MAX_IN_FLIGHT requêtes pipelinées : pas d'interblocage client/démon."""
+    socket_path = str(tmp_path / "rng.sock")
+    daemon = RNGDaemon(socket_path, num_shards=1, state_file=str(tmp_path / "state.bin"))
+    stop = _serve(daemon)
+    client = RNGClient(socket_path, pool_size=1, timeout=10.0)
+    try:
+        assert client.initialize()
+        # En-têtes et réponses dépassent tous deux les tampons de la socket
+        sizes = [64] * 60000
+        results = client.generate_many(sizes)
+        assert all(s == STATUS_OK for _, s in results)
+        assert [len(d) for d, _ in results] == sizes
+    finally:
+        client.close()
+        stop()
+
+def test_daemon_refuses_to_replace_live_socket(tmp_path):
+    """Un second démon ne prend pas la socket d'un démon actif ; une socket orpheline est reprise."""
+    socket_path = str(tmp_path / "rng.sock")
+    first = RNGDaemon(socket_path, num_shards=1, state_file=str(tmp_path / "a.bin"))
+    stop = _serve(first)
+    second = RNGDaemon(socket_path, num_shards=1, state_file=str(tmp_path / "b.bin"))
+    try:
+        assert asyncio.run(second.start()) is False
+        asyncio.run(second.close())
+        assert stat.S_ISSOCK(os.lstat(socket_path).st_mode)
+        client = RNGClient(socket_path, pool_size=1)
+        assert client.initialize()
+        client.close()
+    finally:
+        stop()
+
+    # Socket orpheline (personne n'écoute) : reprise
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    third = RNGDaemon(socket_path, num_shards=1, state_file=str(tmp_path / "c.bin"))
+    stop = _serve(third)
+    stop()
+
+    # Un fichier ordinaire n'est jamais supprimé
+    (tmp_path / "file.sock").write_bytes(b"keep")
+    fourth = RNGDaemon(str(tmp_path / "file.sock"), num_shards=1, state_file=str(tmp_path / "d.bin"))
+    assert asyncio.run(fourth.start()) is False
+    assert (tmp_path / "file.sock").read_bytes() == b"keep"
+
+def test_malformed_frame_closes_connection(tmp_path):
+    """Opcode inconnu ou OP_HEALTH avec charge utile : connexion coupée, jamais relue comme en-tête."""
+    socket_path = str(tmp_path / "rng.sock")
+    daemon = RNGDaemon(socket_path, num_shards=1, state_file=str(tmp_path / "state.bin"))
+    stop = _serve(daemon)
+    try:
+        for opcode, length in ((99, 4), (OP_HEALTH, 4)):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(10)
+                sock.connect(socket_path)
+                # La charge utile forme un en-tête GENERATE valide s'il était relu
+                sock.sendall(HEADER.pack(1, opcode, length) + HEADER.pack(2, OP_GENERATE, 16)[:length]
+                             + HEADER.pack(3, OP_GENERATE, 16))
+                assert sock.recv(RESPONSE.size) == b""
+    finally:
+        stop()
+
+def test_reseed_is_not_retried(tmp_path):
+    """Connexion coupée avant la réponse : RESEED échoue sans être rejoué, GENERATE est retenté."""
+    path = str(tmp_path / "drop.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    received = []
+
+    def drop_connections():
+        server.settimeout(1.0)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                received.append(HEADER.unpack(conn.recv(HEADER.size))[1])
+
+    thread = threading.Thread(target=drop_connections, daemon=True)
+    thread.start()
+    client = RNGClient(path, pool_size=1)
+    client.is_initialized = True
+    assert client.reseed(b"external") is False
+    assert client.generate(16)[1] != STATUS_OK
+    server.close()
+    thread.join(timeout=10)
+    assert received == [OP_RESEED, OP_GENERATE, OP_GENERATE]
+
+def test_client_without_daemon(tmp_path):
+    client = RNGClient(str(tmp_path / "absent.sock"))
+    assert not client.initialize()
+    assert client.generate(16) == (b"", -1)
+    report = client.health_check()
+    assert report["initialized"] is False and "error" in report
+
+def test_stray_response_id_releases_connection(tmp_path):
+    """Un id de réponse inconnu : erreur propre, connexion jetée, slot du pool rendu."""
+    path = str(tmp_path / "stray.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+
+    def reply_with_wrong_id():
+        for _ in range(2):  # appel initial + nouvel essai
+            conn, _ = server.accept()
+            with conn:
+                conn.recv(HEADER.size)
+                conn.sendall(RESPONSE.pack(999, STATUS_OK, 0))
+
+    thread = threading.Thread(target=reply_with_wrong_id, daemon=True)
+    thread.start()
+    client = RNGClient(path, pool_size=1)
+    client.is_initialized = True
+    assert client.generate(16)[1] != STATUS_OK
+    thread.join(timeout=10)
+    server.close()
+    assert client._slots.acquire(blocking=False)
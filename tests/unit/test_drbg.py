@@ -0,0 +1,17 @@
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.utils.constants import MAX_BYTES_PER_REQUEST
+
+def _seeded_core() -> LwrDrbgCore:
+    core = LwrDrbgCore()
+    core.update(b"\x42" * 48)
+    return core
+
+def test_bulk_matches_generate_and_counts_requests():
+    """Le mode bulk = generate() pour une requête, et compte une requête par bloc SP 800-90A."""
+    a, b = _seeded_core(), _seeded_core()
+    assert bytes(a.generate_bulk(1000)) == b.generate(1000)
+
+    core = _seeded_core()
+    data = core.generate(3 * MAX_BYTES_PER_REQUEST + 1)
+    assert len(data) == 3 * MAX_BYTES_PER_REQUEST + 1
+    assert core.reseed_counter == 1 + 4
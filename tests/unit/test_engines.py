@@ -0,0 +1,59 @@
+import pytest
+
+from src_python.api.mobile_rng import MobileRNG
+from src_python.core import conformance
+from src_python.core.engines import (ENGINE_ENV, available_engines, create_engine, register_engine,
+                                     unregister_engine, reference_engine)
+from src_python.core.lwr_drbg import LwrDrbgCore, STATE_EXPORT_BYTES
+
+def test_registry_selection(monkeypatch, tmp_path):
+    assert {"dense", "exact", "exact_ref", "ntt", "ntt_ref"} <= set(available_engines())
+    assert reference_engine("lwr-module") == "ntt_ref"
+    with pytest.raises(ValueError):
+        create_engine("inconnu")
+    with pytest.raises(ValueError):
+        MobileRNG(engine="inconnu", state_file=str(tmp_path / "s.bin"))
+
+    monkeypatch.setenv(ENGINE_ENV, "exact")
+    rng = MobileRNG(state_file=str(tmp_path / "s.bin"))
+    assert rng.engine_name == "exact"
+    assert rng.drbg.engine_name == "exact"
+
+def test_state_export_import_across_family():
+    exact, reference = create_engine("exact"), create_engine("exact_ref")
+    exact.instantiate(b"seed")
+    exact.generate(32)
+    blob = exact.export_state()
+    assert len(blob) == STATE_EXPORT_BYTES
+
+    reference.import_state(blob)
+    assert reference.export_state() == blob
+    assert reference.generate(100) == exact.generate(100)
+    with pytest.raises(ValueError):
+        reference.import_state(blob[:-1])
+
+def test_kat_replay_all_engines():
+    kat = conformance.load_kat()
+    for name in available_engines():
+        count, failures = conformance.replay_kat(name, kat)
+        assert count > 0 and not failures, (name, failures)
+
+def test_differential_adoption():
+    results = conformance.run_conformance(["exact", "ntt"], seeds=2)
+    assert all(r.adopted and r.differential_cases > 0 for r in results.values())
+
+    # Moteur "optimisé" fautif : une sortie bulk sur mille diffère d'un bit
+    class BrokenCore(LwrDrbgCore):
+        def generate_bulk(self, num_bytes, out=None):
+            out = super().generate_bulk(num_bytes, out)
+            if num_bytes > 1000:
+                out[1000] ^= 1
+            return out
+
+    register_engine("broken", lambda: BrokenCore(engine="exact"), family="lwr-dense")
+    try:
+        result = conformance.run_conformance(["broken"], seeds=4)["broken"]
+        assert result.kat_failures and result.differential_failures
+        assert not result.adopted
+    finally:
+        unregister_engine("broken")
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pytest
+
+from src_python.modules.entropy_pool import EntropyPool, EventCollector
+from src_python.modules.entropy_src import NoiseCollector, EntropyHealthError
+
+class _FiniteCollector(NoiseCollector):
+    """'rounds' lots de n échantillons aléatoires, puis plus rien."""
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def sample_batch(self, n: int) -> np.ndarray:
+        if self.rounds == 0:
+            return np.empty((0, 16), dtype=np.uint8)
+        self.rounds -= 1
+        return np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16)
+
+class _StuckCollector(NoiseCollector):
+    def sample(self) -> bytes:
+        return bytes(8)
+
+def test_credit_accounting_and_cap():
+    pool = EntropyPool()
+    pool.add_source(_FiniteCollector(rounds=2), credit_bits=8, batch=4, health_tests=False)
+    pool._collect_round()
+    assert pool.metrics()["credit_bits"] == 32
+
+    # Plafond à la taille du pool
+    pool.add_source(_FiniteCollector(rounds=1), credit_bits=1000, batch=1, health_tests=False)
+    pool._collect_round()
+    assert pool.metrics()["credit_bits"] == pool.capacity_bits
+
+    assert len(pool.get_entropy(16)) == 16
+    assert pool.metrics()["credit_bits"] == pool.capacity_bits - 128
+
+    # Jamais plus d'octets "pleine entropie" que le pool n'en contient
+    with pytest.raises(ValueError):
+        pool.get_entropy(pool.POOL_BYTES + 1)
+    pool.stop()
+
+def test_uncredited_events_time_out():
+    pool = EntropyPool()
+    events = EventCollector()
+    pool.add_source(events, health_tests=False)
+    events.add_event(b"touch")
+    with pytest.raises(TimeoutError):
+        pool.get_entropy(16, timeout=0.05)
+    assert pool.metrics()["sources"][0]["samples"] == 1
+    pool.stop()
+
+def test_health_failure_is_raised_once():
+    pool = EntropyPool()
+    pool.add_source(_StuckCollector(), credit_bits=8)
+    with pytest.raises(EntropyHealthError):
+        pool.get_entropy(16, timeout=5.0)
+    pool.stop()
+    assert pool.metrics()["sources"][0]["failures"] >= 1
+    assert pool.metrics()["credit_bits"] == 0
+
+def test_health_failure_drops_earlier_credit():
+    pool = EntropyPool()
+    pool.add_source(_FiniteCollector(rounds=1), credit_bits=8, batch=4, health_tests=False)
+    pool._collect_round()
+    assert pool.metrics()["credit_bits"] == 32
+    pool.add_source(_StuckCollector(), credit_bits=8)
+    pool._collect_round()
+    assert pool.metrics()["credit_bits"] == 0
+    with pytest.raises(EntropyHealthError):
+        pool.get_entropy(1, timeout=0)
+
+def test_default_pool_mixes_events_without_credit():
+    pool = EntropyPool.default()
+    assert pool.events is not None and pool._sources[-1].credit_bits == 0
+    pool.add_event(b"sensor")
+    assert len(pool.get_entropy(48)) == 48
+    pool.stop()
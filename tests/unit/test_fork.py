@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+from src_python.api.mobile_rng import MobileRNG
+from src_python.core import public_matrix
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.modules.state_mgr import StateManager
+from src_python.modules.state_storage import MemoryStateBackend
+
+def _rng(**kwargs) -> MobileRNG:
+    rng = MobileRNG(state_manager=StateManager(backend=MemoryStateBackend()), **kwargs)
+    assert rng.initialize()
+    return rng
+
+def _child_outputs(rng: MobileRNG, count: int = 2):
+    """Sorties de 'count' enfants forkés (32 octets chacun) ; le parent n'y touche pas."""
+    outputs = []
+    for _ in range(count):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                data, status = rng.generate(32)
+                os.write(write_fd, data if status == 0 else b"")
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as f:
+            outputs.append(f.read())
+        os.waitpid(pid, 0)
+    return outputs
+
+def test_forked_children_diverge():
+    for buffered in (False, True):
+        rng = _rng(buffered=buffered, buffer_size=4096)
+        rng.generate(16)
+        children = _child_outputs(rng)
+        parent, status = rng.generate(32)
+        assert status == 0 and all(len(c) == 32 for c in children)
+        assert len({parent, *children}) == 3
+        rng.close()
+
+def test_pid_fallback_reseeds():
+    """Fork sans hook Python : le changement de PID suffit à forcer le reseed."""
+    rng = _rng()
+    twin = LwrDrbgCore(engine=rng.engine_name)
+    twin.import_state(rng.drbg.export_state())
+    rng._fork_guard.pid = -1
+    data, status = rng.generate(32)
+    assert status == 0 and data != twin.generate(32)
+    assert not rng._fork_guard.forked()
+    rng.close()
+
+def test_shared_matrix_is_read_only_mapping(tmp_path):
+    shared = public_matrix.enable_shared_matrix(str(tmp_path / "shm"))
+    try:
+        assert shared is not None
+        matrix = public_matrix.get_public_matrix(public_matrix.DENSE, dtype=np.int32)
+        assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+        # Une seule matrice (et son empreinte .sha3)
+        assert len([name for name in os.listdir(shared) if name.endswith(".npy")]) == 1
+        # Même contenu que la matrice privée, même flux DRBG
+        assert np.array_equal(matrix, public_matrix.expand_dense())
+    finally:
+        public_matrix.disable_shared_matrix()
+
+def test_state_writer_restarts_lazily_after_fork():
+    backend = MemoryStateBackend()
+    mgr = StateManager(backend=backend, background=True)
+    mgr.close()  # thread du "parent" arrêté : l'enfant n'en hérite pas
+    mgr.reset_after_fork()
+    assert mgr.writer._thread is None
+    mgr.save_state(b"\x33" * 32, 5)
+    assert mgr.writer._thread is not None
+    mgr.close()
+    assert backend.writes == 1
@@ -0,0 +1,15 @@
+from src_python.modules.entropy_src import RepetitionCountTest, AdaptiveProportionTest
+
+def _sequential(test, samples) -> bool:
+    return all(test.update(x) for x in samples)
+
+def test_batch_health_tests_match_sequential():
+    """Les versions vectorisées donnent le même verdict que les appels échantillon par échantillon."""
+    stuck = [b"\x01" * 8] * 30
+    varied = [bytes([i % 7]) * 8 for i in range(600)]
+    for samples in (stuck, varied, varied[:100] + stuck):
+        assert RepetitionCountTest().update_batch(samples) == _sequential(RepetitionCountTest(), samples)
+        assert AdaptiveProportionTest().update_batch(samples) == _sequential(AdaptiveProportionTest(), samples)
+
+    # Une source bloquée doit échouer au RCT
+    assert not RepetitionCountTest().update_batch(stuck)
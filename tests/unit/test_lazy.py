@@ -0,0 +1,16 @@
+from src_python.api.mobile_rng import MobileRNG
+from src_python.modules.state_mgr import StateManager
+from src_python.modules.state_storage import MemoryStateBackend
+
+def test_mobile_rng_builds_core_on_first_use():
+    """La construction et health_check() ne créent pas le cœur LWR ; initialize() le crée."""
+    rng = MobileRNG(state_manager=StateManager(backend=MemoryStateBackend()))
+    assert rng._drbg is None
+    assert rng.health_check()["reseed_count"] == 0
+    assert rng._drbg is None
+
+    assert rng.initialize()
+    data, status = rng.generate(32)
+    assert status == 0 and len(data) == 32
+    assert rng._drbg is not None
+    rng.close()
@@ -0,0 +1,21 @@
+from src_python.utils.metrics import MetricsRegistry
+
+def test_metrics_registry_disabled_and_export():
+    """Désactivé : aucun relevé. Activé : histogrammes et compteurs exportés."""
+    registry = MetricsRegistry(enabled=False)
+    with registry.timer("lwr.matmul"):
+        pass
+    registry.inc("bytes_generated", 32)
+    assert registry.snapshot() == {"stages": {}, "counters": {}}
+
+    registry.enable()
+    with registry.timer("lwr.matmul"):
+        pass
+    registry.inc("bytes_generated", 32)
+    snap = registry.snapshot()
+    assert snap["stages"]["lwr.matmul"]["count"] == 1
+    assert snap["counters"]["bytes_generated"] == 32
+
+    text = registry.to_prometheus()
+    assert 'rng_stage_seconds_count{stage="lwr.matmul"} 1' in text
+    assert "rng_bytes_generated_total 32" in text
@@ -0,0 +1,55 @@
+import pytest
+
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.core.multi_stream import MultiStreamDrbg, derive_stream_seed
+from src_python.utils.constants import RESEED_INTERVAL
+
+@pytest.mark.parametrize("engine", ["dense", "exact"])
+def test_streams_match_single_drbg(engine):
+    bank = MultiStreamDrbg(4, engine=engine)
+    bank.instantiate_all(b"master")
+    cores = [LwrDrbgCore(engine=engine) for _ in range(4)]
+    for i, core in enumerate(cores):
+        core.instantiate(derive_stream_seed(b"master", i))
+
+    for num_bytes, streams in ((32, None), (1, [1, 3]), (70000, [0, 2])):
+        outputs = bank.generate(num_bytes, streams)
+        for out, i in zip(outputs, streams or range(4)):
+            assert out == cores[i].generate(num_bytes)
+
+    bank.update(b"reseed", [2])
+    cores[2].update(b"reseed")
+    assert bank.generate(64) == [core.generate(64) for core in cores]
+    assert [bank.export_state(i) for i in range(4)] == [core.export_state() for core in cores]
+
+def test_streams_are_isolated():
+    bank = MultiStreamDrbg(2)
+    bank.instantiate_all(b"master")
+    untouched = bank.export_state(1)
+    bank.update(b"x", [0])
+    bank.generate(32, [0])
+    assert bank.export_state(1) == untouched
+    assert len(set(bank.generate(32))) == 2
+
+def test_per_stream_reseed_limit():
+    bank = MultiStreamDrbg(2)
+    bank.instantiate_all(b"master")
+    blob = bank.export_state(1)
+    bank.import_state(1, blob[:-8] + RESEED_INTERVAL.to_bytes(8, "little"))
+    bank.generate(32)
+    with pytest.raises(RuntimeError):
+        bank.generate(32)
+    # Le flux 0 n'est pas bloqué par le flux 1
+    assert len(bank.generate(32, [0])[0]) == 32
+    bank.wipe([0])
+    with pytest.raises(RuntimeError):
+        bank.generate(32, [0])
+
+def test_rejects_unsupported_engine_and_bad_streams():
+    with pytest.raises(ValueError):
+        MultiStreamDrbg(2, engine="ntt")
+    bank = MultiStreamDrbg(2)
+    with pytest.raises(IndexError):
+        bank.generate(32, [2])
+    with pytest.raises(ValueError):
+        bank.generate(32, [0, 0])
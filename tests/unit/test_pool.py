@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from src_python.api.rng_pool import RNGPool
+
+def _pool(tmp_path, **kwargs) -> RNGPool:
+    pool = RNGPool(num_shards=3, state_file=str(tmp_path / "state.bin"), **kwargs)
+    assert pool.initialize()
+    return pool
+
+def _requests(pool: RNGPool):
+    return [shard.requests for shard in pool.shards]
+
+def test_affinity_routing_pins_threads_round_robin(tmp_path):
+    pool = _pool(tmp_path)
+    for _ in range(4):
+        data, status = pool.generate(16)
+        assert status == 0 and len(data) == 16
+    assert _requests(pool) == [4, 0, 0]
+
+    # Chaque nouveau thread reçoit le shard suivant (round-robin)
+    threads = [threading.Thread(target=pool.generate, args=(16,)) for _ in range(2)]
+    for t in threads:
+        t.start()
+        t.join()
+    assert _requests(pool) == [4, 1, 1]
+    pool.close()
+
+def test_least_contention_spreads_sequential_requests(tmp_path):
+    pool = _pool(tmp_path, routing="least_contention")
+    for _ in range(6):
+        pool.generate(16)
+    assert _requests(pool) == [2, 2, 2]
+    pool.close()
+
+def test_pending_counters_settle_under_contention(tmp_path):
+    """Beaucoup de threads sur peu de shards : aucun compteur d'attente perdu."""
+    pool = _pool(tmp_path, routing="least_contention")
+    threads = [threading.Thread(target=lambda: [pool.generate(16) for _ in range(20)]) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(_requests(pool)) == 240
+    assert [shard.pending for shard in pool.shards] == [0, 0, 0]
+    pool.close()
+
+def test_shards_have_distinct_streams_and_state_files(tmp_path):
+    pool = _pool(tmp_path)
+    outputs = {shard.rng.generate(32)[0] for shard in pool.shards}
+    assert len(outputs) == 3
+
+    assert pool.reseed()
+    pool.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.shard0.bin", "state.shard1.bin", "state.shard2.bin"]
+
+def test_close_stops_background_threads(tmp_path):
+    pool = _pool(tmp_path)
+    pool.generate(16)
+    pool.close()
+    assert all(shard.rng.scheduler._worker is None for shard in pool.shards)
+    report = pool.health_check()
+    assert report["num_shards"] == 3 and [s["shard"] for s in report["shards"]] == [0, 1, 2]
+
+def test_uninitialized_pool_and_bad_routing(tmp_path):
+    with pytest.raises(ValueError):
+        RNGPool(num_shards=1, routing="random")
+    pool = RNGPool(num_shards=1, state_file=str(tmp_path / "state.bin"))
+    assert pool.generate(16) == (b"", -1)
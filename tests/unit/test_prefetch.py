@@ -0,0 +1,84 @@
+import time
+import threading
+
+from src_python.modules.output_buffer import PrefetchBuffer
+
+class _Source:
+    """refill_fn de test : octets non nuls numérotés, chaque appel signalé."""
+
+    def __init__(self):
+        self.calls = []
+        self.refilled = threading.Event()
+
+    def __call__(self, num_bytes: int) -> bytearray:
+        self.calls.append(num_bytes)
+        self.refilled.set()
+        return bytearray((len(self.calls) + i) % 255 + 1 for i in range(num_bytes))
+
+def _wait_level(buffer: PrefetchBuffer, level: int):
+    for _ in range(1000):
+        if buffer.metrics()["available"] >= level:
+            return
+        time.sleep(0.005)
+    raise AssertionError("réserve jamais remplie")
+
+def test_hits_misses_and_wipe_of_served_bytes():
+    source = _Source()
+    buffer = PrefetchBuffer(source, capacity=1024, low_watermark=256)
+    assert buffer.take(16) is None  # worker pas démarré : miss
+    buffer.start()
+    _wait_level(buffer, 1024)
+
+    data = buffer.take(100)
+    assert len(data) == 100 and all(data)
+    assert buffer._ring[:100] == bytes(100)  # octets livrés effacés de la réserve
+    assert buffer.take(2000) is None
+
+    m = buffer.metrics()
+    assert (m["hits"], m["misses"], m["bytes_served"]) == (1, 2, 100)
+    buffer.stop()
+
+def test_low_watermark_triggers_refill():
+    source = _Source()
+    buffer = PrefetchBuffer(source, capacity=1024, low_watermark=256)
+    buffer.start()
+    _wait_level(buffer, 1024)
+    assert source.calls == [1024]
+
+    source.refilled.clear()
+    assert buffer.take(700) is not None  # 324 octets : au-dessus du seuil
+    assert not source.refilled.wait(0.05)
+    assert buffer.take(100) is not None  # 224 octets : sous le seuil
+    assert source.refilled.wait(5)
+    _wait_level(buffer, 1024)
+    assert source.calls == [1024, 800]
+    buffer.stop()
+
+def test_stop_wipes_reserve():
+    buffer = PrefetchBuffer(_Source(), capacity=512)
+    buffer.start()
+    _wait_level(buffer, 512)
+    buffer.stop()
+    assert buffer.metrics()["available"] == 0
+    assert buffer._ring == bytes(512)
+    assert buffer.take(1) is None
+
+def test_ring_wraparound_preserves_order():
+    """Lectures à cheval sur la fin du tampon circulaire : octets servis dans l'ordre produit."""
+    produced = bytearray()
+
+    def source(num_bytes: int) -> bytearray:
+        fresh = bytearray((len(produced) + i) % 251 + 1 for i in range(num_bytes))
+        produced.extend(fresh)
+        return fresh
+
+    buffer = PrefetchBuffer(source, capacity=100, low_watermark=50)
+    buffer.start()
+    served = bytearray()
+    for _ in range(40):
+        _wait_level(buffer, 50)
+        data = buffer.take(37)
+        if data is not None:
+            served += data
+    buffer.stop()
+    assert len(served) > 100 and served == produced[:len(served)]
@@ -0,0 +1,62 @@
+import os
+import hashlib
+
+import numpy as np
+
+from src_python.core import public_matrix
+from src_python.core.public_matrix import DENSE, MODULE, get_public_matrix
+
+def _cached(tmp_path, kind, dtype):
+    public_matrix.set_cache_dir(str(tmp_path))
+    public_matrix.clear_cache()
+    try:
+        return np.array(get_public_matrix(kind, dtype=dtype))
+    finally:
+        public_matrix.set_cache_dir(None)
+        public_matrix.clear_cache()
+
+def test_stale_or_planted_cache_is_rebuilt(tmp_path):
+    reference = _cached(tmp_path, DENSE, np.uint16)
+    [path] = tmp_path.glob("*.npy")
+    assert (tmp_path / (path.name + ".sha3")).exists()
+    assert "768x768" in path.name
+    assert hashlib.sha3_256(public_matrix.PUBLIC_MATRIX_SEED).hexdigest() in path.name
+
+    # Bonne forme, mauvais contenu
+    planted = reference.copy()
+    planted[0, 0] = (planted[0, 0] + 1) % public_matrix.Q
+    np.save(path, planted)
+    assert np.array_equal(_cached(tmp_path, DENSE, np.uint16), reference)
+    assert np.array_equal(np.load(path), reference)
+
+    # Première ligne intacte, une ligne plus loin altérée : empreinte invalide
+    planted = reference.copy()
+    planted[500, 7] = (planted[500, 7] + 1) % public_matrix.Q
+    np.save(path, planted)
+    assert np.array_equal(_cached(tmp_path, DENSE, np.uint16), reference)
+    assert np.array_equal(np.load(path), reference)
+
+    # Empreinte absente
+    (tmp_path / (path.name + ".sha3")).unlink()
+    assert np.array_equal(_cached(tmp_path, DENSE, np.uint16), reference)
+    assert (tmp_path / (path.name + ".sha3")).exists()
+
+    # Mauvaise forme
+    np.save(path, reference[:10])
+    assert np.array_equal(_cached(tmp_path, DENSE, np.uint16), reference)
+
+def test_module_cache_roundtrip(tmp_path):
+    first = _cached(tmp_path, MODULE, np.int32)
+    assert np.array_equal(_cached(tmp_path, MODULE, np.int32), first)
+    assert first.shape == (public_matrix.K, public_matrix.K, public_matrix.N)
+
+def test_cache_dir_must_be_private(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    os.chmod(shared, 0o777)
+    try:
+        assert public_matrix.set_cache_dir(str(shared)) is None
+        assert public_matrix._cache_path(DENSE, public_matrix.PUBLIC_MATRIX_SEED, np.dtype(np.uint16)) is None
+        assert public_matrix.set_cache_dir(str(tmp_path / "private")) == str(tmp_path / "private")
+    finally:
+        public_matrix.set_cache_dir(None)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.api.random_adapters import PQRandom, PQGenerator, PQBitGenerator
+
+def _core() -> LwrDrbgCore:
+    core = LwrDrbgCore(engine="ntt")
+    core.instantiate(b"\x42" * 48)
+    return core
+
+def test_generator_ranges_and_uniformity():
+    gen = PQGenerator(_core(), block_size=4096)
+    x = gen.integers(0, 3, size=30000)
+    counts = np.bincount(x, minlength=3)
+    assert x.min() >= 0 and x.max() <= 2
+    assert np.all(np.abs(counts - 10000) < 500)
+
+    y = gen.integers(-5, 5, size=1000, endpoint=True)
+    assert y.min() >= -5 and y.max() <= 5
+    big = gen.integers(0, 3 * 2**40, size=1000)
+    assert big.max() < 3 * 2**40
+
+    f = gen.random(10000)
+    assert f.min() >= 0.0 and f.max() < 1.0 and abs(f.mean() - 0.5) < 0.02
+
+    perm = gen.permutation(1000)
+    assert np.array_equal(np.sort(perm), np.arange(1000))
+
+def test_random_subclass_and_numpy_generator():
+    r = PQRandom(_core(), block_size=4096)
+    values = [r.randrange(7) for _ in range(2000)]
+    assert set(values) == set(range(7))
+    assert 0.0 <= r.random() < 1.0
+    assert r.getrandbits(100) < 2**100
+
+    np_gen = PQGenerator(_core()).numpy_generator()
+    assert np_gen.normal(size=10).shape == (10,)
+
+class _FailingSource:
+    """Source DRBG qui échoue après `good` appels (ex. reseed requis)."""
+
+    def __init__(self, good: int = 0):
+        self.good = good
+        self.calls = 0
+
+    def readinto(self, buffer) -> int:
+        self.calls += 1
+        if self.calls > self.good:
+            raise RuntimeError("DRBG: Reseed Required.")
+        return _core().readinto(buffer)
+
+def test_numpy_generator_raises_when_source_fails():
+    """Jamais de zéros silencieux : l'échec de la source est levé après l'appel NumPy."""
+    source = _FailingSource()
+    np_gen = PQGenerator(source, block_size=64).numpy_generator()
+    assert isinstance(np_gen, np.random.Generator)
+    with pytest.raises(RuntimeError, match="Reseed Required"):
+        np_gen.random(3)
+    assert source.calls == 1  # échec mémorisé : la source n'est plus sollicitée
+
+    # Échec au milieu d'un appel (après un bloc valide)
+    bitgen = PQBitGenerator(_FailingSource(good=1), block_size=64)
+    with pytest.raises(RuntimeError):
+        bitgen.generator().integers(0, 10, size=100)
+    with pytest.raises(TypeError):
+        PQBitGenerator(object())
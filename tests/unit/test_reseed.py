@@ -0,0 +1,118 @@
+import time
+import threading
+
+from src_python.api.mobile_rng import MobileRNG
+from src_python.core.lwr_drbg import LwrDrbgCore
+from src_python.modules.reseed_scheduler import ReseedPolicy, ReseedScheduler
+from src_python.modules.state_mgr import StateManager
+from src_python.modules.state_storage import MemoryStateBackend
+
+def _rng(policy: ReseedPolicy, background: bool) -> MobileRNG:
+    rng = MobileRNG(state_manager=StateManager(backend=MemoryStateBackend()),
+                    reseed_policy=policy, background_reseed=background)
+    assert rng.initialize()
+    return rng
+
+def test_policy_reasons():
+    policy = ReseedPolicy(max_requests=10, max_bytes=100, max_age=5.0)
+    assert policy.reason(1, 1, 0.0) is None
+    assert policy.reason(10, 1, 0.0) == "requests"
+    assert policy.reason(1, 100, 0.0) == "bytes"
+    assert policy.reason(1, 1, 5.0) == "age"
+
+def test_background_reseed_swaps_state():
+    """Le reseed planifié remplace l'état DRBG (nouvel objet) et écrit un checkpoint."""
+    rng = _rng(ReseedPolicy(max_requests=5), background=True)
+    try:
+        first = rng.drbg
+        for _ in range(5):
+            assert rng.generate(16)[1] == 0
+        assert rng.scheduler.wait_idle(timeout=10)
+        assert rng.scheduler.completed == 1
+        assert rng.drbg is not first
+        assert rng.state_mgr.backend.writes == 1
+
+        rng.add_external_entropy(b"touch-event")
+        assert rng.scheduler.wait_idle(timeout=10)
+        assert rng.scheduler.last_reason == "external"
+        assert rng.scheduler.completed == 2
+    finally:
+        rng.close()
+
+def test_byte_policy_inline():
+    """background_reseed=False : même politique, reseed exécuté sur la requête déclenchante."""
+    rng = _rng(ReseedPolicy(max_requests=None, max_bytes=1000), background=False)
+    try:
+        rng.generate(600)
+        assert rng.scheduler.completed == 0
+        rng.generate(600)
+        assert rng.scheduler.completed == 1
+        assert rng.scheduler.metrics()["bytes_since_reseed"] == 0
+    finally:
+        rng.close()
+
+def test_wait_idle_without_worker_returns_immediately():
+    """Reseed en attente sans worker (non démarré ou arrêté) : pas d'attente infinie."""
+    scheduler = ReseedScheduler(prepare_fn=lambda e: None, commit_fn=lambda p: None,
+                                policy=ReseedPolicy(max_requests=1))
+    scheduler.record(16)
+    assert scheduler.wait_idle() is False
+
+    scheduler.start()
+    assert scheduler.wait_idle(timeout=10)
+    scheduler.stop()
+    scheduler.external_event(b"late")
+    assert scheduler.wait_idle() is False
+
+def test_commit_replays_rotations_made_during_prepare():
+    """Requêtes servies pendant la préparation : bascule quand même, rotations rejouées sur l'état préparé."""
+    rng = _rng(ReseedPolicy(max_requests=None), background=False)
+    try:
+        prepared = rng._prepare_reseed(None)
+        next_drbg = prepared[4]
+        twin = LwrDrbgCore(engine=rng.engine_name)
+        twin.import_state(next_drbg.export_state())
+        for _ in range(2):
+            assert rng.generate(16)[1] == 0
+        twin.replay_rotations(2)
+
+        rng._commit_reseed(prepared)
+        assert rng.drbg is next_drbg
+        assert rng.drbg.export_state() == twin.export_state()
+        assert rng.generate(32)[0] == twin.generate(32)
+
+        # Reseed bloquant entre-temps : l'entropie préparée est ajoutée à son état
+        prepared = rng._prepare_reseed(None)
+        assert rng.reseed()
+        live = rng.drbg
+        rng._commit_reseed(prepared)
+        assert rng.drbg is live
+    finally:
+        rng.close()
+
+def test_commit_swaps_state_under_concurrent_traffic():
+    """Trafic continu pendant chaque préparation : l'état préparé est tout de même basculé."""
+    rng = _rng(ReseedPolicy(max_requests=None), background=False)
+    stop = threading.Event()
+    errors = []
+
+    def traffic():
+        while not stop.is_set():
+            if rng.generate(16)[1] != 0:
+                errors.append("generate")
+
+    thread = threading.Thread(target=traffic)
+    thread.start()
+    try:
+        for _ in range(5):
+            prepared = rng._prepare_reseed(None)
+            start = prepared[2]
+            while rng.drbg.reseed_counter == start and not errors:
+                time.sleep(0.001)  # au moins une requête servie depuis l'instantané
+            rng._commit_reseed(prepared)
+            assert rng.drbg is prepared[4]
+    finally:
+        stop.set()
+        thread.join()
+        rng.close()
+    assert errors == []
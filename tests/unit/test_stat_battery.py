@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from src_python.modules import stat_battery as sb
+from src_python.modules import min_entropy as me
+
+# Exemple de SP 800-22 (2.4.8) : 128 bits, M = 8, p = 0.180609
+LONGEST_RUN_EXAMPLE = ("11001100000101010110110001001100111000000000001001001101010100010001"
+                       "001111010110100000001101011111001100111001101101100010110010")
+
+def _bits(data: np.ndarray) -> np.ndarray:
+    return np.unpackbits(data).astype(np.int64)
+
+def test_longest_run_nist_example():
+    data = np.packbits([int(c) for c in LONGEST_RUN_EXAMPLE])[None, :]
+    assert sb.longest_run_test(data, 8)[0] == pytest.approx(0.180609, abs=1e-6)
+
+def test_vectorized_tests_match_bit_level_reference():
+    rng = np.random.default_rng(7)
+    data = rng.integers(0, 256, (3, 128), dtype=np.uint8)
+    n = 1024
+    for row in data:
+        bits = _bits(row)
+        s = np.cumsum(2 * bits - 1)
+        pi = bits.mean()
+        runs = 1 + np.count_nonzero(bits[1:] != bits[:-1])
+        expected_runs = math.erfc(abs(runs - 2 * n * pi * (1 - pi)) / (2 * math.sqrt(2 * n) * pi * (1 - pi)))
+        assert sb.runs_test(row[None, :], np.array([bits.sum()]), n)[0] == pytest.approx(expected_runs)
+
+        forward, backward = sb.cumulative_sums_test(row[None, :], n)
+        z_backward = np.max(np.abs(s[-1] - np.concatenate(([0], s[:-1]))))
+        assert forward[0] == sb._cusum_p_value(int(np.max(np.abs(s))), n)
+        assert backward[0] == sb._cusum_p_value(int(z_backward), n)
+
+        ext = np.concatenate((bits, bits[:4]))
+        windows = np.lib.stride_tricks.sliding_window_view(ext, 5)[:n]
+        expected = np.bincount(windows @ (1 << np.arange(4, -1, -1)), minlength=32)
+        assert (sb.pattern_counts(row[None, :], 5)[0] == expected).all()
+
+def test_streaming_matches_blocks_and_workers(tmp_path):
+    battery = sb.StatBattery(sequence_bits=8192, serial_m=8, apen_m=4)
+    payload = np.random.default_rng(1).integers(0, 256, 60 * 1024 + 100, dtype=np.uint8).tobytes()
+    path = tmp_path / "sample.bin"
+    path.write_bytes(payload)
+
+    stream = sb.StreamingBattery(battery, sequences_per_block=8)
+    for i in range(0, len(payload), 777):
+        stream.update(payload[i:i + 777])
+    streamed = stream.finish()
+
+    single = sb.run_battery(len(payload), path=str(path), battery=battery, workers=1, sequences_per_block=8)
+    parallel = sb.run_battery(len(payload), path=str(path), battery=battery, workers=2, sequences_per_block=8)
+    assert streamed["sequences"] == single["sequences"] == parallel["sequences"] == 60
+    assert streamed["tests"] == single["tests"] == parallel["tests"]
+    assert single["passed"]
+
+def test_in_process_rng_battery_leaves_no_worker_state():
+    battery = sb.StatBattery(sequence_bits=8192, serial_m=8, apen_m=4)
+    report = sb.run_battery(8 * 1024, seed=b"\x07" * 32, battery=battery, workers=1, sequences_per_block=4)
+    assert report["sequences"] == 8
+    assert sb._WORKER_CORE is None and sb._WORKER_BATTERY is None
+
+def test_battery_rejects_biased_stream():
+    battery = sb.StatBattery(sequence_bits=8192, serial_m=8, apen_m=4)
+    rng = np.random.default_rng(2)
+    biased = np.packbits(rng.random((60, 8192)) < 0.53, axis=1)
+    results = sb.BatteryResults(battery)
+    results.add(battery.run_block(biased))
+    assert not results.report()["tests"]["frequency"]["passed"]
+
+def test_min_entropy_estimators():
+    rng = np.random.default_rng(3)
+    uniform = rng.integers(0, 16, 50_000).astype(np.uint8)
+    report = me.assess(uniform, 4)
+    assert 3.0 < report.min_entropy <= 4.0
+    assert set(report.estimates) >= {"most_common_value", "t_tuple", "lag_prediction", "bitstring.markov"}
+
+    # Source parfaitement prévisible (période 3) : le Lag Predictor la détecte
+    periodic = np.tile(np.array([1, 7, 3], dtype=np.uint8), 5000)
+    assert me.lag_prediction_estimate(periodic, 16) < 0.01
+    assert me.markov_estimate(np.zeros(10_000, dtype=np.uint8)) == 0.0
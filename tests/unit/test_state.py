@@ -0,0 +1,108 @@
+import json
+import time
+import atexit
+import threading
+
+import pytest
+
+from src_python.modules.state_mgr import StateManager
+from src_python.modules.state_storage import (
+    StateBackend, FileStateBackend, MemoryStateBackend, pack_record, unpack_record
+)
+
+def test_binary_state_roundtrip_and_tamper_detection():
+    """L'enregistrement binaire se relit à l'identique ; un octet modifié invalide le MAC."""
+    backend = MemoryStateBackend()
+    mgr = StateManager(backend=backend, legacy_filename="")
+    mgr.save_state(b"\x11" * 32, 7)
+    assert mgr.load_state() == (b"\x11" * 32, 7)
+
+    backend.record = backend.record[:-1] + bytes([backend.record[-1] ^ 1])
+    assert mgr.load_state() == (None, 0)
+
+def test_legacy_json_state_is_loaded(tmp_path):
+    """Un ancien secure_state.json reste chargé tant qu'aucun état binaire n'existe."""
+    seed = bytes(range(32))
+    legacy = tmp_path / "secure_state.json"
+    legacy.write_text(json.dumps({
+        "seed_hex": seed.hex(), "reseed_counter": 3, "timestamp": 0.0, "checksum": sum(seed) + 3
+    }))
+    mgr = StateManager(str(tmp_path / "secure_state.bin"))
+    assert mgr.load_state() == (seed, 3)
+
+    mgr.save_state(b"\x22" * 32, 4)
+    assert mgr.load_state() == (b"\x22" * 32, 4)
+
+def test_concurrent_file_writers_never_publish_partial_records(tmp_path):
+    """Deux écrivains sur le même chemin : chaque enregistrement publié reste valide."""
+    path = str(tmp_path / "secure_state.bin")
+    errors = []
+
+    def writer(fill: int):
+        backend = FileStateBackend(path)
+        try:
+            for counter in range(200):
+                backend.write(pack_record(bytes([fill]) * 32, counter, 0.0))
+                unpack_record(backend.read())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(fill,)) for fill in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert unpack_record(FileStateBackend(path).read())[1] == 199
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["secure_state.bin"]
+
+def test_state_backend_is_abstract():
+    class WriteOnly(StateBackend):
+        def write(self, record: bytes):
+            pass
+
+    for cls in (StateBackend, WriteOnly):
+        with pytest.raises(TypeError):
+            cls()
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+@pytest.mark.parametrize("background", [False, True])
+def test_coalesced_saves_are_written_when_the_interval_expires(background):
+    """Dépôts rapprochés : une écriture immédiate, puis la dernière seule à la fin de l'intervalle."""
+    backend = MemoryStateBackend()
+    mgr = StateManager(backend=backend, legacy_filename="", coalesce_interval=0.2, background=background)
+    try:
+        mgr.save_state(b"\x01" * 32, 1)
+        assert _wait_for(lambda: backend.writes == 1)
+        for counter in range(2, 6):
+            mgr.save_state(bytes([counter]) * 32, counter)
+        assert backend.writes == 1  # intermédiaires coalescés, rien écrit dans l'intervalle
+
+        # Sans nouveau dépôt : l'écriture différée a lieu à l'expiration
+        assert _wait_for(lambda: backend.writes == 2)
+        assert mgr.writer.pending is None
+        assert unpack_record(backend.record)[:2] == (b"\x05" * 32, 5)
+    finally:
+        mgr.close()
+    assert backend.writes == 2
+
+def test_close_flushes_and_unregisters_atexit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(atexit, "unregister", registered.remove)
+    backend = MemoryStateBackend()
+    mgr = StateManager(backend=backend, legacy_filename="", coalesce_interval=60.0)
+    assert registered == [mgr.writer.close]
+    mgr.save_state(b"\x01" * 32, 1)
+    mgr.save_state(b"\x02" * 32, 2)
+    assert backend.writes == 1
+    mgr.close()
+    assert registered == []
+    assert backend.writes == 2 and unpack_record(backend.record)[1] == 2
@@ -0,0 +1,73 @@
+import io
+
+import numpy as np
+import pytest
+
+from src_python.api.mobile_rng import MobileRNG
+from src_python.api.stream import RNGStream, iter_chunks
+from src_python.modules.reseed_scheduler import ReseedPolicy
+from src_python.modules.state_mgr import StateManager
+from src_python.modules.state_storage import MemoryStateBackend
+
+@pytest.fixture
+def rng():
+    # Sans reseed planifié : l'état ne bouge qu'avec les requêtes du test
+    rng = MobileRNG(state_manager=StateManager(backend=MemoryStateBackend()),
+                    reseed_policy=ReseedPolicy(max_requests=None), background_reseed=False)
+    assert rng.initialize()
+    yield rng
+    rng.close()
+
+def _replay(rng: MobileRNG, state: bytes, num_bytes: int) -> bytes:
+    rng.drbg.import_state(state)
+    data, status = rng.generate(num_bytes)
+    assert status == 0
+    return data
+
+def test_readinto_matches_generate(rng):
+    for num_bytes in (48, 100000):
+        state = rng.drbg.export_state()
+        target = bytearray(num_bytes)
+        assert rng.readinto(target) == num_bytes
+        assert bytes(target) == _replay(rng, state, num_bytes)
+
+    # Tranche d'un tableau NumPy (vue contiguë sur uint32) : remplie en place
+    state = rng.drbg.export_state()
+    array = np.zeros(64, dtype=np.uint32)
+    assert rng.readinto(array[16:48]) == 128
+    assert not array[:16].any() and not array[48:].any()
+    assert array[16:48].tobytes() == _replay(rng, state, 128)
+
+def test_stream_read_and_limit(rng):
+    state = rng.drbg.export_state()
+    stream = RNGStream(rng, limit=100)
+    assert stream.readable()
+    data = stream.read(60)
+    buffer = bytearray(60)
+    assert stream.readinto(buffer) == 40
+    assert stream.read(10) == b""
+    assert data == _replay(rng, state, 60)
+    assert buffer[40:] == bytes(20)
+
+    # io.BufferedReader : lectures arbitraires sur le flux infini
+    reader = io.BufferedReader(RNGStream(rng))
+    assert len(reader.read(5000)) == 5000
+
+def test_iter_chunks(rng):
+    chunks = list(iter_chunks(rng, chunk_size=1000, total=2500))
+    assert [len(c) for c in chunks] == [1000, 1000, 500] and len(set(chunks)) == 3
+
+    views = iter_chunks(rng, chunk_size=64, total=128, reuse_buffer=True)
+    first = next(views)
+    assert isinstance(first, memoryview) and next(views).obj is first.obj
+    with pytest.raises(ValueError):
+        next(iter_chunks(rng, chunk_size=0))
+
+def test_uninitialized_rng_raises():
+    rng = MobileRNG(state_manager=StateManager(backend=MemoryStateBackend()))
+    with pytest.raises(RuntimeError):
+        rng.readinto(bytearray(16))
+    with pytest.raises(RuntimeError):
+        RNGStream(rng).read(16)
+    with pytest.raises(RuntimeError):
+        next(iter_chunks(rng, chunk_size=16))